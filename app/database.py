@@ -1,8 +1,16 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+import itertools
 import os
+import threading
+import time
+from typing import List, Optional
 from dotenv import load_dotenv
+from app.utils import metrics
 
 load_dotenv()
 
@@ -10,13 +18,196 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set.")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+# Pool settings apply to server databases; SQLite files get WAL and connect-time pragmas instead.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KIB = int(os.getenv("SQLITE_CACHE_SIZE_KIB", str(64 * 1024)))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 2**20)))
+
+# Comma-separated read replicas of DATABASE_URL; reporting and export reads go to them.
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# A replica further behind the primary than this is skipped until it catches up.
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "5"))
+
+
+def engine_options(url, is_async: bool = False) -> dict:
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        connect_args = {} if is_async else {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases live in a single connection, so there is no pool to size.
+            return {"connect_args": connect_args}
+        return {
+            "connect_args": connect_args,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+        }
+
+    if url.get_backend_name() == "postgresql":
+        if is_async:
+            connect_args = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            connect_args = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    else:
+        connect_args = {}
+    return {
+        "connect_args": connect_args,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    # A negative cache_size is in KiB rather than pages.
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KIB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
+def configure_engine(engine):
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", sqlite_pragmas)
+    return engine
+
+
+engine = configure_engine(create_engine(DATABASE_URL, **engine_options(DATABASE_URL)))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the same database, used by the async read routes.
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_url(url: str):
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+async_engine = create_async_engine(async_url(DATABASE_URL), **engine_options(DATABASE_URL, is_async=True))
+configure_engine(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Seconds since the last replayed transaction, or 0 when the replica has replayed everything it received
+# (an idle primary would otherwise look like a lagging replica).
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+
+class Replica:
+    """A read replica with its own sync and async engines, and the lag measured by the monitor thread."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine = configure_engine(create_engine(url, **engine_options(url)))
+        self.async_engine = create_async_engine(async_url(url), **engine_options(url, is_async=True))
+        configure_engine(self.async_engine.sync_engine)
+        self.session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.async_session = async_sessionmaker(self.async_engine, class_=AsyncSession, autoflush=False,
+                                                expire_on_commit=False)
+        # None until the first successful check and while the replica is unreachable.
+        self.lag: Optional[float] = None
+        self.checked = False
+
+    def check(self):
+        # Only changes are logged: the first check and every switch between up and down.
+        previous, self.checked = (self.lag is not None if self.checked else None), True
+        try:
+            with self.engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    self.lag = float(conn.execute(text(REPLICA_LAG_SQL)).scalar() or 0)
+                else:
+                    # Other databases cannot report replication lag; a reachable copy counts as current.
+                    conn.execute(text("SELECT 1"))
+                    self.lag = 0.0
+        except Exception as e:
+            self.lag = None
+            if previous is not False:
+                _log_replica_event(f"Read replica {self.name} is unavailable, reading from the primary - {str(e)}")
+            return
+        if previous is False:
+            _log_replica_event(f"Read replica {self.name} is available again ({self.lag:.1f}s behind)")
+
+    def mark_down(self):
+        # Failed mid-request; stay on the primary until the next check finds it healthy again.
+        self.lag = None
+
+
+replicas: List[Replica] = [Replica(f"replica{i}", url) for i, url in enumerate(DATABASE_REPLICA_URLS, start=1)]
+_round_robin = itertools.count()
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def _log_replica_event(message: str):
+    from app.utils.logger import log_event
+    log_event(message)
+
+
+def _monitor_loop():
+    while True:
+        for replica in replicas:
+            replica.check()
+        time.sleep(REPLICA_CHECK_INTERVAL)
+
+
+def start_replica_monitor():
+    """Start the replica health checks; called at application startup and, lazily, by pick_replica()."""
+    global _monitor
+    if not replicas or _monitor is not None:
+        return
+    with _monitor_lock:
+        if _monitor is None:
+            # The first check also runs on the thread: an unreachable replica would otherwise hold up the
+            # caller, possibly the event loop, for the connect timeout. Reads use the primary until it is done.
+            _monitor = threading.Thread(target=_monitor_loop, name="replica-monitor", daemon=True)
+            _monitor.start()
+
+
+def pick_replica(max_lag: float = REPLICA_MAX_LAG_SECONDS) -> Optional[Replica]:
+    """A replica within max_lag seconds of the primary, rotating between them; None falls back to the primary."""
+    start_replica_monitor()
+    healthy = [replica for replica in replicas if replica.lag is not None and replica.lag <= max_lag]
+    replica = healthy[next(_round_robin) % len(healthy)] if healthy else None
+    metrics.inc("beetrack_db_read_routing_total", (("target", replica.name if replica else "primary"),))
+    return replica
+
+
+def read_engine(max_lag: float = REPLICA_MAX_LAG_SECONDS):
+    replica = pick_replica(max_lag)
+    return replica.engine if replica else engine
+
+
+def read_session(max_lag: float = REPLICA_MAX_LAG_SECONDS):
+    """Session for read-only work outside a request (e.g. export jobs)."""
+    replica = pick_replica(max_lag)
+    return (replica.session if replica else SessionLocal)()
+
+
 Base = declarative_base()
 
 def get_db():
@@ -25,3 +216,63 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _replica_session(replica: Optional[Replica]):
+    # The connection is opened before the route runs, so an unreachable replica can still fall back to the primary.
+    if replica:
+        db = replica.session()
+        try:
+            db.connection()
+            return db, replica
+        except OperationalError:
+            db.close()
+            replica.mark_down()
+    return SessionLocal(), None
+
+
+async def _async_replica_session(replica: Optional[Replica]):
+    if replica:
+        db = replica.async_session()
+        try:
+            await db.connection()
+            return db, replica
+        except OperationalError:
+            await db.close()
+            replica.mark_down()
+    return AsyncSessionLocal(), None
+
+
+def get_read_db():
+    """
+    Session on a read replica for routes that tolerate REPLICA_MAX_LAG_SECONDS of staleness, or on the
+    primary when no replica is configured or healthy. Never write through it.
+
+    A replica that cannot be reached is marked down and the request is served by the primary. If it fails
+    after the route started, the request fails; it is marked down so the following requests use the primary.
+    """
+    db, replica = _replica_session(pick_replica())
+    try:
+        yield db
+    except OperationalError:
+        if replica:
+            replica.mark_down()
+        raise
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    db, replica = await _async_replica_session(pick_replica())
+    async with db:
+        try:
+            yield db
+        except OperationalError:
+            if replica:
+                replica.mark_down()
+            raise
@@ -1,23 +1,34 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
+from sqlalchemy.orm.exc import StaleDataError
 from slowapi.errors import RateLimitExceeded
 from app.utils.limiter import limiter
 from slowapi import _rate_limit_exceeded_handler
-from app.database import Base, engine
-from app.routers import users, products, hives, inspections, orders, export, stats, logs
-from app.services.scheduler import start_scheduler
-
-start_scheduler()
+from app.database import Base, async_engine, engine, replicas, start_replica_monitor
+from app.routers import users, products, hives, inspections, orders, export, stats, logs, telemetry
+from app.services.scheduler import start_scheduler, stop_scheduler
+from app.services.export_jobs import shutdown_executor
+from app.utils import metrics, sql_profiler
+from app.utils.compression import CompressionMiddleware
 
 app = FastAPI(
     title="BeeTrack API",
     description="Apiary and order management system for beekeepers",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+
+@app.exception_handler(StaleDataError)
+def stale_data_handler(request: Request, exc: StaleDataError):
+    # A versioned row (e.g. product stock) changed between this request's read and its write.
+    return JSONResponse(status_code=409, content={"detail": "Resource was modified concurrently, please retry"})
+
+
 origins = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
 app.add_middleware(
@@ -26,9 +37,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Session-Revoked", "Content-Disposition"],
+    expose_headers=[
+        "X-Session-Revoked", "Content-Disposition", "ETag", "X-Export-Cursor", "X-Next-Cursor",
+        "Server-Timing", "X-DB-Queries", "X-DB-N-Plus-One",
+    ],
 )
 
+metrics.instrument_engine(engine, "sync")
+metrics.instrument_engine(async_engine.sync_engine, "async")
+sql_profiler.instrument_engine(engine)
+sql_profiler.instrument_engine(async_engine.sync_engine)
+for replica in replicas:
+    metrics.instrument_engine(replica.engine, replica.name)
+    metrics.instrument_engine(replica.async_engine.sync_engine, f"{replica.name}-async")
+    sql_profiler.instrument_engine(replica.engine)
+    sql_profiler.instrument_engine(replica.async_engine.sync_engine)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(sql_profiler.SQLProfilerMiddleware)
+# Added last so it wraps every other middleware and sees the final status code.
+app.add_middleware(metrics.MetricsMiddleware)
+
 app.include_router(users.router, prefix="/users", tags=["Users"])
 app.include_router(products.router, prefix="/products", tags=["Products"])
 app.include_router(hives.router, prefix="/hives", tags=["Hives"])
@@ -37,3 +65,28 @@ app.include_router(orders.router, prefix="/orders", tags=["Orders"])
 app.include_router(export.router, prefix="/export", tags=["Export"])
 app.include_router(stats.router, prefix="/stats", tags=["Statistics"])
 app.include_router(logs.router, prefix="/logs", tags=["Logs"])
+app.include_router(telemetry.router, prefix="/telemetry", tags=["Telemetry"])
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.on_event("startup")
+def start_background_jobs():
+    # Started here rather than on import, so tools that only import the app (tests, scripts) stay side-effect free.
+    start_scheduler()
+    start_replica_monitor()
+
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    stop_scheduler()
+    shutdown_executor()
+
+
+@app.on_event("shutdown")
+async def close_async_pool():
+    # Pooled aiosqlite connections run on their own threads and would keep the process alive.
+    await async_engine.dispose()
@@ -1,8 +1,9 @@
 from sqlalchemy import (
-    Column, Integer, String, Float, ForeignKey,
-    DateTime, Text, Enum, Boolean
+    Column, Integer, BigInteger, String, Float, ForeignKey,
+    DateTime, Text, Enum, Boolean, Index
 )
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import false
 from datetime import datetime, timezone
 from app.database import Base
 import enum
@@ -51,9 +52,14 @@ class Hive(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), unique=True, nullable=False)
-    location = Column(String(200))
-    status = Column(String(50), default="active")
+    location = Column(String(200), index=True)
+    status = Column(String(50), default="active", index=True)
     last_inspection_date = Column(DateTime)
+    # Summary of the hive's inspections, kept current by the inspection handlers (see services/hive_summary.py).
+    inspection_count = Column(Integer, default=0, nullable=False)
+    latest_temperature = Column(Float)
+    latest_disease = Column(String(100))
+    recent_disease_count = Column(Integer, default=0, nullable=False)
 
     inspections = relationship("Inspection", back_populates="hive")
 
@@ -62,11 +68,12 @@ class Inspection(Base):
     __tablename__ = "inspections"
 
     id = Column(Integer, primary_key=True, index=True)
-    hive_id = Column(Integer, ForeignKey("hives.id"), nullable=False)
-    date = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    hive_id = Column(Integer, ForeignKey("hives.id"), nullable=False, index=True)
+    date = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
     notes = Column(Text)
     temperature = Column(Float)
-    disease_detected = Column(String(100), default="none")
+    disease_detected = Column(String(100), default="none", index=True)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     hive = relationship("Hive", back_populates="inspections")
 
@@ -77,20 +84,26 @@ class Product(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False, unique=True)
     description = Column(Text)
-    unit_price = Column(Float, nullable=False)
+    unit_price = Column(Float, nullable=False, index=True)
     stock_quantity = Column(Integer, default=0)
+    # Optimistic concurrency for ORM updates (admin edits): they check and increment it (StaleDataError on
+    # mismatch). Checkout decrements stock with a conditional SQL UPDATE that only increments it.
+    version = Column(Integer, nullable=False, default=1)
 
     order_items = relationship("OrderItem", back_populates="product")
 
+    __mapper_args__ = {"version_id_col": version}
+
 
 class Order(Base):
     __tablename__ = "orders"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    date = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    status = Column(String(50), default="pending")
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    date = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    status = Column(String(50), default="pending", index=True)
     total_price = Column(Float, default=0.0)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     user = relationship("User", back_populates="orders")
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
@@ -113,5 +126,67 @@ class Log(Base):
     __tablename__ = "logs"
 
     id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
     event = Column(String(255), nullable=False)
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+
+
+class TelemetryReading(Base):
+    """Raw sensor samples; pruned once rolled up and past retention."""
+    __tablename__ = "telemetry_readings"
+
+    id = Column(Integer, primary_key=True)
+    hive_id = Column(Integer, ForeignKey("hives.id"), nullable=False)
+    metric = Column(String(32), nullable=False)
+    ts = Column(BigInteger, nullable=False)  # Unix epoch seconds, UTC
+    value = Column(Float, nullable=False)
+    # Set in the transaction that merges the reading into the rollups. Unlike an id high-water mark, this
+    # cannot skip a reading whose transaction commits after one with a higher id.
+    rolled_up = Column(Boolean, nullable=False, default=False, server_default=false())
+
+    __table_args__ = (
+        Index("ix_telemetry_readings_series", "hive_id", "metric", "ts"),
+        Index("ix_telemetry_readings_pending", "id",
+              postgresql_where=rolled_up.is_(False), sqlite_where=rolled_up.is_(False)),
+    )
+
+
+class TelemetryRollup(Base):
+    __tablename__ = "telemetry_rollups"
+
+    hive_id = Column(Integer, ForeignKey("hives.id"), primary_key=True)
+    metric = Column(String(32), primary_key=True)
+    resolution = Column(Integer, primary_key=True)  # Bucket width in seconds
+    bucket = Column(BigInteger, primary_key=True)  # Bucket start, Unix epoch seconds
+    count = Column(Integer, nullable=False)
+    total = Column(Float, nullable=False)
+    min = Column(Float, nullable=False)
+    max = Column(Float, nullable=False)
+
+
+class SchedulerLease(Base):
+    """Leader lease for databases without advisory locks; the holder renews expires_at."""
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(50), primary_key=True)
+    holder = Column(String(200), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
+class JobRun(Base):
+    __tablename__ = "job_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job = Column(String(100), nullable=False, index=True)
+    holder = Column(String(200), nullable=False)
+    started_at = Column(DateTime, nullable=False, index=True)
+    duration_ms = Column(Float, nullable=False)
+    status = Column(String(20), nullable=False)
+    rows = Column(Integer)
+    error = Column(Text)
@@ -1,48 +1,199 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from app.database import get_db
+from datetime import datetime
+from typing import Optional
+from app import schemas
+from app.database import get_read_db
 from app.services.auth import requires_role
-from app.services import export
+from app.services import backup, columnar_export, export, export_cache, export_jobs
+from app.services.export_filters import pin_cursor
+from app.utils.etag import etag_matches
 from app.utils.logger import log_event
 
 router = APIRouter()
 
 
+def export_filter(
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    since_id: Optional[int] = Query(None, ge=0),
+) -> schemas.ExportFilter:
+    return schemas.ExportFilter(date_from=date_from, date_to=date_to, since_id=since_id)
+
+
+def _cached_export(request: Request, db: Session, kind: str, dataset: str, export_func,
+                   filename: str, media_type: str, filters: schemas.ExportFilter):
+    ext = filename.rsplit(".", 1)[1]
+    filters = pin_cursor(db, dataset, filters)
+    cursor = str(filters.until_id)
+    fingerprint = export_cache.data_fingerprint(db, kind, filters)
+    headers = {"ETag": f'"{fingerprint}"', "X-Export-Cursor": cursor}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers), True, cursor
+
+    path = export_cache.get_artifact(kind, fingerprint, ext)
+    cached = path is not None
+    if not cached:
+        staging = export_cache.staging_path(kind, ext)
+        try:
+            generated = export_func(db, path=staging, filters=filters)
+        except Exception:
+            export_cache.discard_staging(staging)
+            raise
+        if not generated:
+            return None, False, cursor
+        path = export_cache.store_artifact(kind, fingerprint, ext, generated)
+
+    return FileResponse(path, media_type=media_type, filename=filename, headers=headers), cached, cursor
+
+
 @router.get("/orders/csv", response_class=FileResponse)
 def download_orders_csv(
-    db: Session = Depends(get_db),
+    request: Request,
+    filters: schemas.ExportFilter = Depends(export_filter),
+    db: Session = Depends(get_read_db),
     current_user: str = Depends(requires_role("admin"))
 ):
-    path = export.export_orders_to_csv(db)
-    if not path:
+    response, cached, cursor = _cached_export(
+        request, db, "orders_csv", "orders", export.export_orders_to_csv, "orders.csv", "text/csv", filters
+    )
+    if not response:
         log_event(f"Export failed: No orders to export for admin {current_user.username}")
-        raise HTTPException(status_code=404, detail="No orders to export")
-    log_event(f"Orders CSV exported by admin {current_user.username}")
-    return FileResponse(path, media_type="text/csv", filename="orders.csv")
+        raise HTTPException(status_code=404, detail="No orders to export", headers={"X-Export-Cursor": cursor})
+    log_event(f"Orders CSV exported by admin {current_user.username}{' (cached)' if cached else ''}")
+    return response
 
 
 @router.get("/orders/pdf", response_class=FileResponse)
 def download_orders_pdf(
-    db: Session = Depends(get_db),
+    request: Request,
+    filters: schemas.ExportFilter = Depends(export_filter),
+    summary: bool = Query(False, description="Only render the summary section, without detail rows"),
+    db: Session = Depends(get_read_db),
     current_user: str = Depends(requires_role("admin"))
 ):
-    path = export.export_orders_to_pdf(db)
-    if not path:
+    response, cached, cursor = _cached_export(
+        request, db, f"orders_pdf{'_summary' if summary else ''}", "orders",
+        lambda db, path, filters: export.export_orders_to_pdf(db, path=path, filters=filters, summary_only=summary),
+        "orders.pdf", "application/pdf", filters
+    )
+    if not response:
         log_event(f"Export failed: No orders to export for admin {current_user.username}")
-        raise HTTPException(status_code=404, detail="No orders to export")
-    log_event(f"Orders PDF exported by admin {current_user.username}")
-    return FileResponse(path, media_type="application/pdf", filename="orders.pdf")
+        raise HTTPException(status_code=404, detail="No orders to export", headers={"X-Export-Cursor": cursor})
+    log_event(f"Orders PDF exported by admin {current_user.username}{' (cached)' if cached else ''}")
+    return response
 
 
 @router.get("/inspections/pdf", response_class=FileResponse)
 def download_inspections_pdf(
-    db: Session = Depends(get_db),
+    request: Request,
+    filters: schemas.ExportFilter = Depends(export_filter),
+    summary: bool = Query(False, description="Only render the summary section, without detail rows"),
+    db: Session = Depends(get_read_db),
     current_user: str = Depends(requires_role("admin"))
 ):
-    path = export.export_inspections_to_pdf(db)
-    if not path:
+    response, cached, cursor = _cached_export(
+        request, db, f"inspections_pdf{'_summary' if summary else ''}", "inspections",
+        lambda db, path, filters: export.export_inspections_to_pdf(db, path=path, filters=filters, summary_only=summary),
+        "inspections.pdf", "application/pdf", filters
+    )
+    if not response:
         log_event(f"Export failed: No inspections to export for admin {current_user.username}")
-        raise HTTPException(status_code=404, detail="No inspections to export")
-    log_event(f"Inspections PDF exported by admin {current_user.username}")
-    return FileResponse(path, media_type="application/pdf", filename="inspections.pdf")
+        raise HTTPException(status_code=404, detail="No inspections to export", headers={"X-Export-Cursor": cursor})
+    log_event(f"Inspections PDF exported by admin {current_user.username}{' (cached)' if cached else ''}")
+    return response
+
+
+@router.get("/backup", response_class=StreamingResponse)
+def download_backup(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: str = Depends(requires_role("admin"))
+):
+    filename = f"beetrack-backup-{datetime.now().strftime('%Y%m%d-%H%M%S')}.zip"
+    log_event(f"Backup bundle ({format}) requested by admin {current_user.username}")
+    return StreamingResponse(
+        backup.stream_backup(format),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/restore")
+def restore_backup(
+    file: UploadFile = File(...),
+    current_user: str = Depends(requires_role("admin"))
+):
+    try:
+        counts = backup.restore_backup(file.file)
+    except backup.RestoreError as e:
+        log_event(f"Backup restore failed for admin {current_user.username}: {str(e)}")
+        status_code = 409 if isinstance(e, backup.RestoreConflict) else 400
+        raise HTTPException(status_code=status_code, detail=str(e))
+    log_event(f"Backup restored by admin {current_user.username}: {sum(counts.values())} rows")
+    return {"restored": counts}
+
+
+@router.post("/jobs", response_model=schemas.ExportJobRead, status_code=202)
+def create_export_job(
+    job: schemas.ExportJobCreate,
+    current_user: str = Depends(requires_role("admin"))
+):
+    if job.summary_only and job.kind.value not in export_jobs.SUMMARY_KINDS:
+        raise HTTPException(status_code=422, detail="Summary-only mode is only available for PDF reports")
+    state = export_jobs.submit_job(job.kind.value, current_user.username, job.filters, job.summary_only)
+    if state["status"] == "failed":
+        log_event(f"Export job {state['id']} ({job.kind.value}) could not be started for admin {current_user.username}: {state['error']}")
+        raise HTTPException(status_code=503, detail=state["error"])
+    log_event(f"Export job {state['id']} ({job.kind.value}) queued by admin {current_user.username}")
+    return state
+
+
+@router.get("/jobs/{job_id}", response_model=schemas.ExportJobRead)
+def get_export_job(
+    job_id: str,
+    current_user: str = Depends(requires_role("admin"))
+):
+    state = export_jobs.get_job(job_id)
+    if not state:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return state
+
+
+@router.get("/jobs/{job_id}/download", response_class=FileResponse)
+def download_export_job(
+    job_id: str,
+    current_user: str = Depends(requires_role("admin"))
+):
+    state = export_jobs.get_job(job_id)
+    if not state:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if state["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Export job is {state['status']}")
+
+    path = export_jobs.artifact_path(job_id, state["kind"])
+    _, ext, media_type, _ = export_jobs.EXPORT_KINDS[state["kind"]]
+    log_event(f"Export job {job_id} ({state['kind']}) downloaded by admin {current_user.username}")
+    return FileResponse(path, media_type=media_type, filename=f"{state['kind']}.{ext}")
+
+
+@router.get("/{dataset}/{fmt}", response_class=FileResponse)
+def download_columnar(
+    dataset: schemas.ColumnarDataset,
+    fmt: schemas.ColumnarFormat,
+    request: Request,
+    filters: schemas.ExportFilter = Depends(export_filter),
+    db: Session = Depends(get_read_db),
+    current_user: str = Depends(requires_role("admin"))
+):
+    ext, media_type = columnar_export.FORMATS[fmt.value]
+    response, cached, cursor = _cached_export(
+        request, db, f"{dataset.value}_{fmt.value}", dataset.value,
+        lambda db, path, filters: columnar_export.export_dataset(db, dataset.value, fmt.value, path, filters),
+        f"{dataset.value}.{ext}", media_type, filters,
+    )
+    if not response:
+        log_event(f"Export failed: No {dataset.value} to export for admin {current_user.username}")
+        raise HTTPException(status_code=404, detail=f"No {dataset.value} to export", headers={"X-Export-Cursor": cursor})
+    log_event(f"{dataset.value.title()} {fmt.value} exported by admin {current_user.username}{' (cached)' if cached else ''}")
+    return response
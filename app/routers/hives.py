@@ -1,12 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.database import get_db
+from app.services import catalog, versioning
 from app.services.auth import requires_role
-from app.utils.logger import log_event
+from app.utils.etag import not_modified
+from app.utils.logger import alog_event, log_event
+from app.utils.pagination import PageParams, page_params, paginate_records
 
 router = APIRouter()
 
+HIVE_SORT_COLUMNS = {
+    "id": models.Hive.id,
+    "name": models.Hive.name,
+    "status": models.Hive.status,
+}
+
 @router.post("/", response_model=schemas.HiveRead)
 def create_hive(
     hive: schemas.HiveCreate,
@@ -20,6 +30,7 @@ def create_hive(
 
     new_hive = models.Hive(**hive.dict())
     db.add(new_hive)
+    versioning.bump_version(db, "hives")
     db.commit()
     db.refresh(new_hive)
     log_event(f"Hive created: {hive.name} by admin {current_user.username}")
@@ -27,20 +38,39 @@ def create_hive(
 
 
 @router.get("/", response_model=list[schemas.HiveRead])
-def list_hives(db: Session = Depends(get_db)):
-    hives = db.query(models.Hive).all()
-    log_event(f"Hives list requested, found {len(hives)} hives")
-    return hives
+async def list_hives(
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(None),
+    location: Optional[str] = Query(None, description="Case-insensitive substring match"),
+    page: PageParams = Depends(page_params)
+):
+    # Served from the in-process catalog; no database round trip while the catalog is current.
+    snapshot = await catalog.asnapshot("hives")
+    cached = not_modified(request, response, versioning.format_etag(request, {"hives": snapshot.version}))
+    if cached:
+        return cached
+
+    hives = snapshot.records
+    if status:
+        hives = [h for h in hives if h.status == status]
+    if location:
+        needle = location.lower()
+        hives = [h for h in hives if h.location and needle in h.location.lower()]
+    return catalog.json_response(paginate_records(hives, page, response, HIVE_SORT_COLUMNS), response)
 
 
 @router.get("/{hive_id}", response_model=schemas.HiveRead)
-def get_hive(hive_id: int, db: Session = Depends(get_db)):
-    hive = db.query(models.Hive).get(hive_id)
+async def get_hive(hive_id: int, request: Request, response: Response):
+    snapshot = await catalog.asnapshot("hives")
+    hive = snapshot.by_id.get(hive_id)
     if not hive:
-        log_event(f"Hive not found: {hive_id}")
+        await alog_event(f"Hive not found: {hive_id}")
         raise HTTPException(status_code=404, detail="Hive not found")
-    log_event(f"Hive details requested: {hive.name} (ID: {hive_id})")
-    return hive
+    cached = not_modified(request, response, versioning.format_etag(request, {"hives": snapshot.version}))
+    if cached:
+        return cached
+    return catalog.record_response(hive, response)
 
 
 @router.put("/{hive_id}", response_model=schemas.HiveRead)
@@ -58,6 +88,7 @@ def update_hive(
     for key, value in hive_data.dict().items():
         setattr(hive, key, value)
 
+    versioning.bump_version(db, "hives")
     db.commit()
     db.refresh(hive)
     log_event(f"Hive updated: {hive.name} (ID: {hive_id}) by admin {current_user.username}")
@@ -77,6 +108,7 @@ def delete_hive(
 
     hive_name = hive.name
     db.delete(hive)
+    versioning.bump_version(db, "hives")
     db.commit()
     log_event(f"Hive deleted: {hive_name} (ID: {hive_id}) by admin {current_user.username}")
     return
@@ -1,13 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app import models, schemas
-from app.database import get_db
+from app.database import get_async_db, get_db
+from app.services import hive_summary, versioning
 from app.services.auth import get_current_user, requires_role
-from app.utils.logger import log_event
+from app.utils.batch import parse_json_batch
+from app.utils.logger import alog_event, log_event
+from app.utils.pagination import PageParams, apaginate, filter_date_range, page_params, utc_naive
+from app.utils.serialization import models_response
 from datetime import datetime, timezone
+from typing import Optional
 
 router = APIRouter()
 
+INSPECTION_BATCH_MAX = int(os.getenv("INSPECTION_BATCH_MAX", "10000"))
+INSERT_CHUNK_SIZE = 1000
+
+_inspection_list = TypeAdapter(list[schemas.InspectionCreate])
+_inspection_reads = TypeAdapter(list[schemas.InspectionRead])
+
+INSPECTION_SORT_COLUMNS = {
+    "id": models.Inspection.id,
+    "date": models.Inspection.date,
+    "hive_id": models.Inspection.hive_id,
+}
+
+
+def _filter_inspections(query, date_from, date_to, disease):
+    query = filter_date_range(query, models.Inspection.date, date_from, date_to)
+    if disease:
+        query = query.filter(models.Inspection.disease_detected == disease)
+    return query
+
 
 @router.post("/", response_model=schemas.InspectionRead)
 def create_inspection(
@@ -20,10 +49,13 @@ def create_inspection(
         log_event(f"Inspection creation failed: hive {inspection.hive_id} not found, attempted by {current_user.username}")
         raise HTTPException(status_code=404, detail="Hive not found")
 
-    new_inspection = models.Inspection(**inspection.dict())
+    data = inspection.dict()
+    data["date"] = utc_naive(inspection.date or datetime.now(timezone.utc))
+    new_inspection = models.Inspection(**data)
     db.add(new_inspection)
 
-    hive.last_inspection_date = inspection.date or datetime.now(timezone.utc)
+    hive_summary.apply_new_inspection(hive, new_inspection)
+    versioning.bump_version(db, "hives")
 
     db.commit()
     db.refresh(new_inspection)
@@ -31,22 +63,94 @@ def create_inspection(
     return new_inspection
 
 
+def _ingest_batch(db: Session, inspections: list, username: str) -> schemas.InspectionBatchResult:
+    hive_ids = {inspection.hive_id for inspection in inspections}
+    known = set(db.execute(select(models.Hive.id).where(models.Hive.id.in_(hive_ids))).scalars())
+    missing = sorted(hive_ids - known)
+    if missing:
+        log_event(f"Inspection batch rejected: unknown hives {missing[:20]}, attempted by {username}")
+        raise HTTPException(status_code=404, detail=f"Hives not found: {missing[:20]}")
+
+    now = utc_naive(datetime.now(timezone.utc))
+    rows = [
+        {
+            "hive_id": inspection.hive_id,
+            "date": utc_naive(inspection.date) if inspection.date else now,
+            "notes": inspection.notes,
+            "temperature": inspection.temperature,
+            "disease_detected": inspection.disease_detected,
+        }
+        for inspection in inspections
+    ]
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.execute(insert(models.Inspection), rows[start:start + INSERT_CHUNK_SIZE])
+
+    # One statement for the whole batch recomputes every touched hive's summary.
+    hive_summary.refresh_summaries(db, hive_ids)
+    versioning.bump_version(db, "hives")
+    db.commit()
+    log_event(f"Inspection batch ingested: {len(rows)} records for {len(hive_ids)} hives by {username}")
+    return schemas.InspectionBatchResult(inserted=len(rows), hives=len(hive_ids))
+
+
+@router.post("/batch", response_model=schemas.InspectionBatchResult)
+async def create_inspections_batch(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Ingest many inspections or sensor readings at once, as a JSON array or NDJSON (application/x-ndjson)."""
+    records = parse_json_batch(await request.body(), request.headers.get("content-type", ""))
+    if not records:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(records) > INSPECTION_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {INSPECTION_BATCH_MAX} records")
+    try:
+        inspections = _inspection_list.validate_python(records)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+
+    # Database work runs off the event loop, like the synchronous routes.
+    return await run_in_threadpool(_ingest_batch, db, inspections, current_user.username)
+
+
 @router.get("/", response_model=list[schemas.InspectionRead])
-def list_inspections(db: Session = Depends(get_db)):
-    inspections = db.query(models.Inspection).all()
-    log_event(f"Inspections list requested, found {len(inspections)} inspections")
-    return inspections
+async def list_inspections(
+    response: Response,
+    hive_id: Optional[int] = Query(None),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    disease: Optional[str] = Query(None),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db)
+):
+    stmt = _filter_inspections(select(models.Inspection), date_from, date_to, disease)
+    if hive_id is not None:
+        stmt = stmt.where(models.Inspection.hive_id == hive_id)
+    inspections = await apaginate(db, stmt, models.Inspection, page, response, INSPECTION_SORT_COLUMNS)
+    await alog_event(f"Inspections list requested, found {len(inspections)} inspections")
+    return models_response(_inspection_reads, inspections, response)
 
 
 @router.get("/hive/{hive_id}", response_model=list[schemas.InspectionRead])
-def get_inspections_for_hive(hive_id: int, db: Session = Depends(get_db)):
-    hive = db.query(models.Hive).get(hive_id)
+async def get_inspections_for_hive(
+    hive_id: int,
+    response: Response,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    disease: Optional[str] = Query(None),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db)
+):
+    hive = await db.get(models.Hive, hive_id)
     if not hive:
-        log_event(f"Inspections request failed: hive {hive_id} not found")
+        await alog_event(f"Inspections request failed: hive {hive_id} not found")
         raise HTTPException(status_code=404, detail="Hive not found")
-    inspections = db.query(models.Inspection).filter(models.Inspection.hive_id == hive_id).all()
-    log_event(f"Inspections requested for hive {hive.name} (ID: {hive_id}), found {len(inspections)} inspections")
-    return inspections
+    stmt = select(models.Inspection).where(models.Inspection.hive_id == hive_id)
+    stmt = _filter_inspections(stmt, date_from, date_to, disease)
+    inspections = await apaginate(db, stmt, models.Inspection, page, response, INSPECTION_SORT_COLUMNS)
+    await alog_event(f"Inspections requested for hive {hive.name} (ID: {hive_id}), found {len(inspections)} inspections")
+    return models_response(_inspection_reads, inspections, response)
 
 
 @router.put("/{inspection_id}", response_model=schemas.InspectionRead)
@@ -61,9 +165,15 @@ def update_inspection(
         log_event(f"Inspection update failed: inspection {inspection_id} not found, attempted by admin {current_user.username}")
         raise HTTPException(status_code=404, detail="Inspection not found")
 
+    old_hive_id = existing_inspection.hive_id
     for key, value in inspection.dict(exclude_unset=True).items():
         setattr(existing_inspection, key, value)
+    if existing_inspection.date is not None:
+        existing_inspection.date = utc_naive(existing_inspection.date)
 
+    db.flush()
+    hive_summary.refresh_summaries(db, {old_hive_id, existing_inspection.hive_id})
+    versioning.bump_version(db, "hives")
     db.commit()
     db.refresh(existing_inspection)
     log_event(f"Inspection updated: ID {inspection_id} by admin {current_user.username}")
@@ -81,7 +191,11 @@ def delete_inspection(
         log_event(f"Inspection deletion failed: inspection {inspection_id} not found, attempted by admin {current_user.username}")
         raise HTTPException(status_code=404, detail="Inspection not found")
 
+    hive_id = inspection.hive_id
     db.delete(inspection)
+    db.flush()
+    hive_summary.refresh_summaries(db, [hive_id])
+    versioning.bump_version(db, "hives")
     db.commit()
     log_event(f"Inspection deleted: ID {inspection_id} by admin {current_user.username}")
     return
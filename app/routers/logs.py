@@ -1,22 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app import models
-from app.database import get_db
-from app.services.auth import requires_role
-from app.utils.logger import log_event
-from typing import List
+from pydantic import TypeAdapter
+from app import models, schemas
+from app.database import get_async_read_db, get_db
+from app.services.auth import requires_role, requires_role_async
+from app.utils.logger import alog_event, log_event
+from app.utils.pagination import PageParams, apaginate, filter_date_range, page_params
+from app.utils.serialization import json_response, models_response
+from datetime import datetime
+from typing import List, Optional
 
 router = APIRouter()
 
+LOG_SORT_COLUMNS = {
+    "id": models.Log.id,
+    "timestamp": models.Log.timestamp,
+}
+
+JOB_RUN_SORT_COLUMNS = {
+    "id": models.JobRun.id,
+    "started_at": models.JobRun.started_at,
+    "duration_ms": models.JobRun.duration_ms,
+}
+
+_job_run_reads = TypeAdapter(List[schemas.JobRunRead])
+
 
 @router.get("/", response_model=List[dict])
-def get_logs(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(requires_role("admin"))
+async def get_logs(
+    response: Response,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(requires_role_async("admin"))
+):
+    # Rows go straight from SQL to orjson; the log table is internal and needs no validation.
+    stmt = select(models.Log.id, models.Log.timestamp, models.Log.event)
+    stmt = filter_date_range(stmt, models.Log.timestamp, date_from, date_to)
+    logs = await apaginate(db, stmt, models.Log, page, response, LOG_SORT_COLUMNS, default_sort="-timestamp",
+                           scalars=False)
+    await alog_event(f"Logs requested by admin {current_user.username}, returned {len(logs)} logs")
+    return json_response([log._asdict() for log in logs], response)
+
+
+@router.get("/jobs", response_model=List[schemas.JobRunRead])
+async def get_job_runs(
+    response: Response,
+    job: Optional[str] = None,
+    job_status: Optional[str] = Query(None, alias="status"),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(requires_role_async("admin"))
 ):
-    logs = db.query(models.Log).order_by(models.Log.timestamp.desc()).all()
-    log_event(f"Logs requested by admin {current_user.username}, returned {len(logs)} logs")
-    return [{"id": log.id, "timestamp": log.timestamp.isoformat(), "event": log.event} for log in logs]
+    stmt = filter_date_range(select(models.JobRun), models.JobRun.started_at, date_from, date_to)
+    if job:
+        stmt = stmt.where(models.JobRun.job == job)
+    if job_status:
+        stmt = stmt.where(models.JobRun.status == job_status)
+    runs = await apaginate(db, stmt, models.JobRun, page, response, JOB_RUN_SORT_COLUMNS, default_sort="-started_at")
+    return models_response(_job_run_reads, runs, response)
 
 
 @router.delete("/clear", status_code=status.HTTP_204_NO_CONTENT)
@@ -1,14 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from collections import defaultdict
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, selectinload
 from app import models, schemas
 from app.database import get_db
+from app.services import versioning
 from app.services.auth import get_current_user, requires_role
 from app.utils.logger import log_event
-from typing import List
+from app.utils.pagination import PageParams, filter_date_range, page_params, paginate
+from app.utils.serialization import json_response, models_response
+from typing import List, Optional
 from datetime import datetime, timezone
 
 router = APIRouter()
 
+ORDER_SORT_COLUMNS = {
+    "id": models.Order.id,
+    "date": models.Order.date,
+    "total_price": models.Order.total_price,
+}
+
+_order_reads = TypeAdapter(List[schemas.OrderRead])
+
+# Column order matches schemas.OrderRead, so row dicts serialize to the same JSON.
+ORDER_ROW_COLUMNS = (
+    models.Order.id, models.Order.user_id, models.Order.date, models.Order.status, models.Order.total_price,
+)
+ORDER_ITEM_ROW_COLUMNS = (models.OrderItem.product_id, models.OrderItem.quantity, models.OrderItem.price_each)
+
+
+def _filter_orders(query, status, date_from, date_to):
+    if status:
+        query = query.filter(models.Order.status == status)
+    return filter_date_range(query, models.Order.date, date_from, date_to)
+
+
+def _order_row_dicts(db: Session, rows) -> list:
+    items = defaultdict(list)
+    if rows:
+        item_rows = (
+            db.query(models.OrderItem.order_id, *ORDER_ITEM_ROW_COLUMNS)
+            .filter(models.OrderItem.order_id.in_([row.id for row in rows]))
+            .order_by(models.OrderItem.id)
+        )
+        for order_id, product_id, quantity, price_each in item_rows:
+            items[order_id].append({"product_id": product_id, "quantity": quantity, "price_each": price_each})
+    return [{**row._asdict(), "items": items[row.id]} for row in rows]
+
 
 @router.post("/", response_model=schemas.OrderRead)
 def create_order(
@@ -20,14 +59,17 @@ def create_order(
         log_event(f"Order creation failed: empty order attempted by {user.username}")
         raise HTTPException(status_code=400, detail="Order must contain at least one product")
 
+    # One query for every line item instead of one lookup per item. Nothing is written until
+    # every line has been validated, so a rejected order never holds a write lock.
+    product_ids = {item.product_id for item in order_data.items}
+    products = {p.id: p for p in db.query(models.Product).filter(models.Product.id.in_(product_ids))}
+
     order = models.Order(user_id=user.id, date=datetime.now(timezone.utc), status="pending", total_price=0)
-    db.add(order)
-    db.flush()
 
     total = 0
     product_names = []
     for item in order_data.items:
-        product = db.query(models.Product).get(item.product_id)
+        product = products.get(item.product_id)
         if not product:
             log_event(f"Order creation failed: product ID {item.product_id} not found, attempted by {user.username}")
             raise HTTPException(status_code=404, detail=f"Product ID {item.product_id} not found")
@@ -35,20 +77,36 @@ def create_order(
             log_event(f"Order creation failed: insufficient stock for product '{product.name}' (requested: {item.quantity}, available: {product.stock_quantity}), attempted by {user.username}")
             raise HTTPException(status_code=400, detail=f"Not enough stock for product '{product.name}'")
 
-        product.stock_quantity -= item.quantity
         line_price = item.quantity * product.unit_price
         total += line_price
         product_names.append(f"{product.name} x{item.quantity}")
 
-        order_item = models.OrderItem(
-            order_id=order.id,
+        order.items.append(models.OrderItem(
             product_id=item.product_id,
             quantity=item.quantity,
             price_each=product.unit_price
-        )
-        db.add(order_item)
+        ))
+
+    # Stock is taken with a conditional UPDATE in SQL rather than through the ORM, so concurrent checkouts
+    # of one product serialize on the row instead of failing the product's optimistic version check.
+    # The version is still bumped, so admin edits made with expected_version see the change.
+    for item in order_data.items:
+        taken = db.execute(
+            update(models.Product)
+            .where(models.Product.id == item.product_id, models.Product.stock_quantity >= item.quantity)
+            .values(stock_quantity=models.Product.stock_quantity - item.quantity,
+                    version=models.Product.version + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not taken:
+            product_name = products[item.product_id].name
+            db.rollback()
+            log_event(f"Order creation failed: stock for product '{product_name}' ran out concurrently, attempted by {user.username}")
+            raise HTTPException(status_code=400, detail=f"Not enough stock for product '{product_name}'")
 
     order.total_price = total
+    db.add(order)
+    versioning.bump_version(db, "products")
     db.commit()
     db.refresh(order)
     log_event(f"Order created: ID {order.id} by {user.username}, items: {', '.join(product_names)}, total: ${total:.2f}")
@@ -57,22 +115,39 @@ def create_order(
 
 @router.get("/", response_model=List[schemas.OrderRead])
 def get_user_orders(
+    response: Response,
+    status: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
     user: models.User = Depends(get_current_user)
 ):
-    orders = db.query(models.Order).filter(models.Order.user_id == user.id).all()
+    query = db.query(models.Order).options(selectinload(models.Order.items)).filter(models.Order.user_id == user.id)
+    query = _filter_orders(query, status, date_from, date_to)
+    orders = paginate(query, models.Order, page, response, ORDER_SORT_COLUMNS)
     log_event(f"User orders requested by {user.username}, found {len(orders)} orders")
-    return orders
+    return models_response(_order_reads, orders, response)
 
 
 @router.get("/all", response_model=List[schemas.OrderRead])
 def get_all_orders(
+    response: Response,
+    status: Optional[str] = Query(None),
+    user_id: Optional[int] = Query(None),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(requires_role("admin"))
 ):
-    orders = db.query(models.Order).all()
-    log_event(f"All orders requested by admin {current_user.username}, found {len(orders)} orders")
-    return orders
+    # Admin-only listing: rows are serialized straight from SQL without building ORM objects.
+    query = _filter_orders(db.query(*ORDER_ROW_COLUMNS), status, date_from, date_to)
+    if user_id is not None:
+        query = query.filter(models.Order.user_id == user_id)
+    rows = paginate(query, models.Order, page, response, ORDER_SORT_COLUMNS)
+    log_event(f"All orders requested by admin {current_user.username}, found {len(rows)} orders")
+    return json_response(_order_row_dicts(db, rows), response)
 
 
 @router.put("/{order_id}", response_model=schemas.OrderRead)
@@ -114,12 +189,28 @@ def delete_order(
         log_event(f"Order deletion failed: order {order_id} not found or unauthorized access by {user.username}")
         raise HTTPException(status_code=403, detail="Not authorized to delete this order")
 
-    restored_items = []
-    for item in order.items:
-        item.product.stock_quantity += item.quantity
-        restored_items.append(f"{item.product.name} x{item.quantity}")
+    # Stock goes back with a SQL increment, like checkout takes it, so a concurrent checkout cannot fail
+    # the delete on the product's version check. Products are not loaded; one UPDATE per product.
+    items = db.execute(
+        select(models.OrderItem.product_id, models.OrderItem.quantity, models.Product.name)
+        .join(models.Product, models.Product.id == models.OrderItem.product_id)
+        .where(models.OrderItem.order_id == order_id)
+        .order_by(models.OrderItem.id)
+    ).all()
+    quantities = defaultdict(int)
+    for product_id, quantity, _ in items:
+        quantities[product_id] += quantity
+    for product_id, quantity in quantities.items():
+        db.execute(
+            update(models.Product)
+            .where(models.Product.id == product_id)
+            .values(stock_quantity=models.Product.stock_quantity + quantity, version=models.Product.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+    restored_items = [f"{name} x{quantity}" for _, quantity, name in items]
 
     db.delete(order)
+    versioning.bump_version(db, "products")
     db.commit()
     log_event(f"Order deleted: ID {order_id} by {user.username}, restored stock: {', '.join(restored_items)}")
     return
@@ -1,12 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import and_, case, or_, select, update
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.database import get_db
+from app.services import catalog, versioning
 from app.services.auth import get_current_user, requires_role
-from app.utils.logger import log_event
+from app.utils.etag import not_modified
+from app.utils.logger import alog_event, log_event
+from app.utils.pagination import PageParams, page_params, paginate_records
 
 router = APIRouter()
 
+PRODUCT_SORT_COLUMNS = {
+    "id": models.Product.id,
+    "name": models.Product.name,
+    "unit_price": models.Product.unit_price,
+}
+
 
 @router.post("/", response_model=schemas.ProductRead)
 def create_product(
@@ -21,6 +32,7 @@ def create_product(
 
     new_product = models.Product(**product.dict())
     db.add(new_product)
+    versioning.bump_version(db, "products")
     db.commit()
     db.refresh(new_product)
     log_event(f"Product created: {product.name} by admin {current_user.username}")
@@ -28,20 +40,119 @@ def create_product(
 
 
 @router.get("/", response_model=list[schemas.ProductRead])
-def list_products(db: Session = Depends(get_db)):
-    products = db.query(models.Product).all()
-    log_event(f"Products list requested, found {len(products)} products")
-    return products
+async def list_products(
+    request: Request,
+    response: Response,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    in_stock: Optional[bool] = Query(None),
+    page: PageParams = Depends(page_params)
+):
+    # Served from the in-process catalog; no database round trip while the catalog is current.
+    snapshot = await catalog.asnapshot("products")
+    cached = not_modified(request, response, versioning.format_etag(request, {"products": snapshot.version}))
+    if cached:
+        return cached
+
+    products = snapshot.records
+    if min_price is not None:
+        products = [p for p in products if p.unit_price >= min_price]
+    if max_price is not None:
+        products = [p for p in products if p.unit_price <= max_price]
+    if in_stock is True:
+        products = [p for p in products if (p.stock_quantity or 0) > 0]
+    elif in_stock is False:
+        products = [p for p in products if (p.stock_quantity or 0) <= 0]
+    return catalog.json_response(paginate_records(products, page, response, PRODUCT_SORT_COLUMNS), response)
 
 
 @router.get("/{product_id}", response_model=schemas.ProductRead)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.query(models.Product).get(product_id)
+async def get_product(product_id: int, request: Request, response: Response):
+    snapshot = await catalog.asnapshot("products")
+    product = snapshot.by_id.get(product_id)
     if not product:
-        log_event(f"Product not found: {product_id}")
+        await alog_event(f"Product not found: {product_id}")
         raise HTTPException(status_code=404, detail="Product not found")
-    log_event(f"Product details requested: {product.name} (ID: {product_id})")
-    return product
+    cached = not_modified(request, response, versioning.format_etag(request, {"products": snapshot.version}))
+    if cached:
+        return cached
+    return catalog.record_response(product, response)
+
+
+@router.patch("/bulk", response_model=list[schemas.ProductRead])
+def bulk_update_products(
+    payload: schemas.ProductBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(requires_role("admin"))
+):
+    """
+    Apply stock deltas, absolute stock levels and prices to many products in one transaction.
+    Deltas are applied atomically in SQL, so they compose with concurrent order decrements;
+    items with expected_version are only applied if the product is still at that version.
+    """
+    Product = models.Product
+    items = payload.items
+    ids = [item.id for item in items]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Each product may appear only once per batch")
+
+    current = dict(db.execute(select(Product.id, Product.version).where(Product.id.in_(ids))).all())
+    missing = sorted(set(ids) - current.keys())
+    if missing:
+        log_event(f"Bulk product update failed: products {missing} not found, attempted by admin {current_user.username}")
+        raise HTTPException(status_code=404, detail=f"Products not found: {missing}")
+
+    def conflicts(versions):
+        return [
+            schemas.ProductBulkConflict(id=item.id, expected_version=item.expected_version,
+                                        current_version=versions[item.id]).model_dump()
+            for item in items
+            if item.expected_version is not None and versions[item.id] != item.expected_version
+        ]
+
+    stale = conflicts(current)
+    if stale:
+        log_event(f"Bulk product update rejected: {len(stale)} version conflicts, attempted by admin {current_user.username}")
+        raise HTTPException(status_code=409, detail=stale)
+
+    stock = {
+        item.id: Product.stock_quantity + item.stock_delta if item.stock_delta is not None else item.stock_quantity
+        for item in items
+        if item.stock_delta is not None or item.stock_quantity is not None
+    }
+    prices = {item.id: item.unit_price for item in items if item.unit_price is not None}
+    values = {"version": Product.version + 1}
+    if stock:
+        values["stock_quantity"] = case(stock, value=Product.id, else_=Product.stock_quantity)
+    if prices:
+        values["unit_price"] = case(prices, value=Product.id, else_=Product.unit_price)
+
+    # The version check is repeated in the UPDATE itself, so a write that lands after the read above still loses.
+    guards = [and_(Product.id == item.id, Product.version == item.expected_version)
+              for item in items if item.expected_version is not None]
+    unguarded = [item.id for item in items if item.expected_version is None]
+    if unguarded:
+        guards.append(Product.id.in_(unguarded))
+
+    updated = db.execute(
+        update(Product).where(or_(*guards)).values(**values).execution_options(synchronize_session=False)
+    ).rowcount
+    if updated != len(items):
+        db.rollback()
+        versions = dict(db.execute(select(Product.id, Product.version).where(Product.id.in_(ids))).all())
+        log_event(f"Bulk product update rejected: concurrent modification, attempted by admin {current_user.username}")
+        raise HTTPException(status_code=409, detail=conflicts(versions) or "Products changed concurrently, retry")
+
+    negative = db.execute(select(Product.id).where(Product.id.in_(ids), Product.stock_quantity < 0)).scalars().all()
+    if negative:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Stock would become negative for products: {sorted(negative)}")
+
+    versioning.bump_version(db, "products")
+    db.commit()
+    products = db.query(Product).filter(Product.id.in_(ids)).order_by(Product.id).all()
+    log_event(f"Bulk product update: {len(items)} products by admin {current_user.username}")
+    return products
 
 
 @router.put("/{product_id}", response_model=schemas.ProductRead)
@@ -59,6 +170,7 @@ def update_product(
     for key, value in product_data.dict(exclude_unset=True).items():
         setattr(product, key, value)
 
+    versioning.bump_version(db, "products")
     db.commit()
     db.refresh(product)
     log_event(f"Product updated: {product.name} (ID: {product_id}) by admin {current_user.username}")
@@ -78,6 +190,7 @@ def delete_product(
 
     product_name = product.name
     db.delete(product)
+    versioning.bump_version(db, "products")
     db.commit()
     log_event(f"Product deleted: {product_name} (ID: {product_id}) by admin {current_user.username}")
     return
@@ -1,41 +1,40 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, extract, select
+from app.database import get_async_read_db
 from app.models import Order, OrderItem, Inspection, Product
-from app.services.auth import requires_role
-from app.utils.logger import log_event
+from app.services.auth import requires_role_async
+from app.utils.logger import alog_event
 from datetime import datetime, timezone
 
 router = APIRouter()
 
 
 @router.get("/first-year")
-def get_first_year(db: Session = Depends(get_db),
-    current_user: str = Depends(requires_role("admin"))
+async def get_first_year(db: AsyncSession = Depends(get_async_read_db),
+    current_user: str = Depends(requires_role_async("admin"))
 ):
-    first_order = db.query(func.min(Order.date)).scalar()
+    first_order = (await db.execute(select(func.min(Order.date)))).scalar()
     result = first_order.year if first_order else datetime.now(timezone.utc).year
-    log_event(f"First year stats requested by admin {current_user.username}, result: {result}")
+    await alog_event(f"First year stats requested by admin {current_user.username}, result: {result}")
     return result
 
 
 @router.get("/monthly-sales")
-def get_monthly_sales(
+async def get_monthly_sales(
     year: int,
     month: int,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(requires_role("admin"))
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: str = Depends(requires_role_async("admin"))
 ):
-    total_sales = db.query(func.sum(Order.total_price)).filter(
-        extract("year", Order.date) == year,
-        extract("month", Order.date) == month
-    ).scalar() or 0.0
-
-    total_orders = db.query(func.count(Order.id)).filter(
-        extract("year", Order.date) == year,
-        extract("month", Order.date) == month
-    ).scalar() or 0
+    total_sales, total_orders = (await db.execute(
+        select(func.sum(Order.total_price), func.count(Order.id)).where(
+            extract("year", Order.date) == year,
+            extract("month", Order.date) == month
+        )
+    )).one()
+    total_sales = total_sales or 0.0
+    total_orders = total_orders or 0
 
     result = {
         "year": year,
@@ -44,21 +43,23 @@ def get_monthly_sales(
         "total_sales": round(total_sales, 2)
     }
     
-    log_event(f"Monthly sales stats requested by admin {current_user.username} for {year}-{month:02d}: {total_orders} orders, ${result['total_sales']}")
+    await alog_event(f"Monthly sales stats requested by admin {current_user.username} for {year}-{month:02d}: {total_orders} orders, ${result['total_sales']}")
     return result
 
 
 @router.get("/monthly-inspections")
-def get_monthly_inspections(
+async def get_monthly_inspections(
     year: int,
     month: int,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(requires_role("admin"))
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: str = Depends(requires_role_async("admin"))
 ):
-    count = db.query(func.count(Inspection.id)).filter(
-        extract("year", Inspection.date) == year,
-        extract("month", Inspection.date) == month
-    ).scalar()
+    count = (await db.execute(
+        select(func.count(Inspection.id)).where(
+            extract("year", Inspection.date) == year,
+            extract("month", Inspection.date) == month
+        )
+    )).scalar()
 
     result = {
         "year": year,
@@ -66,39 +67,43 @@ def get_monthly_inspections(
         "inspections": count
     }
     
-    log_event(f"Monthly inspections stats requested by admin {current_user.username} for {year}-{month:02d}: {count} inspections")
+    await alog_event(f"Monthly inspections stats requested by admin {current_user.username} for {year}-{month:02d}: {count} inspections")
     return result
 
 @router.get("/yearly-top-products")
-def get_yearly_top_products(
+async def get_yearly_top_products(
     year: int,
     limit: int = 5,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(requires_role("admin"))
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: str = Depends(requires_role_async("admin"))
 ):
-    result = db.query(
-        Product.name,
-        func.sum(OrderItem.quantity).label("total_sold")
-    ).join(OrderItem.product).join(OrderItem.order).filter(
-        extract("year", Order.date) == year
-    ).group_by(Product.id).order_by(func.sum(OrderItem.quantity).desc()).limit(limit).all()
+    result = (await db.execute(
+        select(
+            Product.name,
+            func.sum(OrderItem.quantity).label("total_sold")
+        ).join(OrderItem.product).join(OrderItem.order).where(
+            extract("year", Order.date) == year
+        ).group_by(Product.id).order_by(func.sum(OrderItem.quantity).desc()).limit(limit)
+    )).all()
 
     products = [{"product": r[0], "sold": int(r[1])} for r in result]
-    log_event(f"Yearly top products stats requested by admin {current_user.username} for {year}, found {len(products)} products")
+    await alog_event(f"Yearly top products stats requested by admin {current_user.username} for {year}, found {len(products)} products")
     return products
 
 
 @router.get("/top-products")
-def get_top_selling_products(
+async def get_top_selling_products(
     limit: int = 5,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(requires_role("admin"))
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: str = Depends(requires_role_async("admin"))
 ):
-    result = db.query(
-        Product.name,
-        func.sum(OrderItem.quantity).label("total_sold")
-    ).join(OrderItem.product).group_by(Product.id).order_by(func.sum(OrderItem.quantity).desc()).limit(limit).all()
+    result = (await db.execute(
+        select(
+            Product.name,
+            func.sum(OrderItem.quantity).label("total_sold")
+        ).join(OrderItem.product).group_by(Product.id).order_by(func.sum(OrderItem.quantity).desc()).limit(limit)
+    )).all()
 
     products = [{"product": r[0], "sold": int(r[1])} for r in result]
-    log_event(f"Top products stats requested by admin {current_user.username}, found {len(products)} products")
+    await alog_event(f"Top products stats requested by admin {current_user.username}, found {len(products)} products")
     return products
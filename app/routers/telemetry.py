@@ -0,0 +1,74 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.database import get_db
+from app.services import telemetry
+from app.services.auth import get_current_user
+from app.utils.batch import parse_json_batch
+from app.utils.logger import log_event
+
+router = APIRouter()
+
+TELEMETRY_BATCH_MAX = int(os.getenv("TELEMETRY_BATCH_MAX", "50000"))
+
+_reading_list = TypeAdapter(list[schemas.TelemetryReadingCreate])
+
+
+def _ingest(db: Session, readings: list, username: str) -> schemas.TelemetryIngestResult:
+    hive_ids = {reading.hive_id for reading in readings}
+    known = set(db.execute(select(models.Hive.id).where(models.Hive.id.in_(hive_ids))).scalars())
+    missing = sorted(hive_ids - known)
+    if missing:
+        log_event(f"Telemetry batch rejected: unknown hives {missing[:20]}, attempted by {username}")
+        raise HTTPException(status_code=404, detail=f"Hives not found: {missing[:20]}")
+
+    telemetry.ingest_readings(db, readings)
+    db.commit()
+    log_event(f"Telemetry batch ingested: {len(readings)} readings for {len(hive_ids)} hives by {username}")
+    return schemas.TelemetryIngestResult(inserted=len(readings))
+
+
+@router.post("/readings", response_model=schemas.TelemetryIngestResult)
+async def ingest_readings(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Append sensor readings, as a JSON array or NDJSON (application/x-ndjson)."""
+    records = parse_json_batch(await request.body(), request.headers.get("content-type", ""))
+    if not records:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(records) > TELEMETRY_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {TELEMETRY_BATCH_MAX} readings")
+    try:
+        readings = _reading_list.validate_python(records)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+    return await run_in_threadpool(_ingest, db, readings, current_user.username)
+
+
+@router.get("/hives/{hive_id}", response_model=schemas.TelemetrySeries)
+def get_series(
+    hive_id: int,
+    metric: str = Query(..., max_length=32),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    resolution: schemas.TelemetryResolution = Query(schemas.TelemetryResolution.auto),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    end = telemetry.to_epoch(date_to or datetime.now(timezone.utc))
+    start = telemetry.to_epoch(date_from) if date_from else end - int(timedelta(days=1).total_seconds())
+    if start >= end:
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+
+    chosen = telemetry.pick_resolution(start, end, resolution.value)
+    points = telemetry.query_series(db, hive_id, metric, start, end, chosen)
+    log_event(f"Telemetry requested for hive {hive_id} ({metric}, {chosen}) by {current_user.username}: {len(points)} points")
+    return schemas.TelemetrySeries(hive_id=hive_id, metric=metric, resolution=chosen, points=points)
@@ -8,8 +8,11 @@ from app.utils.hashing import Hasher
 from app.utils.password import validate_password_strength, is_password_breached, PasswordPolicyError
 from app.services import auth
 from fastapi.security import OAuth2PasswordRequestForm
+from pydantic import TypeAdapter
 from datetime import timedelta, datetime, timezone
 from app.utils.logger import log_event
+from app.utils.pagination import PageParams, page_params, paginate
+from app.utils.serialization import models_response
 from typing import List, Optional, Dict, Tuple
 from jose import jwt
 from time import time
@@ -20,6 +23,13 @@ _registration_attempts: Dict[str, Tuple[int, float]] = {}
 _REG_WINDOW_SECONDS = 60 * 5
 _REG_MAX_ATTEMPTS = 5
 
+USER_SORT_COLUMNS = {
+    "id": models.User.id,
+    "username": models.User.username,
+}
+
+_user_reads = TypeAdapter(list[schemas.UserRead])
+
 
 @router.post("/register", response_model=schemas.UserRead)
 @limiter.limit("3/minute")
@@ -345,11 +355,20 @@ def update_user(
 
 @router.get("/", response_model=list[schemas.UserRead])
 def list_users(
+    response: Response,
+    role: Optional[schemas.UserRole] = Query(None),
+    is_active: Optional[bool] = Query(None),
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
     _: models.User = Depends(auth.requires_role("admin"))
 ):
     log_event(f"User list requested by admin: {_.username}")
-    return db.query(models.User).all()
+    query = db.query(models.User)
+    if role:
+        query = query.filter(models.User.role == role.value)
+    if is_active is not None:
+        query = query.filter(models.User.is_active == is_active)
+    return models_response(_user_reads, paginate(query, models.User, page, response, USER_SORT_COLUMNS), response)
 
 @router.get("/{user_id}", response_model=schemas.UserRead)
 def get_user(
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, constr, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, constr, field_validator, model_validator
 from typing import Annotated
 from enum import Enum
 from datetime import datetime
@@ -41,8 +41,7 @@ class UserCreate(UserBase):
 class UserRead(UserBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserUpdate(BaseModel):
@@ -52,8 +51,7 @@ class UserUpdate(BaseModel):
     role: Optional[UserRole] = None
     is_active: Optional[bool] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ---------------------
@@ -106,16 +104,14 @@ class UserSessionRead(UserSessionBase):
     expires_at: datetime
     is_valid: bool
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserSessionUpdate(BaseModel):
     last_activity: Optional[datetime] = None
     is_valid: Optional[bool] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --------------------
@@ -135,9 +131,12 @@ class HiveCreate(HiveBase):
 class HiveRead(HiveBase):
     id: int
     last_inspection_date: Optional[datetime]
+    inspection_count: int = 0
+    latest_temperature: Optional[float] = None
+    latest_disease: Optional[str] = None
+    recent_disease_count: int = 0
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --------------------------
@@ -159,8 +158,12 @@ class InspectionRead(InspectionBase):
     id: int
     hive_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class InspectionBatchResult(BaseModel):
+    inserted: int
+    hives: int
 
 
 # -----------------------
@@ -183,15 +186,40 @@ class ProductUpdate(BaseModel):
     unit_price: Optional[float]
     stock_quantity: Optional[int]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProductRead(ProductBase):
     id: int
+    version: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductBulkItem(BaseModel):
+    id: int
+    stock_delta: Optional[int] = None
+    stock_quantity: Optional[int] = Field(None, ge=0)
+    unit_price: Optional[float] = Field(None, gt=0)
+    expected_version: Optional[int] = None
 
-    class Config:
-        orm_mode = True
+    @model_validator(mode="after")
+    def check_changes(self):
+        if self.stock_delta is not None and self.stock_quantity is not None:
+            raise ValueError("Use either stock_delta or stock_quantity, not both")
+        if self.stock_delta is None and self.stock_quantity is None and self.unit_price is None:
+            raise ValueError("No changes given")
+        return self
+
+
+class ProductBulkUpdate(BaseModel):
+    items: List[ProductBulkItem] = Field(..., min_length=1, max_length=1000)
+
+
+class ProductBulkConflict(BaseModel):
+    id: int
+    expected_version: int
+    current_version: int
 
 
 # ---------------------
@@ -212,8 +240,7 @@ class OrderItemRead(BaseModel):
     quantity: int
     price_each: float
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrderRead(BaseModel):
@@ -224,12 +251,112 @@ class OrderRead(BaseModel):
     total_price: float
     items: List[OrderItemRead]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrderStatusUpdate(BaseModel):
     status: str
 
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ----------------------
+# --- EXPORT SCHEMAS ---
+# ----------------------
+
+class ExportKind(str, Enum):
+    orders_csv = "orders_csv"
+    orders_pdf = "orders_pdf"
+    inspections_pdf = "inspections_pdf"
+
+
+class ColumnarDataset(str, Enum):
+    orders = "orders"
+    order_items = "order-items"
+    inspections = "inspections"
+    logs = "logs"
+
+
+class ColumnarFormat(str, Enum):
+    parquet = "parquet"
+    arrow = "arrow"
+
+
+class ExportFilter(BaseModel):
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    since_id: Optional[int] = None
+    until_id: Optional[int] = None
+
+
+class ExportJobCreate(BaseModel):
+    kind: ExportKind
+    filters: Optional[ExportFilter] = None
+    summary_only: bool = False
+
+
+class ExportJobRead(BaseModel):
+    id: str
+    kind: ExportKind
+    status: str
+    progress: float
+    created_by: str
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    cursor: Optional[int] = None
+
+
+# -------------------------
+# --- TELEMETRY SCHEMAS ---
+# -------------------------
+
+class TelemetryResolution(str, Enum):
+    auto = "auto"
+    raw = "raw"
+    minute = "1m"
+    hour = "1h"
+    day = "1d"
+
+
+class TelemetryReadingCreate(BaseModel):
+    hive_id: int
+    metric: str = Field(..., min_length=1, max_length=32)
+    ts: datetime
+    value: float
+
+
+class TelemetryIngestResult(BaseModel):
+    inserted: int
+
+
+class TelemetryPoint(BaseModel):
+    ts: datetime
+    avg: float
+    min: float
+    max: float
+    count: int
+
+
+class TelemetrySeries(BaseModel):
+    hive_id: int
+    metric: str
+    resolution: TelemetryResolution
+    points: List[TelemetryPoint]
+
+
+# -------------------------
+# --- SCHEDULER SCHEMAS ---
+# -------------------------
+
+class JobRunRead(BaseModel):
+    id: int
+    job: str
+    holder: str
+    started_at: datetime
+    duration_ms: float
+    status: str
+    rows: Optional[int] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -3,15 +3,17 @@ from jose import JWTError, jwt
 from app.schemas import TokenData
 from fastapi import Depends, HTTPException, status, Request, Cookie
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from app.database import get_async_db, get_db
 from app import models, schemas
 from app.utils.hashing import Hasher
-from app.utils.logger import log_event
+from app.utils.logger import alog_event, log_event
 import os
 import secrets
 import uuid
-from typing import Optional
+from typing import Optional, Tuple
 
 SECRET_KEY = os.getenv("SECRET_KEY", "secret")
 ALGORITHM = "HS256"
@@ -84,23 +86,16 @@ def create_user_session(db: Session, user_id: int, refresh_token: str, expires_a
     return user_session
 
 
-def get_session_by_refresh_token(db: Session, refresh_token: str):
-    return db.query(models.UserSession).filter(
+def _refresh_session_query(refresh_token: str):
+    return select(models.UserSession).options(selectinload(models.UserSession.user)).where(
         models.UserSession.refresh_token == refresh_token,
         models.UserSession.is_valid == True,
         models.UserSession.expires_at > datetime.now(timezone.utc)
-    ).first()
+    )
 
 
-def refresh_access_token(db: Session, refresh_token: str):
-    session = get_session_by_refresh_token(db, refresh_token)
-    if not session:
-        return None
-    
-    session.last_activity = datetime.now(timezone.utc)
-    db.commit()
-    
-    return create_access_token(data={"sub": session.user.email, "session_id": session.id})
+def get_session_by_refresh_token(db: Session, refresh_token: str):
+    return db.execute(_refresh_session_query(refresh_token)).scalars().first()
 
 
 def invalidate_session(db: Session, session_id: int):
@@ -129,61 +124,115 @@ def invalidate_all_user_sessions(db: Session, user_id: int, except_session_id: i
     return len(sessions)
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db), 
-                  refresh_token: str = Cookie(None, alias="refresh_token")) -> models.User:
-    credentials_exception = HTTPException(
+class _Rejected(Exception):
+    """Raised by the shared token checks; the caller logs `message` (if any) and raises `exception`."""
+
+    def __init__(self, message: Optional[str], exception: HTTPException):
+        super().__init__(message)
+        self.message = message
+        self.exception = exception
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid token",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    if not token and refresh_token:
-        new_token = refresh_access_token(db, refresh_token)
-        if new_token:
-            token = new_token
-        else:
-            raise credentials_exception
-    
+
+
+def _user_query(email: str):
+    return select(models.User).where(models.User.email == email)
+
+
+def _session_query(session_id: int, user_id: int):
+    return select(models.UserSession).where(
+        models.UserSession.id == session_id,
+        models.UserSession.user_id == user_id
+    )
+
+
+def _refreshed_token(session: Optional[models.UserSession]) -> str:
+    """Access token for a session found by refresh token; the caller commits last_activity."""
+    if not session:
+        raise _Rejected(None, _credentials_exception())
+    session.last_activity = datetime.now(timezone.utc)
+    return create_access_token(data={"sub": session.user.email, "session_id": session.id})
+
+
+def _token_claims(token: Optional[str]) -> Tuple[str, Optional[int]]:
+    """(email, session_id) of a valid access token."""
     if not token:
-        raise credentials_exception
-    
+        raise _Rejected(None, _credentials_exception())
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        session_id: int = payload.get("session_id")
-        
-        if not email:
-            log_event("Token validation failed: missing email in token")
-            raise credentials_exception
-            
-        user = db.query(models.User).filter(models.User.email == email).first()
-        if not user:
-            log_event(f"Token validation failed: user with email {email} not found")
-            raise credentials_exception
-            
-        token_data = TokenData(username=user.username, session_id=session_id)
     except JWTError:
-        log_event("Token validation failed: JWT decode error")
-        raise credentials_exception
-
-    if token_data.session_id:
-        session = db.query(models.UserSession).filter(
-            models.UserSession.id == token_data.session_id,
-            models.UserSession.user_id == user.id
-        ).first()
-        
-        if session:
-            if session.is_valid:
-                session.last_activity = datetime.now(timezone.utc)
+        raise _Rejected("Token validation failed: JWT decode error", _credentials_exception())
+    email: str = payload.get("sub")
+    if not email:
+        raise _Rejected("Token validation failed: missing email in token", _credentials_exception())
+    return email, payload.get("session_id")
+
+
+def _check_user(user: Optional[models.User], email: str) -> models.User:
+    if not user:
+        raise _Rejected(f"Token validation failed: user with email {email} not found", _credentials_exception())
+    return user
+
+
+def _check_session(session: Optional[models.UserSession], user: models.User) -> bool:
+    """Touches a valid session and returns whether it needs committing; rejects a revoked one."""
+    if not session:
+        return False
+    if not session.is_valid:
+        raise _Rejected(
+            f"Session {session.id} for user {user.username} has been revoked. User logged out.",
+            HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Session has been revoked",
+                headers={"WWW-Authenticate": "Bearer", "X-Session-Revoked": "true"},
+            ),
+        )
+    session.last_activity = datetime.now(timezone.utc)
+    return True
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db), 
+                  refresh_token: str = Cookie(None, alias="refresh_token")) -> models.User:
+    try:
+        if not token and refresh_token:
+            token = _refreshed_token(get_session_by_refresh_token(db, refresh_token))
+            db.commit()
+        email, session_id = _token_claims(token)
+        user = _check_user(db.execute(_user_query(email)).scalars().first(), email)
+        if session_id:
+            session = db.execute(_session_query(session_id, user.id)).scalars().first()
+            if _check_session(session, user):
                 db.commit()
-            else:
-                log_event(f"Session {session.id} for user {token_data.username} has been revoked. User logged out.")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Session has been revoked",
-                    headers={"WWW-Authenticate": "Bearer", "X-Session-Revoked": "true"},
-                )
-    
+    except _Rejected as rejected:
+        if rejected.message:
+            log_event(rejected.message)
+        raise rejected.exception
+    return user
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db),
+                                 refresh_token: str = Cookie(None, alias="refresh_token")) -> models.User:
+    """get_current_user for async routes, on the async session."""
+    try:
+        if not token and refresh_token:
+            token = _refreshed_token((await db.execute(_refresh_session_query(refresh_token))).scalars().first())
+            await db.commit()
+        email, session_id = _token_claims(token)
+        user = _check_user((await db.execute(_user_query(email))).scalars().first(), email)
+        if session_id:
+            session = (await db.execute(_session_query(session_id, user.id))).scalars().first()
+            if _check_session(session, user):
+                await db.commit()
+    except _Rejected as rejected:
+        if rejected.message:
+            await alog_event(rejected.message)
+        raise rejected.exception
     return user
 
 
@@ -209,3 +258,12 @@ def requires_role(required_role: str):
             raise HTTPException(status_code=403, detail="Insufficient privileges")
         return current_user
     return decorator
+
+
+def requires_role_async(required_role: str):
+    async def decorator(current_user: models.User = Depends(get_current_user_async)):
+        if current_user.role != required_role:
+            await alog_event(f"Authorization failed: user {current_user.username} (role: {current_user.role}) requires role: {required_role}")
+            raise HTTPException(status_code=403, detail="Insufficient privileges")
+        return current_user
+    return decorator
@@ -0,0 +1,222 @@
+import csv
+import io
+import secrets
+import zipfile
+from datetime import datetime, timezone
+from typing import Iterator
+import orjson
+from sqlalchemy import Boolean, DateTime, Float, Integer, String, func, insert, select, text
+from app import models
+from app.database import engine, read_engine
+from app.services.versioning import bump_version, notify_bumped
+from app.utils.hashing import Hasher
+
+BACKUP_TABLES = [
+    models.User.__table__,
+    models.Product.__table__,
+    models.Hive.__table__,
+    models.Inspection.__table__,
+    models.Order.__table__,
+    models.OrderItem.__table__,
+    models.Log.__table__,
+]
+EXCLUDED_COLUMNS = {"users": {"hashed_password"}}
+# Restoring requires these to be empty. Users are merged, so the admin running the restore keeps their
+# account, and log entries are appended.
+DOMAIN_TABLES = [
+    models.Product.__table__,
+    models.Hive.__table__,
+    models.Inspection.__table__,
+    models.Order.__table__,
+    models.OrderItem.__table__,
+]
+BATCH_SIZE = 5000
+FORMATS = ("ndjson", "csv")
+
+
+class RestoreError(ValueError):
+    pass
+
+
+class RestoreConflict(RestoreError):
+    pass
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable write target that hands written bytes back to the response generator."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _backup_columns(table):
+    excluded = EXCLUDED_COLUMNS.get(table.name, set())
+    return [column for column in table.columns if column.name not in excluded]
+
+
+def _begin_snapshot(conn):
+    # Every member is read inside one transaction so the bundle is internally consistent.
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql("BEGIN")
+    elif conn.dialect.name == "postgresql":
+        conn.exec_driver_sql("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def stream_backup(fmt: str = "ndjson") -> Iterator[bytes]:
+    sink = _ChunkSink()
+    counts = {}
+    with read_engine().connect() as conn, zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        _begin_snapshot(conn)
+        for table in BACKUP_TABLES:
+            columns = _backup_columns(table)
+            names = [column.name for column in columns]
+            result = conn.execution_options(yield_per=BATCH_SIZE).execute(
+                select(*columns).order_by(table.c.id)
+            )
+            rows = 0
+            with archive.open(f"{table.name}.{fmt}", "w", force_zip64=True) as member:
+                if fmt == "csv":
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer)
+                    writer.writerow(names)
+                for partition in result.partitions():
+                    if fmt == "csv":
+                        writer.writerows([[_encode_value(value) for value in row] for row in partition])
+                        member.write(buffer.getvalue().encode("utf-8"))
+                        buffer.seek(0)
+                        buffer.truncate()
+                    else:
+                        member.write(b"".join(
+                            orjson.dumps(dict(zip(names, map(_encode_value, row)))) + b"\n" for row in partition
+                        ))
+                    rows += len(partition)
+                    yield sink.drain()
+                if fmt == "csv" and buffer.tell():
+                    member.write(buffer.getvalue().encode("utf-8"))
+            counts[str(table.name)] = rows
+            yield sink.drain()
+        conn.rollback()
+
+        manifest = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "format": fmt,
+            "tables": counts,
+        }
+        archive.writestr("manifest.json", orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+    yield sink.drain()
+
+
+def _coerce(column, value):
+    if value is None:
+        return None
+    if value == "" and not isinstance(column.type, String):
+        return None
+    if isinstance(column.type, DateTime) and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Boolean) and isinstance(value, str):
+        return value.lower() in ("true", "1")
+    if isinstance(column.type, Integer) and isinstance(value, str):
+        return int(value)
+    if isinstance(column.type, Float) and isinstance(value, str):
+        return float(value)
+    return value
+
+
+def _read_member(archive: zipfile.ZipFile, name: str, fmt: str) -> Iterator[dict]:
+    with archive.open(name) as member:
+        if fmt == "csv":
+            yield from csv.DictReader(io.TextIOWrapper(member, encoding="utf-8", newline=""))
+        else:
+            for line in member:
+                if line.strip():
+                    yield orjson.loads(line)
+
+
+def _merge_user(row: dict, existing: dict, taken: set, placeholder_hash: str):
+    """None for accounts that already exist; conflicts if an id or email belongs to a different account."""
+    current = existing.get(row["id"])
+    if current is not None:
+        if current.email != row["email"]:
+            raise RestoreConflict(f"User id {row['id']} belongs to a different account ({current.email})")
+        return None
+    if row["email"] in taken or row["username"] in taken:
+        raise RestoreConflict(f"User '{row['username']}' already exists with a different id")
+    row["hashed_password"] = placeholder_hash
+    return row
+
+
+def restore_backup(fileobj) -> dict:
+    try:
+        archive = zipfile.ZipFile(fileobj)
+        manifest = orjson.loads(archive.read("manifest.json"))
+    except (zipfile.BadZipFile, KeyError, orjson.JSONDecodeError):
+        raise RestoreError("Not a BeeTrack backup bundle")
+    fmt = manifest.get("format")
+    if fmt not in FORMATS:
+        raise RestoreError(f"Unsupported backup format: {fmt}")
+
+    # Password hashes are never exported; restored accounts get an unguessable password until an admin
+    # sets a new one with PUT /users/{user_id}.
+    placeholder_hash = Hasher.hash_password(secrets.token_urlsafe(32))
+    counts = {}
+    with archive, engine.begin() as conn:
+        for table in DOMAIN_TABLES:
+            if conn.execute(select(func.count()).select_from(table)).scalar():
+                raise RestoreConflict(f"Table '{table.name}' is not empty; restore requires an empty database")
+        users = models.User.__table__
+        existing = {row.id: row for row in conn.execute(select(users.c.id, users.c.email, users.c.username))}
+        taken = {row.email for row in existing.values()} | {row.username for row in existing.values()}
+
+        for table in BACKUP_TABLES:
+            member_name = f"{table.name}.{fmt}"
+            if member_name not in archive.namelist():
+                continue
+            columns = {column.name: column for column in _backup_columns(table)}
+            batch = []
+            rows = 0
+            for record in _read_member(archive, member_name, fmt):
+                row = {name: _coerce(columns[name], value) for name, value in record.items() if name in columns}
+                if table.name == "users":
+                    row = _merge_user(row, existing, taken, placeholder_hash)
+                    if row is None:
+                        continue
+                elif table.name == "logs":
+                    # Appended after the current entries rather than at their original ids.
+                    row.pop("id", None)
+                batch.append(row)
+                if len(batch) >= BATCH_SIZE:
+                    conn.execute(insert(table), batch)
+                    rows += len(batch)
+                    batch = []
+            if batch:
+                conn.execute(insert(table), batch)
+                rows += len(batch)
+            counts[str(table.name)] = rows
+
+            if conn.dialect.name == "postgresql" and rows:
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), (SELECT MAX(id) FROM {table.name}))"
+                ))
+        bump_version(conn, *counts)
+    notify_bumped(set(counts))
+    return counts
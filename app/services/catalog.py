@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Set, Tuple
+from fastapi import Response
+from fastapi.concurrency import run_in_threadpool
+from app import models, schemas
+from app.database import SessionLocal
+from app.services import versioning
+from app.utils.logger import log_event
+
+# How long a worker trusts its cached catalog before checking the table version again.
+# Writes in this process invalidate immediately; other workers converge within this window.
+CATALOG_VERSION_CHECK_INTERVAL = float(os.getenv("CATALOG_VERSION_CHECK_INTERVAL", "2"))
+
+
+class ProductRecord(NamedTuple):
+    id: int
+    name: str
+    description: Optional[str]
+    unit_price: float
+    stock_quantity: int
+    json: bytes
+
+
+class HiveRecord(NamedTuple):
+    id: int
+    name: str
+    location: Optional[str]
+    status: Optional[str]
+    last_inspection_date: Optional[datetime]
+    json: bytes
+
+
+class Snapshot(NamedTuple):
+    """One immutable view of a cached table; read version and records from the same snapshot."""
+    version: int
+    checked_at: float
+    records: Tuple
+    by_id: Dict[int, NamedTuple]
+
+
+# Table name -> (model, read schema, record type)
+_SOURCES = {
+    "products": (models.Product, schemas.ProductRead, ProductRecord),
+    "hives": (models.Hive, schemas.HiveRead, HiveRecord),
+}
+
+_entries: Dict[str, Snapshot] = {}
+_lock = threading.Lock()
+
+
+def _load(db, table: str, version: int) -> Snapshot:
+    model, schema, record_type = _SOURCES[table]
+    fields = [name for name in record_type._fields if name != "json"]
+    records = []
+    for row in db.query(model).order_by(model.id):
+        values = [getattr(row, name) for name in fields]
+        payload = schema.model_validate(row, from_attributes=True).model_dump_json().encode()
+        records.append(record_type(*values, payload))
+    log_event(f"Catalog cache loaded {len(records)} {table} at version {version}")
+    return Snapshot(version, time.monotonic(), tuple(records), {record.id: record for record in records})
+
+
+def snapshot(table: str) -> Snapshot:
+    entry = _entries.get(table)
+    if entry is not None and time.monotonic() - entry.checked_at < CATALOG_VERSION_CHECK_INTERVAL:
+        return entry
+
+    with _lock:
+        entry = _entries.get(table)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < CATALOG_VERSION_CHECK_INTERVAL:
+            return entry
+        # The primary, not a replica: after a local write invalidates the entry, a lagging replica would
+        # hand back the old rows, which would then stay cached until the next change.
+        db = SessionLocal()
+        try:
+            # Version and rows are read in one transaction, so the records match the version.
+            version = versioning.get_version(db, table)
+            if entry is None or entry.version != version:
+                entry = _load(db, table, version)
+            else:
+                entry = entry._replace(checked_at=now)
+        finally:
+            db.close()
+        _entries[table] = entry
+        return entry
+
+
+async def asnapshot(table: str) -> Snapshot:
+    """snapshot() for async routes; only a due version check or reload leaves the event loop."""
+    entry = _entries.get(table)
+    if entry is not None and time.monotonic() - entry.checked_at < CATALOG_VERSION_CHECK_INTERVAL:
+        return entry
+    return await run_in_threadpool(snapshot, table)
+
+
+def invalidate(tables: Set[str]):
+    for table in tables:
+        _entries.pop(table, None)
+
+
+versioning.on_version_bump(invalidate)
+
+
+def json_response(items, response: Response) -> Response:
+    # Headers set on the injected response (ETag, cursor) are not merged into a returned Response.
+    body = b"[" + b",".join(record.json for record in items) + b"]"
+    return Response(body, media_type="application/json", headers=dict(response.headers))
+
+
+def record_response(record, response: Response) -> Response:
+    return Response(record.json, media_type="application/json", headers=dict(response.headers))
@@ -0,0 +1,101 @@
+import os
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.services.export_filters import apply_export_filter
+from app.utils.logger import log_event
+
+BATCH_SIZE = int(os.getenv("COLUMNAR_EXPORT_BATCH_SIZE", "50000"))
+
+# Column name, SQL column and Arrow type name; types are resolved once pyarrow is imported.
+DATASETS = {
+    "orders": [
+        ("id", models.Order.id, "int64"),
+        ("user_id", models.Order.user_id, "int64"),
+        ("date", models.Order.date, "timestamp"),
+        ("status", models.Order.status, "string"),
+        ("total_price", models.Order.total_price, "float64"),
+        ("updated_at", models.Order.updated_at, "timestamp"),
+    ],
+    "order-items": [
+        ("id", models.OrderItem.id, "int64"),
+        ("order_id", models.OrderItem.order_id, "int64"),
+        ("product_id", models.OrderItem.product_id, "int64"),
+        ("quantity", models.OrderItem.quantity, "int64"),
+        ("price_each", models.OrderItem.price_each, "float64"),
+    ],
+    "inspections": [
+        ("id", models.Inspection.id, "int64"),
+        ("hive_id", models.Inspection.hive_id, "int64"),
+        ("date", models.Inspection.date, "timestamp"),
+        ("temperature", models.Inspection.temperature, "float64"),
+        ("disease_detected", models.Inspection.disease_detected, "string"),
+        ("notes", models.Inspection.notes, "string"),
+        ("updated_at", models.Inspection.updated_at, "timestamp"),
+    ],
+    "logs": [
+        ("id", models.Log.id, "int64"),
+        ("timestamp", models.Log.timestamp, "timestamp"),
+        ("event", models.Log.event, "string"),
+    ],
+}
+
+FORMATS = {
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "arrow": ("arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+def _arrow_schema(pa, dataset: str):
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        # Datetimes are stored naive in UTC.
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[type_name]) for name, _, type_name in DATASETS[dataset]])
+
+
+def _open_writer(fmt: str, path: str, schema):
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(path, schema, compression="zstd")
+    import pyarrow as pa
+    return pa.ipc.new_file(path, schema)
+
+
+def export_dataset(db: Session, dataset: str, fmt: str, path: str, filters: schemas.ExportFilter = None):
+    import pyarrow as pa
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    spec = DATASETS[dataset]
+    schema = _arrow_schema(pa, dataset)
+    id_column = spec[0][1]
+    stmt = select(*[column for _, column, _ in spec])
+    stmt = apply_export_filter(stmt, dataset, filters).order_by(id_column)
+
+    writer = None
+    rows = 0
+    try:
+        result = db.execute(stmt, execution_options={"yield_per": BATCH_SIZE})
+        for partition in result.partitions():
+            columns = list(zip(*partition))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            )
+            if writer is None:
+                writer = _open_writer(fmt, path, schema)
+            writer.write_batch(batch)
+            rows += len(partition)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        log_event(f"Export failed: No {dataset} found for {fmt} export")
+        return None
+
+    log_event(f"{dataset.title()} {fmt} exported successfully: {rows} rows to {path}")
+    return path
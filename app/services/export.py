@@ -1,30 +1,28 @@
 import os
-import pandas as pd
-from sqlalchemy.orm import Session
-from app import models
+from sqlalchemy import case, distinct, func, select
+from sqlalchemy.orm import Session, selectinload
+from app import models, schemas
+from app.services.export_filters import apply_export_filter
+from app.services.hive_summary import healthy_condition, is_healthy
 from app.utils.logger import log_event
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.platypus.flowables import HRFlowable
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from datetime import datetime
 
-UNICODE_FONT = 'Helvetica'
-log_event("Using standard Helvetica font for PDF generation")
 
+def _report_progress(progress, value: float):
+    if progress:
+        progress(value)
 
-def export_orders_to_csv(db: Session, path: str = "exports/orders.csv"):
-    os.makedirs("exports", exist_ok=True)
 
-    orders = db.query(models.Order).all()
+def export_orders_to_csv(db: Session, path: str = "exports/orders.csv", progress=None,
+                         filters: schemas.ExportFilter = None):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    query = db.query(models.Order).options(selectinload(models.Order.items))
+    orders = apply_export_filter(query, "orders", filters).all()
     if not orders:
         log_event("Export failed: No orders found for CSV export")
         return None
+    _report_progress(progress, 0.3)
 
     rows = []
     for order in orders:
@@ -40,389 +38,269 @@ def export_orders_to_csv(db: Session, path: str = "exports/orders.csv"):
                 "Total": f"${item.quantity * item.price_each:.2f}"
             })
 
+    _report_progress(progress, 0.7)
+    import pandas as pd
+
     df = pd.DataFrame(rows)
     df.to_csv(path, index=False)
     log_event(f"Orders CSV exported successfully: {len(orders)} orders, {len(rows)} items to {path}")
     return path
 
 
-def export_orders_to_pdf(db: Session, path: str = "exports/orders.pdf"):
-    os.makedirs("exports", exist_ok=True)
+DISEASE_SYMBOLS = {
+    'varroa': '[MITE]',
+    'nosema': '[VIRUS]',
+    'american foulbrood': '[CRITICAL]',
+    'european foulbrood': '[VIRUS]',
+    'chalkbrood': '[FUNGAL]',
+    'sacbrood': '[VIRUS]',
+    'black queen cell virus': '[VIRUS]',
+    'deformed wing virus': '[VIRUS]',
+    'small hive beetle': '[BEETLE]',
+    'wax moth': '[MOTH]'
+}
 
-    orders = db.query(models.Order).all()
-    if not orders:
-        log_event("Export failed: No orders found for PDF export")
-        return None
+def get_disease_display(disease_detected):
+    """
+    Convert disease status to display format with appropriate symbols
+    """
+    if is_healthy(disease_detected):
+        return '[HEALTHY] Healthy'
+
+    disease_lower = disease_detected.lower().strip()
+
+    if disease_lower in DISEASE_SYMBOLS:
+        return f'{DISEASE_SYMBOLS[disease_lower]} {disease_detected.title()}'
+
+    for disease_key, symbol in DISEASE_SYMBOLS.items():
+        if disease_key in disease_lower:
+            return f'{symbol} {disease_detected.title()}'
+
+    return f'[WARNING] {disease_detected.title()}'
 
-    doc = SimpleDocTemplate(path, pagesize=A4, 
-                          rightMargin=2*cm, leftMargin=2*cm,
-                          topMargin=2*cm, bottomMargin=2*cm)
-    
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor('#FF6F00'),
-        fontName=UNICODE_FONT,
+
+DETAIL_BATCH_SIZE = 1000
+
+
+def _order_totals():
+    return (
+        select(
+            models.OrderItem.order_id,
+            func.count(models.OrderItem.id).label("item_count"),
+            func.sum(models.OrderItem.quantity).label("quantity"),
+            func.sum(models.OrderItem.quantity * models.OrderItem.price_each).label("revenue"),
+        )
+        .group_by(models.OrderItem.order_id)
+        .subquery()
     )
-    
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=12,
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        textColor=colors.grey,
-        fontName=UNICODE_FONT,
+
+
+def orders_summary(db: Session, filters: schemas.ExportFilter = None):
+    """Per-status order count, revenue, items sold and date range, in one grouped query."""
+    totals = _order_totals()
+    stmt = select(
+        models.Order.status,
+        func.count(models.Order.id).label("orders"),
+        func.coalesce(func.sum(totals.c.revenue), 0).label("revenue"),
+        func.coalesce(func.sum(totals.c.quantity), 0).label("quantity"),
+        func.min(models.Order.date).label("first_date"),
+        func.max(models.Order.date).label("last_date"),
+    ).outerjoin(totals, totals.c.order_id == models.Order.id)
+    stmt = apply_export_filter(stmt, "orders", filters)
+    return db.execute(stmt.group_by(models.Order.status).order_by(func.count(models.Order.id).desc())).all()
+
+
+def stream_order_details(db: Session, filters: schemas.ExportFilter = None):
+    totals = _order_totals()
+    stmt = select(
+        models.Order.id,
+        models.Order.date,
+        models.Order.user_id,
+        models.Order.status,
+        func.coalesce(totals.c.item_count, 0).label("item_count"),
+        func.coalesce(totals.c.revenue, 0).label("revenue"),
+    ).outerjoin(totals, totals.c.order_id == models.Order.id)
+    stmt = apply_export_filter(stmt, "orders", filters).order_by(models.Order.date.desc())
+    return db.execute(stmt, execution_options={"yield_per": DETAIL_BATCH_SIZE})
+
+
+def inspections_summary(db: Session, filters: schemas.ExportFilter = None):
+    """Inspection count, unique hives, disease count, average temperature and date range in one query."""
+    stmt = select(
+        func.count(models.Inspection.id).label("inspections"),
+        func.count(distinct(models.Inspection.hive_id)).label("hives"),
+        func.coalesce(func.sum(case((healthy_condition(), 0), else_=1)), 0).label("diseased"),
+        func.avg(models.Inspection.temperature).label("avg_temperature"),
+        func.min(models.Inspection.date).label("first_date"),
+        func.max(models.Inspection.date).label("last_date"),
     )
-    
-    header_style = ParagraphStyle(
-        'CustomHeader',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceAfter=12,
-        textColor=colors.HexColor('#E65100'),
-        fontName=UNICODE_FONT,
+    return db.execute(apply_export_filter(stmt, "inspections", filters)).one()
+
+
+def stream_inspection_details(db: Session, filters: schemas.ExportFilter = None):
+    stmt = select(
+        models.Inspection.date,
+        models.Inspection.hive_id,
+        models.Inspection.temperature,
+        models.Inspection.disease_detected,
+        models.Inspection.notes,
     )
-    
-    title = Paragraph("BeeTrack Apiary Management System", title_style)
-    elements.append(title)
-    
-    subtitle = Paragraph("Orders Report", subtitle_style)
-    elements.append(subtitle)
-    
-    total_revenue = sum(sum(item.quantity * item.price_each for item in order.items) for order in orders)
-    total_items = sum(sum(item.quantity for item in order.items) for order in orders)
-    
-    report_info = Paragraph(f"""
-        <b>Generated:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>
-        <b>Total Orders:</b> {len(orders)}<br/>
-        <b>Total Revenue:</b> ${total_revenue:.2f}<br/>
-        <b>Total Items Sold:</b> {total_items}<br/>
-        <b>Date Range:</b> {min(o.date for o in orders).strftime('%Y-%m-%d') if orders else 'N/A'} to {max(o.date for o in orders).strftime('%Y-%m-%d') if orders else 'N/A'}
-    """, styles['Normal'])
-    elements.append(report_info)
-    elements.append(Spacer(1, 20))
-    
-    elements.append(HRFlowable(width="100%", thickness=2, lineCap='round', color=colors.HexColor('#FF6F00')))
-    elements.append(Spacer(1, 20))
-    
-    status_summary = {}
+    stmt = apply_export_filter(stmt, "inspections", filters).order_by(models.Inspection.date.desc())
+    return db.execute(stmt, execution_options={"yield_per": DETAIL_BATCH_SIZE})
+
+
+def order_rows(orders):
     for order in orders:
-        status = order.status
-        if status in status_summary:
-            status_summary[status] += 1
-        else:
-            status_summary[status] = 1
-    
-    summary_header = Paragraph("Order Status Summary", header_style)
-    elements.append(summary_header)
-    
-    status_data = [['Status', 'Count', 'Percentage']]
-    
-    for status, count in status_summary.items():
-        percentage = (count / len(orders)) * 100
-        status_data.append([status.title(), str(count), f'{percentage:.1f}%'])
-    
-    status_table = Table(status_data, colWidths=[2*inch, 1*inch, 1.5*inch])
-    status_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#FFF3E0')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#E65100')),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), UNICODE_FONT),  
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E0E0E0')),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')])
-    ]))
-    
-    elements.append(status_table)
-    elements.append(Spacer(1, 30))
-    
-    details_header = Paragraph("Detailed Order Records", header_style)
-    elements.append(details_header)
-    elements.append(Spacer(1, 10))
-    
-    table_data = [['Order ID', 'Date', 'User ID', 'Status', 'Items', 'Total']]
-    
-    for order in sorted(orders, key=lambda x: x.date, reverse=True):
-        order_total = sum(item.quantity * item.price_each for item in order.items)
-        item_count = len(order.items)
-        
-        table_data.append([
+        yield (
             f'#{order.id}',
             order.date.strftime('%Y-%m-%d'),
             f'User {order.user_id}',
             order.status.title(),
-            f'{item_count} items',
-            f'${order_total:.2f}'
-        ])
-    
-    orders_table = Table(table_data, colWidths=[0.8*inch, 1*inch, 1*inch, 1.2*inch, 1*inch, 1*inch])
-    orders_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#FF6F00')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), UNICODE_FONT),  
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E0E0E0')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')]),
-        
-        ('ALIGN', (5, 1), (5, -1), 'RIGHT'),
-    ]))
-    
-    elements.append(orders_table)
-    elements.append(Spacer(1, 20))
-    
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        alignment=TA_CENTER,
-        textColor=colors.grey,
-    )
-    
-    footer = Paragraph(f"""
+            f'{order.item_count} items',
+            f'${order.revenue:.2f}'
+        )
+
+
+def inspection_rows(inspections):
+    from app.services import pdf
+
+    disease_width = pdf.INSPECTIONS_COL_WIDTHS[3]
+    notes_width = pdf.INSPECTIONS_COL_WIDTHS[4]
+    for inspection in inspections:
+        notes_text = (inspection.notes[:50] + '...') if inspection.notes and len(inspection.notes) > 50 else (inspection.notes or 'No notes')
+        disease = inspection.disease_detected
+        yield (
+            inspection.date.strftime('%Y-%m-%d'),
+            f'Hive #{inspection.hive_id}',
+            f'{inspection.temperature}°C' if inspection.temperature else 'N/A',
+            pdf.fit_cell(get_disease_display(disease), disease_width),
+            pdf.fit_cell(notes_text, notes_width),
+            not is_healthy(disease) and not disease.lower().startswith('✅'),
+        )
+
+
+def export_orders_to_pdf(db: Session, path: str = "exports/orders.pdf", progress=None,
+                         filters: schemas.ExportFilter = None, summary_only: bool = False):
+    # ReportLab is only loaded by workers that actually render PDFs.
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Spacer
+    from app.services import pdf
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    by_status = orders_summary(db, filters)
+    total_orders = sum(row.orders for row in by_status)
+    if not total_orders:
+        log_event("Export failed: No orders found for PDF export")
+        return None
+    _report_progress(progress, 0.2)
+
+    total_revenue = sum(row.revenue for row in by_status)
+    total_items = sum(row.quantity for row in by_status)
+    first_date = min(row.first_date for row in by_status)
+    last_date = max(row.last_date for row in by_status)
+
+    status_data = [['Status', 'Count', 'Percentage']]
+    for row in by_status:
+        percentage = (row.orders / total_orders) * 100
+        status_data.append([row.status.title(), str(row.orders), f'{percentage:.1f}%'])
+
+    info = f"""
+        <b>Generated:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>
+        <b>Total Orders:</b> {total_orders}<br/>
+        <b>Total Revenue:</b> ${total_revenue:.2f}<br/>
+        <b>Total Items Sold:</b> {total_items}<br/>
+        <b>Date Range:</b> {first_date.strftime('%Y-%m-%d')} to {last_date.strftime('%Y-%m-%d')}
+    """
+    footer = f"""
         <i>This report was automatically generated by BeeTrack Apiary Management System<br/>
-        Total Revenue: ${total_revenue:.2f} • Total Orders: {len(orders)}</i>
-    """, footer_style)
-    elements.append(Spacer(1, 30))
-    elements.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=colors.lightgrey))
-    elements.append(Spacer(1, 10))
-    elements.append(footer)
-    
-    doc.build(elements)
-    
-    log_event(f"Orders PDF exported successfully: {len(orders)} orders to {path}")
+        Total Revenue: ${total_revenue:.2f} • Total Orders: {total_orders}</i>
+    """
+    _report_progress(progress, 0.5)
+
+    def flowables():
+        theme = pdf.ORDERS_THEME
+        yield from pdf.report_header(theme, "Orders Report", info)
+        yield pdf.section_header(theme, "Order Status Summary")
+        yield pdf.summary_table(theme, status_data, [2*inch, 1*inch, 1.5*inch])
+        yield Spacer(1, 30)
+        if not summary_only:
+            yield pdf.section_header(theme, "Detailed Order Records")
+            yield Spacer(1, 10)
+            yield from pdf.chunked_table(
+                ['Order ID', 'Date', 'User ID', 'Status', 'Items', 'Total'],
+                order_rows(stream_order_details(db, filters)),
+                [0.8*inch, 1*inch, 1*inch, 1.2*inch, 1*inch, 1*inch],
+                pdf.ORDERS_TABLE_STYLE,
+            )
+            yield Spacer(1, 20)
+        yield from pdf.report_footer(footer)
+
+    pdf.build_document(path, flowables())
+
+    log_event(f"Orders PDF exported successfully: {total_orders} orders to {path}")
     return path
 
 
-def export_inspections_to_pdf(db: Session, path: str = "exports/inspections.pdf"):
-    os.makedirs("exports", exist_ok=True)
+def export_inspections_to_pdf(db: Session, path: str = "exports/inspections.pdf", progress=None,
+                              filters: schemas.ExportFilter = None, summary_only: bool = False):
+    # ReportLab is only loaded by workers that actually render PDFs.
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Spacer
+    from app.services import pdf
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
 
-    inspections = db.query(models.Inspection).all()
-    if not inspections:
+    summary = inspections_summary(db, filters)
+    if not summary.inspections:
         log_event("Export failed: No inspections found for PDF export")
         return None
+    _report_progress(progress, 0.2)
+
+    total_inspections = summary.inspections
+    diseases_found = summary.diseased
+    avg_temp = summary.avg_temperature
 
-    doc = SimpleDocTemplate(path, pagesize=A4, 
-                          rightMargin=2*cm, leftMargin=2*cm,
-                          topMargin=2*cm, bottomMargin=2*cm)
-    
-    elements = []
-    
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor('#2E7D32'),
-        fontName='Helvetica-Bold',
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=12,
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        textColor=colors.grey,
-        fontName='Helvetica',
-    )
-    
-    cell_style = ParagraphStyle(
-        'CellText',
-        parent=styles['Normal'],
-        fontSize=9,
-        leading=11,
-        alignment=TA_LEFT,
-        fontName='Helvetica',
-    )
-    
-    header_style = ParagraphStyle(
-        'CustomHeader',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceAfter=12,
-        textColor=colors.HexColor('#1976D2'),
-        fontName='Helvetica-Bold',
-    )
-    
-    title = Paragraph("BeeTrack Apiary Management System", title_style)
-    elements.append(title)
-    
-    subtitle = Paragraph("Inspection Report", subtitle_style)
-    elements.append(subtitle)
-    
-    report_info = Paragraph(f"""
-        <b>Generated:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>
-        <b>Total Inspections:</b> {len(inspections)}<br/>
-        <b>Date Range:</b> {min(i.date for i in inspections).strftime('%Y-%m-%d') if inspections else 'N/A'} to {max(i.date for i in inspections).strftime('%Y-%m-%d') if inspections else 'N/A'}
-    """, styles['Normal'])
-    elements.append(report_info)
-    elements.append(Spacer(1, 20))
-    
-    elements.append(HRFlowable(width="100%", thickness=2, lineCap='round', color=colors.HexColor('#2E7D32')))
-    elements.append(Spacer(1, 20))
-    
-    summary_header = Paragraph("Summary Statistics", header_style)
-    elements.append(summary_header)
-    
-    total_inspections = len(inspections)
-    diseases_found = len([i for i in inspections if i.disease_detected and i.disease_detected != 'none'])
-    avg_temp = sum(i.temperature for i in inspections if i.temperature) / len(inspections) if inspections else 0
-    unique_hives = len(set(i.hive_id for i in inspections))
-    
     summary_data = [
         ['Metric', 'Value'],
         ['Total Inspections', str(total_inspections)],
-        ['Unique Hives Inspected', str(unique_hives)],
+        ['Unique Hives Inspected', str(summary.hives)],
         ['Diseases Detected', str(diseases_found)],
         ['Average Temperature', f'{avg_temp:.1f}°C' if avg_temp else 'N/A'],
-        ['Health Rate', f'{((total_inspections - diseases_found) / total_inspections * 100):.1f}%' if total_inspections else 'N/A']
+        ['Health Rate', f'{((total_inspections - diseases_found) / total_inspections * 100):.1f}%']
     ]
-    
-    summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E3F2FD')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1976D2')),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), UNICODE_FONT),  
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E0E0E0')),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')])
-    ]))
-    
-    elements.append(summary_table)
-    elements.append(Spacer(1, 30))
-    
-    details_header = Paragraph("Detailed Inspection Records", header_style)
-    elements.append(details_header)
-    elements.append(Spacer(1, 10))
-    
-    table_data = [['Date', 'Hive ID', 'Temperature', 'Disease', 'Notes']]
-    
-    def get_disease_display(disease_detected):
-        """
-        Convert disease status to display format with appropriate symbols
-        """
-        if not disease_detected or disease_detected.lower() in ['none', '', 'healthy']:
-            return '[HEALTHY] Healthy'
-        
-        disease_symbols = {
-            'varroa': '[MITE]',
-            'nosema': '[VIRUS]', 
-            'american foulbrood': '[CRITICAL]',
-            'european foulbrood': '[VIRUS]',
-            'chalkbrood': '[FUNGAL]',
-            'sacbrood': '[VIRUS]',
-            'black queen cell virus': '[VIRUS]',
-            'deformed wing virus': '[VIRUS]',
-            'small hive beetle': '[BEETLE]',
-            'wax moth': '[MOTH]'
-        }
-        
-        disease_lower = disease_detected.lower().strip()
-        
-        if disease_lower in disease_symbols:
-            return f'{disease_symbols[disease_lower]} {disease_detected.title()}'
-        
-        for disease_key, symbol in disease_symbols.items():
-            if disease_key in disease_lower:
-                return f'{symbol} {disease_detected.title()}'
-        
-        return f'[WARNING] {disease_detected.title()}'
-    
-    for inspection in sorted(inspections, key=lambda x: x.date, reverse=True):
-        disease_display = get_disease_display(inspection.disease_detected)
-        
-        disease_paragraph = Paragraph(disease_display, cell_style)
-        notes_text = (inspection.notes[:50] + '...') if inspection.notes and len(inspection.notes) > 50 else (inspection.notes or 'No notes')
-        notes_paragraph = Paragraph(notes_text, cell_style)
-            
-        table_data.append([
-            inspection.date.strftime('%Y-%m-%d'),
-            f'Hive #{inspection.hive_id}',
-            f'{inspection.temperature}°C' if inspection.temperature else 'N/A',
-            disease_paragraph,
-            notes_paragraph
-        ])
-    
-    inspections_table = Table(table_data, colWidths=[1.2*inch, 1*inch, 1*inch, 1.8*inch, 2*inch])
-    inspections_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), UNICODE_FONT),  
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E0E0E0')),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')]),
-        
-        ('ALIGN', (3, 1), (3, -1), 'LEFT'),
-        ('ALIGN', (4, 1), (4, -1), 'LEFT'),
-        
-        ('LEFTPADDING', (3, 1), (4, -1), 6),
-        ('RIGHTPADDING', (3, 1), (4, -1), 6),
-        ('TOPPADDING', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-    ]))
-    
-    for i, inspection in enumerate(sorted(inspections, key=lambda x: x.date, reverse=True), 1):
-        disease = inspection.disease_detected
-        is_diseased = (disease and 
-                      disease.lower().strip() not in ['none', '', 'healthy'] and
-                      not disease.lower().startswith('✅'))
-        
-        if is_diseased:
-            inspections_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, i), (-1, i), colors.HexColor('#FFEBEE')),
-            ]))
-    
-    elements.append(inspections_table)
-    elements.append(Spacer(1, 20))
-    
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        alignment=TA_CENTER,
-        textColor=colors.grey,
-    )
-    
-    footer = Paragraph(f"""
+
+    info = f"""
+        <b>Generated:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>
+        <b>Total Inspections:</b> {total_inspections}<br/>
+        <b>Date Range:</b> {summary.first_date.strftime('%Y-%m-%d')} to {summary.last_date.strftime('%Y-%m-%d')}
+    """
+    footer = """
         <i>This report was automatically generated by BeeTrack Apiary Management System<br/>
         For more information, visit your BeeTrack dashboard</i>
-    """, footer_style)
-    elements.append(Spacer(1, 30))
-    elements.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=colors.lightgrey))
-    elements.append(Spacer(1, 10))
-    elements.append(footer)
-    
-    doc.build(elements)
-    
-    log_event(f"Inspections PDF exported successfully: {len(inspections)} inspections to {path}")
+    """
+    _report_progress(progress, 0.5)
+
+    def flowables():
+        theme = pdf.INSPECTIONS_THEME
+        yield from pdf.report_header(theme, "Inspection Report", info)
+        yield pdf.section_header(theme, "Summary Statistics")
+        yield pdf.summary_table(theme, summary_data, [3*inch, 2*inch])
+        yield Spacer(1, 30)
+        if not summary_only:
+            yield pdf.section_header(theme, "Detailed Inspection Records")
+            yield Spacer(1, 10)
+            yield from pdf.chunked_table(
+                ['Date', 'Hive ID', 'Temperature', 'Disease', 'Notes'],
+                inspection_rows(stream_inspection_details(db, filters)),
+                pdf.INSPECTIONS_COL_WIDTHS,
+                pdf.INSPECTIONS_TABLE_STYLE,
+                row_style=lambda row: pdf.DISEASED_ROW_STYLE if row[-1] else None,
+            )
+            yield Spacer(1, 20)
+        yield from pdf.report_footer(footer)
+
+    pdf.build_document(path, flowables())
+
+    log_event(f"Inspections PDF exported successfully: {total_inspections} inspections to {path}")
     return path
@@ -0,0 +1,96 @@
+import hashlib
+import os
+import uuid
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app import models, schemas
+
+CACHE_DIR = os.path.join("exports", "cache")
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Bump when the layout of generated files changes, so stale artifacts are never served.
+EXPORT_CACHE_FORMAT = 1
+
+EXPORT_SOURCES = {
+    "orders_csv": (models.Order, models.OrderItem),
+    "orders_pdf": (models.Order, models.OrderItem),
+    "inspections_pdf": (models.Inspection,),
+    "orders_pdf_summary": (models.Order, models.OrderItem),
+    "inspections_pdf_summary": (models.Inspection,),
+}
+COLUMNAR_SOURCES = {
+    "orders": (models.Order,),
+    "order-items": (models.OrderItem,),
+    "inspections": (models.Inspection,),
+    "logs": (models.Log,),
+}
+for _dataset, _sources in COLUMNAR_SOURCES.items():
+    for _fmt in ("parquet", "arrow"):
+        EXPORT_SOURCES[f"{_dataset}_{_fmt}"] = _sources
+
+
+def data_fingerprint(db: Session, kind: str, filters: Optional[schemas.ExportFilter] = None) -> str:
+    parts = [kind, str(EXPORT_CACHE_FORMAT), filters.model_dump_json() if filters else ""]
+    for model in EXPORT_SOURCES[kind]:
+        columns = [func.count(model.id), func.max(model.id)]
+        if hasattr(model, "updated_at"):
+            columns.append(func.max(model.updated_at))
+        row = db.query(*columns).one()
+        parts.append(f"{model.__tablename__}:" + ":".join(str(value) for value in row))
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+
+def _artifact_path(kind: str, fingerprint: str, ext: str) -> str:
+    return os.path.join(CACHE_DIR, f"{kind}-{fingerprint}.{ext}")
+
+
+def staging_path(kind: str, ext: str) -> str:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, f"{kind}-{uuid.uuid4().hex}.{ext}.tmp")
+
+
+def discard_staging(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def get_artifact(kind: str, fingerprint: str, ext: str) -> Optional[str]:
+    path = _artifact_path(kind, fingerprint, ext)
+    try:
+        # The mtime doubles as the LRU timestamp.
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def store_artifact(kind: str, fingerprint: str, ext: str, generated_path: str) -> str:
+    path = _artifact_path(kind, fingerprint, ext)
+    os.replace(generated_path, path)
+    _evict(keep=path)
+    return path
+
+
+def _evict(keep: str):
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if name.endswith(".tmp") or path == keep:
+            continue
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries) + os.path.getsize(keep)
+    for _, size, path in sorted(entries):
+        if total <= EXPORT_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
@@ -0,0 +1,44 @@
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.utils.pagination import utc_naive
+
+# Id column used for since_id/until_id and the continuation cursor, and the date column for from/to.
+FILTER_COLUMNS = {
+    "orders": (models.Order.id, models.Order.date),
+    "order-items": (models.OrderItem.id, models.Order.date),
+    "inspections": (models.Inspection.id, models.Inspection.date),
+    "logs": (models.Log.id, models.Log.timestamp),
+}
+
+
+def apply_export_filter(query, dataset: str, filters: Optional[schemas.ExportFilter]):
+    if filters is None:
+        return query
+
+    id_column, date_column = FILTER_COLUMNS[dataset]
+    if dataset == "order-items" and (filters.date_from or filters.date_to):
+        query = query.join(models.Order, models.OrderItem.order_id == models.Order.id)
+
+    if filters.date_from:
+        query = query.filter(date_column >= utc_naive(filters.date_from))
+    if filters.date_to:
+        query = query.filter(date_column < utc_naive(filters.date_to))
+    if filters.since_id is not None:
+        query = query.filter(id_column > filters.since_id)
+    if filters.until_id is not None:
+        query = query.filter(id_column <= filters.until_id)
+    return query
+
+
+def pin_cursor(db: Session, dataset: str, filters: Optional[schemas.ExportFilter]) -> schemas.ExportFilter:
+    """
+    Resolve the continuation cursor (highest matching id) before exporting and cap the
+    export at it, so rows inserted while the export runs are left for the next pull.
+    """
+    filters = filters or schemas.ExportFilter()
+    id_column, _ = FILTER_COLUMNS[dataset]
+    stmt = apply_export_filter(select(func.max(id_column)).select_from(id_column.table), dataset, filters)
+    cursor = db.execute(stmt).scalar()
+    return filters.model_copy(update={"until_id": cursor if cursor is not None else filters.since_id or 0})
@@ -0,0 +1,201 @@
+import json
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from typing import Optional
+from app import schemas
+from app.database import read_session
+from app.services import export
+from app.services.export_filters import pin_cursor
+from app.utils.logger import log_event
+
+JOBS_DIR = os.path.join("exports", "jobs")
+EXPORT_JOB_WORKERS = int(os.getenv("EXPORT_JOB_WORKERS", "2"))
+EXPORT_JOB_TTL_SECONDS = int(os.getenv("EXPORT_JOB_TTL_SECONDS", str(60 * 60)))
+# Jobs that never finished (e.g. the API was restarted mid-export) are dropped after this.
+EXPORT_JOB_ORPHAN_SECONDS = 24 * 60 * 60
+
+EXPORT_KINDS = {
+    "orders_csv": (export.export_orders_to_csv, "csv", "text/csv", "orders"),
+    "orders_pdf": (export.export_orders_to_pdf, "pdf", "application/pdf", "orders"),
+    "inspections_pdf": (export.export_inspections_to_pdf, "pdf", "application/pdf", "inspections"),
+}
+
+SUMMARY_KINDS = ("orders_pdf", "inspections_pdf")
+
+FINISHED_STATUSES = ("completed", "failed")
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    # "spawn" keeps the parent's pooled DB connections and scheduler threads out of the workers.
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=EXPORT_JOB_WORKERS, mp_context=get_context("spawn"))
+    return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor):
+    # A worker that died (e.g. killed for memory on a large PDF) leaves the whole pool unusable.
+    global _executor
+    if _executor is executor:
+        _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _state_path(job_id: str) -> str:
+    return os.path.join(JOBS_DIR, f"{job_id}.json")
+
+
+def artifact_path(job_id: str, kind: str) -> str:
+    _, ext, _, _ = EXPORT_KINDS[kind]
+    return os.path.join(JOBS_DIR, f"{job_id}.{ext}")
+
+
+def _write_state(state: dict):
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    path = _state_path(state["id"])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    try:
+        uuid.UUID(hex=job_id)
+    except ValueError:
+        return None
+    try:
+        with open(_state_path(job_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _update_job(job_id: str, **changes):
+    state = get_job(job_id)
+    if state is None:
+        return
+    state.update(changes)
+    _write_state(state)
+
+
+def _run_job(job_id: str, kind: str, filters: dict, summary_only: bool = False):
+    # Runs inside a pool worker process, with its own engine and session.
+    func, _, _, dataset = EXPORT_KINDS[kind]
+    _update_job(job_id, status="running", progress=0.0)
+    db = read_session()
+    try:
+        pinned = pin_cursor(db, dataset, schemas.ExportFilter(**filters))
+        _update_job(job_id, cursor=pinned.until_id)
+        path = func(
+            db,
+            path=artifact_path(job_id, kind),
+            progress=lambda value: _update_job(job_id, progress=value),
+            filters=pinned,
+            **({"summary_only": True} if summary_only else {}),
+        )
+        if not path:
+            _update_job(job_id, status="failed", error="No data to export", finished_at=_now())
+        else:
+            _update_job(job_id, status="completed", progress=1.0, finished_at=_now())
+    except Exception as e:
+        _update_job(job_id, status="failed", error=str(e), finished_at=_now())
+        log_event(f"Export job {job_id} ({kind}) failed - {str(e)}")
+    finally:
+        db.close()
+
+
+def _on_job_done(job_id: str, future):
+    # Covers worker crashes, where _run_job never got the chance to record the failure.
+    error = future.exception()
+    if error is not None:
+        state = get_job(job_id)
+        if state and state["status"] not in FINISHED_STATUSES:
+            _update_job(job_id, status="failed", error=str(error) or type(error).__name__, finished_at=_now())
+
+
+def submit_job(kind: str, created_by: str, filters: Optional[schemas.ExportFilter] = None,
+               summary_only: bool = False) -> dict:
+    job_id = uuid.uuid4().hex
+    state = {
+        "id": job_id,
+        "kind": kind,
+        "status": "queued",
+        "progress": 0.0,
+        "created_by": created_by,
+        "created_at": _now(),
+        "finished_at": None,
+        "error": None,
+        "cursor": None,
+    }
+    _write_state(state)
+    filters = filters.model_dump() if filters else {}
+    future, error = None, None
+    # A pool left broken by a dead worker is replaced once; the retry runs on the fresh pool.
+    for _ in range(2):
+        executor = _get_executor()
+        try:
+            future = executor.submit(_run_job, job_id, kind, filters, summary_only)
+            break
+        except BrokenProcessPool as e:
+            log_event(f"Export job pool is broken, starting a new one - {str(e)}")
+            _discard_executor(executor)
+            error = e
+    if future is None:
+        state.update(status="failed", error=f"Could not start the export: {str(error) or type(error).__name__}",
+                     finished_at=_now())
+        _write_state(state)
+        return state
+    future.add_done_callback(lambda f: _on_job_done(job_id, f))
+    return state
+
+
+def cleanup_expired_jobs() -> int:
+    if not os.path.isdir(JOBS_DIR):
+        return 0
+
+    now = datetime.now(timezone.utc)
+    removed = 0
+    for name in os.listdir(JOBS_DIR):
+        if not name.endswith(".json"):
+            continue
+        state = get_job(name[:-len(".json")])
+        if state is None:
+            continue
+
+        if state["status"] in FINISHED_STATUSES:
+            age = (now - datetime.fromisoformat(state["finished_at"])).total_seconds()
+            expired = age > EXPORT_JOB_TTL_SECONDS
+        else:
+            age = (now - datetime.fromisoformat(state["created_at"])).total_seconds()
+            expired = age > EXPORT_JOB_ORPHAN_SECONDS
+        if not expired:
+            continue
+
+        for path in (artifact_path(state["id"], state["kind"]), _state_path(state["id"])):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        removed += 1
+
+    if removed:
+        log_event(f"Export jobs cleanup: removed {removed} expired jobs")
+    return removed
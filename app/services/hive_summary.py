@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.orm import Session
+from app import models
+from app.database import SessionLocal
+from app.services import versioning
+from app.utils.logger import log_event
+
+RECENT_DISEASE_DAYS = 30
+
+Hive = models.Hive
+Inspection = models.Inspection
+
+
+def is_healthy(disease_detected) -> bool:
+    return not disease_detected or disease_detected.lower().strip() in ['none', '', 'healthy']
+
+
+def healthy_condition():
+    """SQL counterpart of is_healthy() for Inspection.disease_detected."""
+    disease = Inspection.disease_detected
+    return or_(disease.is_(None), func.lower(func.trim(disease)).in_(['none', '', 'healthy']))
+
+
+def _recent_cutoff() -> datetime:
+    # Stored timestamps are naive UTC.
+    return (datetime.now(timezone.utc) - timedelta(days=RECENT_DISEASE_DAYS)).replace(tzinfo=None)
+
+
+def apply_new_inspection(hive: models.Hive, inspection: models.Inspection):
+    """
+    Fold one new inspection into the hive's summary columns without querying its history. The columns
+    are assigned SQL expressions, so the flush issues one UPDATE computed from the row's current values
+    and concurrent inspections of a hive cannot overwrite each other's increments.
+    """
+    newer = or_(Hive.last_inspection_date.is_(None), Hive.last_inspection_date <= inspection.date)
+    hive.inspection_count = func.coalesce(Hive.inspection_count, 0) + 1
+    hive.last_inspection_date = case((newer, inspection.date), else_=Hive.last_inspection_date)
+    hive.latest_temperature = case((newer, inspection.temperature), else_=Hive.latest_temperature)
+    hive.latest_disease = case((newer, inspection.disease_detected), else_=Hive.latest_disease)
+    if not is_healthy(inspection.disease_detected) and inspection.date >= _recent_cutoff():
+        hive.recent_disease_count = func.coalesce(Hive.recent_disease_count, 0) + 1
+
+
+def refresh_summaries(db: Session, hive_ids: Optional[Iterable[int]] = None):
+    """Recompute the summary columns of the given hives (all hives if None) in one UPDATE."""
+    def latest(column):
+        return (
+            select(column)
+            .where(Inspection.hive_id == Hive.id)
+            .order_by(Inspection.date.desc(), Inspection.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    stmt = update(Hive).values(
+        inspection_count=select(func.count(Inspection.id)).where(Inspection.hive_id == Hive.id).scalar_subquery(),
+        # Seeded or imported hives may carry a date without any inspection rows.
+        last_inspection_date=func.coalesce(
+            select(func.max(Inspection.date)).where(Inspection.hive_id == Hive.id).scalar_subquery(),
+            Hive.last_inspection_date,
+        ),
+        latest_temperature=latest(Inspection.temperature),
+        latest_disease=latest(Inspection.disease_detected),
+        recent_disease_count=select(func.count(Inspection.id)).where(
+            Inspection.hive_id == Hive.id,
+            Inspection.date >= _recent_cutoff(),
+            ~healthy_condition(),
+        ).scalar_subquery(),
+    )
+    if hive_ids is not None:
+        stmt = stmt.where(Hive.id.in_(list(hive_ids)))
+    return db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+
+
+def repair_job():
+    # Also ages inspections out of the 30-day disease count, which writes alone cannot do.
+    db = SessionLocal()
+    try:
+        updated = refresh_summaries(db)
+        versioning.bump_version(db, "hives")
+        db.commit()
+        log_event(f"Scheduler: Recomputed summaries for {updated} hives")
+        return updated
+    except Exception as e:
+        db.rollback()
+        log_event(f"Scheduler: Hive summary repair failed - {str(e)}")
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,257 @@
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm, inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import SimpleDocTemplate, Spacer, Table, TableStyle, Paragraph
+from reportlab.platypus.flowables import HRFlowable
+
+UNICODE_FONT = "Helvetica"
+CELL_FONT_SIZE = 9
+# Detail tables are emitted as independent Tables of this many rows, so layout work per table is bounded.
+ROWS_PER_CHUNK = 500
+# How many flowables the document may look ahead for keep-with-next handling.
+LOOKAHEAD = 4
+
+STYLES = getSampleStyleSheet()
+
+CELL_STYLE = ParagraphStyle(
+    "CellText",
+    parent=STYLES["Normal"],
+    fontSize=CELL_FONT_SIZE,
+    leading=11,
+    alignment=TA_LEFT,
+    fontName=UNICODE_FONT,
+)
+
+SUBTITLE_STYLE = ParagraphStyle(
+    "CustomSubtitle",
+    parent=STYLES["Normal"],
+    fontSize=12,
+    spaceAfter=20,
+    alignment=TA_CENTER,
+    textColor=colors.grey,
+    fontName=UNICODE_FONT,
+)
+
+FOOTER_STYLE = ParagraphStyle(
+    "Footer",
+    parent=STYLES["Normal"],
+    fontSize=8,
+    alignment=TA_CENTER,
+    textColor=colors.grey,
+)
+
+ROW_BACKGROUNDS = [colors.white, colors.HexColor("#F8F9FA")]
+GRID_COLOR = colors.HexColor("#E0E0E0")
+
+
+class Theme(NamedTuple):
+    title_style: ParagraphStyle
+    header_style: ParagraphStyle
+    primary: colors.Color
+    summary_background: colors.Color
+    summary_text: colors.Color
+
+
+def _theme(name: str, primary: str, heading: str, summary_background: str, title_font: str) -> Theme:
+    return Theme(
+        title_style=ParagraphStyle(
+            f"{name}Title",
+            parent=STYLES["Heading1"],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor(primary),
+            fontName=title_font,
+        ),
+        header_style=ParagraphStyle(
+            f"{name}Header",
+            parent=STYLES["Heading2"],
+            fontSize=16,
+            spaceAfter=12,
+            textColor=colors.HexColor(heading),
+            fontName=title_font,
+        ),
+        primary=colors.HexColor(primary),
+        summary_background=colors.HexColor(summary_background),
+        summary_text=colors.HexColor(heading),
+    )
+
+
+ORDERS_THEME = _theme("Orders", "#FF6F00", "#E65100", "#FFF3E0", UNICODE_FONT)
+INSPECTIONS_THEME = _theme("Inspections", "#2E7D32", "#1976D2", "#E3F2FD", "Helvetica-Bold")
+
+ORDERS_TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#FF6F00')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, -1), UNICODE_FONT),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 0.5, GRID_COLOR),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), ROW_BACKGROUNDS),
+
+    ('ALIGN', (5, 1), (5, -1), 'RIGHT'),
+]
+
+INSPECTIONS_TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, -1), UNICODE_FONT),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 0.5, GRID_COLOR),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), ROW_BACKGROUNDS),
+
+    ('ALIGN', (3, 1), (3, -1), 'LEFT'),
+    ('ALIGN', (4, 1), (4, -1), 'LEFT'),
+
+    ('LEFTPADDING', (3, 1), (4, -1), 6),
+    ('RIGHTPADDING', (3, 1), (4, -1), 6),
+    ('TOPPADDING', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+]
+
+INSPECTIONS_COL_WIDTHS = [1.2*inch, 1*inch, 1*inch, 1.8*inch, 2*inch]
+
+DISEASED_ROW_STYLE = ('BACKGROUND', colors.HexColor('#FFEBEE'))
+
+
+class FlowableStream(list):
+    """
+    List that pulls flowables from an iterator on demand. ReportLab's build loop only
+    looks at the head of the list, so the full document never has to exist at once.
+    """
+
+    def __init__(self, flowables: Iterable):
+        super().__init__()
+        self._source = iter(flowables)
+        self._fill(LOOKAHEAD)
+
+    def _fill(self, count: int):
+        while self._source is not None and list.__len__(self) < count:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill(LOOKAHEAD)
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(LOOKAHEAD if index.stop is None else max(index.stop, LOOKAHEAD))
+        elif index >= 0:
+            self._fill(index + 1)
+        return list.__getitem__(self, index)
+
+
+def report_header(theme: Theme, subtitle: str, info_html: str) -> List:
+    return [
+        Paragraph("BeeTrack Apiary Management System", theme.title_style),
+        Paragraph(subtitle, SUBTITLE_STYLE),
+        Paragraph(info_html, STYLES["Normal"]),
+        Spacer(1, 20),
+        HRFlowable(width="100%", thickness=2, lineCap="round", color=theme.primary),
+        Spacer(1, 20),
+    ]
+
+
+def section_header(theme: Theme, text: str) -> Paragraph:
+    return Paragraph(text, theme.header_style)
+
+
+def summary_table(theme: Theme, data: List[List[str]], col_widths: List[float]) -> Table:
+    table = Table(data, colWidths=col_widths)
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), theme.summary_background),
+        ("TEXTCOLOR", (0, 0), (-1, 0), theme.summary_text),
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+        ("FONTNAME", (0, 0), (-1, -1), UNICODE_FONT),
+        ("FONTSIZE", (0, 0), (-1, 0), 12),
+        ("FONTSIZE", (0, 1), (-1, -1), 10),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+        ("BACKGROUND", (0, 1), (-1, -1), colors.white),
+        ("GRID", (0, 0), (-1, -1), 1, GRID_COLOR),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), ROW_BACKGROUNDS),
+    ]))
+    return table
+
+
+def report_footer(text_html: str) -> List:
+    return [
+        Spacer(1, 30),
+        HRFlowable(width="100%", thickness=1, lineCap="round", color=colors.lightgrey),
+        Spacer(1, 10),
+        Paragraph(text_html, FOOTER_STYLE),
+    ]
+
+
+def fit_cell(text: str, width: float, padding: float = 12):
+    """Plain string when the text fits on one line, otherwise a wrapping Paragraph."""
+    if stringWidth(text, UNICODE_FONT, CELL_FONT_SIZE) <= width - padding:
+        return text
+    return Paragraph(text, CELL_STYLE)
+
+
+def chunked_table(
+    header: List[str],
+    rows: Iterable[tuple],
+    col_widths: List[float],
+    base_style: List[tuple],
+    row_style: Optional[Callable[[tuple], Optional[tuple]]] = None,
+    chunk_size: int = ROWS_PER_CHUNK,
+) -> Iterator[Table]:
+    """
+    Yield the detail table as Tables of at most chunk_size rows, each repeating the header.
+    row_style may return a (command, *args) tuple that is applied across that row; it is
+    evaluated in the same pass that builds the table data. Values past the header width
+    are passed to row_style but not rendered.
+    """
+    width = len(header)
+    data = [header]
+    extra_styles = []
+
+    def flush():
+        table = Table(data, colWidths=col_widths, repeatRows=1)
+        table.setStyle(TableStyle(base_style + extra_styles))
+        return table
+
+    for row in rows:
+        if row_style:
+            command = row_style(row)
+            if command:
+                index = len(data)
+                extra_styles.append((command[0], (0, index), (-1, index)) + command[1:])
+        data.append(list(row[:width]))
+        if len(data) > chunk_size:
+            yield flush()
+            data = [header]
+            extra_styles = []
+
+    if len(data) > 1:
+        yield flush()
+
+
+def build_document(path: str, flowables: Iterable) -> None:
+    doc = SimpleDocTemplate(
+        path, pagesize=A4,
+        rightMargin=2 * cm, leftMargin=2 * cm,
+        topMargin=2 * cm, bottomMargin=2 * cm,
+        pageCompression=1,
+    )
+    doc.build(FlowableStream(flowables))
@@ -1,12 +1,33 @@
 import os
+import signal
+import socket
+import time
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
-from datetime import datetime, timezone
+from apscheduler.triggers.interval import IntervalTrigger
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, insert, text, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.database import SessionLocal, engine
 from app import models
+from app.utils import metrics
 from app.utils.logger import log_event
-import pandas as pd
+from app.services.export_jobs import cleanup_expired_jobs
+from app.services.telemetry import prune_job, rollup_job
+from app.services import hive_summary
+
+# "embedded" runs the scheduler inside every API worker, and the elected leader executes the jobs;
+# "off" leaves them to a dedicated process started with `python -m app.services.scheduler`.
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "embedded").lower()
+# A leader that stops renewing its lease (e.g. it crashed) is replaced after this long.
+SCHEDULER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "30"))
+JOB_RUN_RETENTION_DAYS = int(os.getenv("JOB_RUN_RETENTION_DAYS", "30"))
+
+LEASE_NAME = "scheduler"
+# Arbitrary application-wide key for pg_try_advisory_lock.
+ADVISORY_LOCK_KEY = 0x42656554
 
 
 def archive_logs():
@@ -15,12 +36,14 @@ def archive_logs():
         logs = db.query(models.Log).all()
         if not logs:
             log_event("Scheduler: No logs to archive")
-            return
+            return 0
 
         os.makedirs("logs", exist_ok=True)
         today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         path = f"logs/logs_{today}.csv"
 
+        import pandas as pd
+
         data = [{"timestamp": log.timestamp, "event": log.event} for log in logs]
         df = pd.DataFrame(data)
         df.to_csv(path, index=False)
@@ -29,14 +52,178 @@ def archive_logs():
         db.add(log_entry)
         db.commit()
         log_event(f"Scheduler: Archived {len(logs)} logs to {path}")
+        return len(logs)
     except Exception as e:
         log_event(f"Scheduler: Log archiving failed - {str(e)}")
+        raise
     finally:
         db.close()
 
 
+def prune_job_runs():
+    cutoff = datetime.now(timezone.utc) - timedelta(days=JOB_RUN_RETENTION_DAYS)
+    with engine.begin() as conn:
+        return conn.execute(delete(models.JobRun).where(models.JobRun.started_at < cutoff)).rowcount
+
+
+class LeaderElection:
+    """
+    Decides which process runs the jobs. PostgreSQL uses a session-level advisory lock held on a
+    dedicated connection; other databases use a lease row the leader renews on every heartbeat.
+    """
+
+    def __init__(self):
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+        self._conn = None
+
+    def heartbeat(self):
+        try:
+            leader = self._advisory_lock() if engine.dialect.name == "postgresql" else self._renew_lease()
+        except Exception as e:
+            log_event(f"Scheduler: Leader election failed on {self.holder} - {str(e)}")
+            leader = False
+        self._set_leader(leader)
+
+    def _advisory_lock(self) -> bool:
+        if self._conn is not None:
+            try:
+                self._conn.execute(text("SELECT 1"))
+                return True
+            except Exception:
+                # The lock went away with the connection.
+                self._close()
+        # Autocommit, so the held connection never sits idle in a transaction.
+        conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        if conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}).scalar():
+            self._conn = conn
+            return True
+        conn.close()
+        return False
+
+    def _renew_lease(self) -> bool:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        expires_at = now + timedelta(seconds=SCHEDULER_LEASE_SECONDS)
+        lease = models.SchedulerLease
+        with engine.begin() as conn:
+            renewed = conn.execute(
+                update(lease)
+                .where(lease.name == LEASE_NAME, (lease.holder == self.holder) | (lease.expires_at < now))
+                .values(holder=self.holder, expires_at=expires_at)
+            ).rowcount
+        if renewed:
+            return True
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(lease).values(name=LEASE_NAME, holder=self.holder, expires_at=expires_at))
+            return True
+        except IntegrityError:
+            return False
+
+    def _set_leader(self, leader: bool):
+        if leader != self.is_leader:
+            self.is_leader = leader
+            metrics.add_gauge("beetrack_scheduler_leader", (), 1 if leader else -1)
+            log_event(f"Scheduler: {self.holder} {'became' if leader else 'is no longer'} the leader")
+
+    def _close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def release(self):
+        if self.is_leader and engine.dialect.name != "postgresql":
+            # Let a standby take over right away instead of waiting for the lease to expire.
+            try:
+                with engine.begin() as conn:
+                    conn.execute(delete(models.SchedulerLease).where(
+                        models.SchedulerLease.name == LEASE_NAME, models.SchedulerLease.holder == self.holder
+                    ))
+            except Exception as e:
+                log_event(f"Scheduler: Could not release the lease of {self.holder} - {str(e)}")
+        self._close()
+        self._set_leader(False)
+
+
+_election = LeaderElection()
+_scheduler = None
+
+
+def run_job(name: str, func):
+    """Run a job on the leader only and record the run in job_runs."""
+    if not _election.is_leader:
+        return
+    started_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    status, rows, error = "completed", None, None
+    try:
+        result = func()
+        rows = result if isinstance(result, int) else None
+    except Exception as e:
+        status, error = "failed", str(e)
+    duration_ms = (time.perf_counter() - started) * 1000
+    metrics.inc("beetrack_scheduler_job_runs_total", (("job", name), ("status", status)))
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert(models.JobRun).values(
+                job=name, holder=_election.holder, started_at=started_at, duration_ms=duration_ms,
+                status=status, rows=rows, error=error,
+            ))
+    except Exception as e:
+        log_event(f"Scheduler: Could not record run of {name} - {str(e)}")
+
+
+JOBS = [
+    ("archive_logs", archive_logs, CronTrigger(day="*/7", hour=0, minute=0)),
+    ("cleanup_expired_jobs", cleanup_expired_jobs, IntervalTrigger(minutes=15)),
+    ("telemetry_rollup", rollup_job, IntervalTrigger(minutes=1)),
+    ("telemetry_prune", prune_job, CronTrigger(hour=3, minute=30)),
+    ("hive_summary_repair", hive_summary.repair_job, CronTrigger(hour=2, minute=0)),
+    ("prune_job_runs", prune_job_runs, CronTrigger(hour=4, minute=0)),
+]
+
+
+def _configure(scheduler):
+    scheduler.add_job(_election.heartbeat, IntervalTrigger(seconds=max(1, SCHEDULER_LEASE_SECONDS // 3)),
+                      next_run_time=datetime.now(timezone.utc), max_instances=1, coalesce=True)
+    for name, func, trigger in JOBS:
+        scheduler.add_job(run_job, trigger, args=(name, func), id=name, max_instances=1, coalesce=True)
+    return scheduler
+
+
 def start_scheduler():
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(archive_logs, CronTrigger(day="*/7", hour=0, minute=0))
-    scheduler.start()
-    log_event("Scheduler started: log archiving job scheduled for every 7 days")
+    global _scheduler
+    if SCHEDULER_MODE != "embedded":
+        return
+    _scheduler = _configure(BackgroundScheduler())
+    _scheduler.start()
+    log_event("Scheduler started: log archiving job scheduled for every 7 days, export job cleanup every 15 minutes, "
+              "telemetry rollups every minute, hive summary repair daily; jobs run on the elected leader")
+
+
+def stop_scheduler():
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.shutdown(wait=False)
+        _scheduler = None
+    _election.release()
+
+
+def run_worker():
+    """Dedicated scheduler process; several may run, only the leader executes jobs."""
+    scheduler = _configure(BlockingScheduler())
+    signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.shutdown(wait=False))
+    log_event(f"Scheduler worker {_election.holder} started")
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        _election.release()
+
+
+if __name__ == "__main__":
+    run_worker()
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import inspect
+from sqlalchemy import inspect, text
 from app import models
 from app.utils.hashing import Hasher
 from app.utils.logger import log_event
@@ -7,17 +7,82 @@ from datetime import datetime
 import json
 import os
 from app.database import Base, engine
+from app.services.hive_summary import refresh_summaries
 
-def ensure_tables_exist():
+# Columns added to tables that already existed; create_all only creates missing tables.
+# (table, column, DEFAULT for the existing rows). Each is added once, when the column is missing.
+ADDED_COLUMNS = [
+    ("users", "created_at", None),
+    ("users", "is_active", "true"),
+    ("hives", "inspection_count", "0"),
+    ("hives", "latest_temperature", None),
+    ("hives", "latest_disease", None),
+    ("hives", "recent_disease_count", "0"),
+    ("inspections", "updated_at", None),
+    ("orders", "updated_at", None),
+    ("products", "version", "1"),
+    ("telemetry_readings", "rolled_up", "false"),
+]
+
+
+def _add_missing_columns(bind) -> set:
+    inspector = inspect(bind)
+    added = set()
+    with bind.begin() as conn:
+        for table, name, default in ADDED_COLUMNS:
+            if not inspector.has_table(table):
+                continue
+            if name in {column["name"] for column in inspector.get_columns(table)}:
+                continue
+            column = Base.metadata.tables[table].c[name]
+            ddl = f"ALTER TABLE {table} ADD COLUMN {name} {column.type.compile(dialect=bind.dialect)}"
+            if default is not None:
+                ddl += f"{'' if column.nullable else ' NOT NULL'} DEFAULT {default}"
+            conn.execute(text(ddl))
+            added.add(f"{table}.{name}")
+
+        for table in ("inspections", "orders"):
+            if f"{table}.updated_at" in added:
+                conn.execute(text(f"UPDATE {table} SET updated_at = date"))
+        if "telemetry_readings.rolled_up" in added and inspector.has_table("telemetry_rollup_state"):
+            # Readings at or below the old high-water mark were already rolled up.
+            conn.execute(text(
+                "UPDATE telemetry_readings SET rolled_up = true "
+                "WHERE id <= (SELECT COALESCE(MAX(last_reading_id), 0) FROM telemetry_rollup_state)"
+            ))
+    if any(name.startswith("hives.") for name in added):
+        with Session(bind) as db:
+            refresh_summaries(db)
+            db.commit()
+
+    # Indexes added to existing columns.
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+    return added
+
+
+def ensure_tables_exist(bind=None):
+    bind = bind or engine
     try:
-        inspector = inspect(engine)
+        inspector = inspect(bind)
         existing_tables = inspector.get_table_names()
         
         if "users" not in existing_tables:
             print("⚠️ Tables don't exist. Creating tables directly with SQLAlchemy...")
             log_event("Creating tables with SQLAlchemy (alembic migrations may have failed)")
-            Base.metadata.create_all(bind=engine)
+            Base.metadata.create_all(bind=bind)
             return True
+
+        # Tables added after the database was first created.
+        missing = [name for name in Base.metadata.tables if name not in existing_tables]
+        if missing:
+            log_event(f"Creating missing tables: {', '.join(missing)}")
+            Base.metadata.create_all(bind=bind, tables=[Base.metadata.tables[name] for name in missing])
+        added = _add_missing_columns(bind)
+        if added:
+            log_event(f"Added missing columns: {', '.join(sorted(added))}")
         return False
     except Exception as e:
         print(f"❌ Error checking/creating tables: {e}")
@@ -32,6 +97,8 @@ def run_seed(db: Session):
             print("⚠️ Table 'users' does not exist – seed skipped.")
             log_event("Seed skipped: users table does not exist")
             return
+    else:
+        ensure_tables_exist()
 
     if db.query(models.User).first():
         print("ℹ️ Seeding skipped – users already exist.")
@@ -109,5 +176,8 @@ def run_seed(db: Session):
     db.commit()
     log_event(f"Seeded {orders_count} orders")
 
+    refresh_summaries(db)
+    db.commit()
+
     print("✅ Data seeding completed.")
     log_event("Data seeding completed successfully")
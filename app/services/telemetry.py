@@ -0,0 +1,198 @@
+import os
+import time
+from datetime import datetime, timezone
+from typing import List
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.database import SessionLocal
+from app.utils.logger import log_event
+
+MINUTE, HOUR, DAY = 60, 60 * 60, 24 * 60 * 60
+RESOLUTIONS = {"1m": MINUTE, "1h": HOUR, "1d": DAY}
+# Every level is merged straight from the raw readings; count, sum, min and max add up across batches.
+ROLLUP_RESOLUTIONS = (MINUTE, HOUR, DAY)
+
+# Automatic resolution picks the finest level that returns at most this many points.
+TELEMETRY_MAX_POINTS = int(os.getenv("TELEMETRY_MAX_POINTS", "500"))
+TELEMETRY_RAW_RETENTION_DAYS = int(os.getenv("TELEMETRY_RAW_RETENTION_DAYS", "30"))
+TELEMETRY_MINUTE_RETENTION_DAYS = int(os.getenv("TELEMETRY_MINUTE_RETENTION_DAYS", "90"))
+INSERT_CHUNK_SIZE = 1000
+ROLLUP_BATCH_SIZE = 50_000
+
+Reading = models.TelemetryReading
+Rollup = models.TelemetryRollup
+
+
+def to_epoch(value: datetime) -> int:
+    # Naive datetimes are taken as UTC, like every stored timestamp.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def from_epoch(value: int) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def ingest_readings(db: Session, readings: List[schemas.TelemetryReadingCreate]):
+    rows = [
+        {"hive_id": r.hive_id, "metric": r.metric, "ts": to_epoch(r.ts), "value": r.value}
+        for r in readings
+    ]
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.execute(insert(Reading), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def _merge(db: Session, aggregates: dict):
+    """Add (count, total, min, max) per rollup key to the stored buckets, creating missing ones."""
+    keys = list(aggregates)
+    key_columns = (Rollup.hive_id, Rollup.metric, Rollup.resolution, Rollup.bucket)
+    existing = {}
+    for start in range(0, len(keys), INSERT_CHUNK_SIZE):
+        rows = db.execute(
+            select(*key_columns, Rollup.count, Rollup.total, Rollup.min, Rollup.max)
+            .where(tuple_(*key_columns).in_(keys[start:start + INSERT_CHUNK_SIZE]))
+        )
+        for hive_id, metric, resolution, bucket, *stored in rows:
+            existing[(hive_id, metric, resolution, bucket)] = stored
+
+    inserts, updates = [], []
+    for key, (count, total, low, high) in aggregates.items():
+        row = dict(zip(("hive_id", "metric", "resolution", "bucket"), key))
+        stored = existing.get(key)
+        if stored is None:
+            inserts.append({**row, "count": count, "total": total, "min": low, "max": high})
+        else:
+            stored_count, stored_total, stored_min, stored_max = stored
+            updates.append({**row, "count": stored_count + count, "total": stored_total + total,
+                            "min": min(stored_min, low), "max": max(stored_max, high)})
+    if updates:
+        db.execute(update(Rollup), updates)
+    for start in range(0, len(inserts), INSERT_CHUNK_SIZE):
+        db.execute(insert(Rollup), inserts[start:start + INSERT_CHUNK_SIZE])
+
+
+def run_rollups(db: Session) -> int:
+    """
+    Merge readings not yet rolled up into the 1m, 1h and 1d buckets they fall into and mark them, in one
+    transaction per batch. Buckets are only ever added to, never rebuilt, so late samples whose
+    neighbours were already pruned do not erase the existing aggregates.
+    """
+    merged = 0
+    while True:
+        readings = db.execute(
+            select(Reading.id, Reading.hive_id, Reading.metric, Reading.ts, Reading.value)
+            .where(Reading.rolled_up.is_(False))
+            .order_by(Reading.id)
+            .limit(ROLLUP_BATCH_SIZE)
+        ).all()
+        if not readings:
+            db.commit()
+            return merged
+
+        # 1m buckets past their retention would only be pruned again.
+        minute_cutoff = int(time.time()) - TELEMETRY_MINUTE_RETENTION_DAYS * DAY
+        aggregates = {}
+        for _, hive_id, metric, ts, value in readings:
+            for resolution in ROLLUP_RESOLUTIONS:
+                bucket = ts - ts % resolution
+                if resolution == MINUTE and bucket < minute_cutoff:
+                    continue
+                key = (hive_id, metric, resolution, bucket)
+                current = aggregates.get(key)
+                if current is None:
+                    aggregates[key] = (1, value, value, value)
+                else:
+                    count, total, low, high = current
+                    aggregates[key] = (count + 1, total + value, min(low, value), max(high, value))
+        _merge(db, aggregates)
+
+        ids = [row.id for row in readings]
+        for start in range(0, len(ids), INSERT_CHUNK_SIZE):
+            db.execute(
+                update(Reading).where(Reading.id.in_(ids[start:start + INSERT_CHUNK_SIZE])).values(rolled_up=True)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        merged += len(readings)
+
+
+def prune(db: Session) -> int:
+    now = int(time.time())
+    # Raw readings are only dropped once they have been rolled up.
+    removed = db.execute(
+        delete(Reading)
+        .where(Reading.ts < now - TELEMETRY_RAW_RETENTION_DAYS * DAY)
+        .where(Reading.rolled_up.is_(True))
+    ).rowcount
+    removed += db.execute(
+        delete(Rollup)
+        .where(Rollup.resolution == MINUTE)
+        .where(Rollup.bucket < now - TELEMETRY_MINUTE_RETENTION_DAYS * DAY)
+    ).rowcount
+    db.commit()
+    return removed
+
+
+def pick_resolution(start: int, end: int, requested: str = "auto") -> str:
+    if requested != "auto":
+        return requested
+    now = int(time.time())
+    retention = {"raw": TELEMETRY_RAW_RETENTION_DAYS * DAY, "1m": TELEMETRY_MINUTE_RETENTION_DAYS * DAY}
+    for name, width in RESOLUTIONS.items():
+        if name in retention and start < now - retention[name]:
+            continue
+        if (end - start) / width <= TELEMETRY_MAX_POINTS:
+            return name
+    return "1d"
+
+
+def query_series(db: Session, hive_id: int, metric: str, start: int, end: int, resolution: str) -> list:
+    if resolution == "raw":
+        rows = db.execute(
+            select(Reading.ts, Reading.value)
+            .where(Reading.hive_id == hive_id, Reading.metric == metric)
+            .where(Reading.ts >= start, Reading.ts < end)
+            .order_by(Reading.ts)
+        )
+        return [schemas.TelemetryPoint(ts=from_epoch(ts), avg=v, min=v, max=v, count=1) for ts, v in rows]
+
+    rows = db.execute(
+        select(Rollup.bucket, Rollup.count, Rollup.total, Rollup.min, Rollup.max)
+        .where(Rollup.hive_id == hive_id, Rollup.metric == metric)
+        .where(Rollup.resolution == RESOLUTIONS[resolution])
+        .where(Rollup.bucket >= start - start % RESOLUTIONS[resolution], Rollup.bucket < end)
+        .order_by(Rollup.bucket)
+    )
+    return [
+        schemas.TelemetryPoint(ts=from_epoch(bucket), avg=total / count, min=low, max=high, count=count)
+        for bucket, count, total, low, high in rows
+    ]
+
+
+def rollup_job():
+    db = SessionLocal()
+    try:
+        return run_rollups(db)
+    except Exception as e:
+        db.rollback()
+        log_event(f"Scheduler: Telemetry rollup failed - {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+def prune_job():
+    db = SessionLocal()
+    try:
+        removed = prune(db)
+        if removed:
+            log_event(f"Scheduler: Pruned {removed} expired telemetry rows")
+        return removed
+    except Exception as e:
+        db.rollback()
+        log_event(f"Scheduler: Telemetry pruning failed - {str(e)}")
+        raise
+    finally:
+        db.close()
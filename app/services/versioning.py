@@ -0,0 +1,64 @@
+import hashlib
+from typing import Callable, Dict, List, Set
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app import models
+
+# INSERT ... ON CONFLICT for the supported databases (see ASYNC_DRIVERS in app/database.py).
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_bump_hooks: List[Callable[[Set[str]], None]] = []
+
+
+def get_version(db, table: str) -> int:
+    version = db.execute(
+        select(models.TableVersion.version).where(models.TableVersion.name == table)
+    ).scalar()
+    return version or 0
+
+
+def bump_version(db, *tables: str):
+    """Increment the change counter of each table; runs in the caller's transaction."""
+    # One statement per table, so two first writes to a table cannot both try to insert its row.
+    upsert = _UPSERTS[(db.get_bind() if isinstance(db, Session) else db).dialect.name]
+    for table in tables:
+        stmt = upsert(models.TableVersion).values(name=table, version=1)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[models.TableVersion.name], set_={"version": models.TableVersion.version + 1}
+        ))
+    if isinstance(db, Session):
+        db.info.setdefault("bumped_tables", set()).update(tables)
+
+
+def format_etag(request, versions: Dict[str, int]) -> str:
+    # The URL is part of the tag because pagination and filters change the body, not just the data.
+    tag = "-".join(f"{table}.{version}" for table, version in versions.items())
+    url = f"{request.url.path}?{request.url.query}"
+    return f'W/"{tag}-{hashlib.sha1(url.encode()).hexdigest()[:12]}"'
+
+
+def resource_etag(db, request, *tables: str) -> str:
+    return format_etag(request, {table: get_version(db, table) for table in tables})
+
+
+def on_version_bump(hook: Callable[[Set[str]], None]):
+    """Register a hook called with the bumped table names once the bumping session commits."""
+    _bump_hooks.append(hook)
+
+
+def notify_bumped(tables: Set[str]):
+    for hook in _bump_hooks:
+        hook(tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_bumps(session):
+    # Connections used outside a Session call notify_bumped themselves after committing.
+    tables = session.info.pop("bumped_tables", None)
+    if tables:
+        notify_bumped(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_bumps(session):
+    session.info.pop("bumped_tables", None)
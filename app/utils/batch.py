@@ -0,0 +1,15 @@
+import orjson
+from fastapi import HTTPException
+
+
+def parse_json_batch(body: bytes, content_type: str) -> list:
+    """Decode a request body holding either a JSON array or NDJSON (one object per line)."""
+    try:
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            return [orjson.loads(line) for line in body.splitlines() if line.strip()]
+        records = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Malformed batch body: {e}")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Batch body must be a JSON array or NDJSON")
+    return records
@@ -0,0 +1,249 @@
+import os
+import zlib
+from collections import OrderedDict
+from typing import Optional
+import anyio
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from app.utils import metrics
+
+# Bodies below this size are sent as they are; compression would not pay for the extra CPU.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Server preference when the client accepts several encodings with the same q-value.
+COMPRESSION_ENCODINGS = [e.strip() for e in os.getenv("COMPRESSION_ENCODINGS", "br,zstd,gzip").split(",") if e.strip()]
+# Chunks at least this large are compressed in a worker thread instead of on the event loop.
+COMPRESSION_THREAD_MIN_SIZE = int(os.getenv("COMPRESSION_THREAD_MIN_SIZE", str(128 * 1024)))
+# Compressed bodies of responses with an ETag are kept and reused while the ETag stays the same.
+COMPRESSION_CACHE_MAX_BYTES = int(os.getenv("COMPRESSION_CACHE_MAX_BYTES", str(64 * 2**20)))
+COMPRESSION_CACHE_ENTRY_MAX_BYTES = int(os.getenv("COMPRESSION_CACHE_ENTRY_MAX_BYTES", str(8 * 2**20)))
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml", "image/svg+xml", "text/",
+)
+# Server-sent events must reach the client as they are produced.
+UNCOMPRESSIBLE_TYPES = ("text/event-stream",)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+ENCODERS = {
+    "br": _BrotliStream,
+    "zstd": lambda level: zstandard.ZstdCompressor(level=level).compressobj(),
+    "gzip": lambda level: zlib.compressobj(level, zlib.DEFLATED, 31),
+}
+# (per-request level, level for responses that go into the cache and are compressed only once)
+LEVELS = {"br": (4, 9), "zstd": (3, 12), "gzip": (6, 9)}
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the encoding with the highest q-value in Accept-Encoding, ties going to server preference."""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    candidates = []
+    for rank, encoding in enumerate(COMPRESSION_ENCODINGS):
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > 0 and encoding in ENCODERS:
+            candidates.append((q, -rank, encoding))
+    return max(candidates)[2] if candidates else None
+
+
+class _Cache:
+    """LRU of compressed bodies, bounded by total size. Only touched from the event loop."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, body: bytes):
+        if key in self._entries:
+            return
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+_cache = _Cache(COMPRESSION_CACHE_MAX_BYTES)
+
+
+async def _run(func, data: bytes) -> bytes:
+    if len(data) >= COMPRESSION_THREAD_MIN_SIZE:
+        return await anyio.to_thread.run_sync(func, data)
+    return func(data)
+
+
+def _compressible(status: int, headers: Headers) -> bool:
+    if status < 200 or status >= 300 or status in (204, 206):
+        return False
+    if "content-encoding" in headers or "content-range" in headers or "no-transform" in headers.get("cache-control", ""):
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(UNCOMPRESSIBLE_TYPES)
+
+
+def _weak(etag: str) -> str:
+    # A compressed body is a different byte sequence, so a strong validator has to become weak.
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """
+    Negotiates br, zstd or gzip for text-like responses of at least COMPRESSION_MIN_SIZE bytes.
+    Streaming responses (e.g. file exports) are compressed chunk by chunk; large chunks are
+    compressed in a worker thread.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _Responder(scope, encoding, send).send)
+
+
+class _Responder:
+    def __init__(self, scope, encoding: str, send):
+        self.scope = scope
+        self.encoding = encoding
+        self.downstream = send
+        self.start = None
+        self.mode = None  # "identity", "compress" or "drain" once the first body chunk arrived
+        self.compressor = None
+        self.cache_key = None
+        self.cached = []
+        self.cached_size = 0
+        self.labels = (("encoding", encoding),)
+
+    async def send(self, message):
+        kind = message["type"]
+        if kind == "http.response.start":
+            # Held back until the first body chunk shows whether compression applies.
+            self.start = message
+            return
+        if kind != "http.response.body":
+            await self.downstream(message)
+            return
+
+        if self.mode is None:
+            await self._begin(message)
+        elif self.mode == "identity":
+            await self.downstream(message)
+        elif self.mode == "compress":
+            await self._compress(message.get("body", b""), message.get("more_body", False))
+        # "drain": the cached body was already sent; the app's own output is dropped.
+
+    async def _begin(self, message):
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        status = self.start["status"]
+
+        if not _compressible(status, headers):
+            self.mode = "identity"
+            await self.downstream(self.start)
+            await self.downstream(message)
+            return
+        headers.add_vary_header("Accept-Encoding")
+        declared = headers.get("content-length")
+        if (not more_body and len(body) < COMPRESSION_MIN_SIZE) or (
+            more_body and declared is not None and int(declared) < COMPRESSION_MIN_SIZE
+        ):
+            self.mode = "identity"
+            await self.downstream({**self.start, "headers": headers.raw})
+            await self.downstream(message)
+            return
+
+        etag = headers.get("etag")
+        cacheable = status == 200 and etag is not None and "no-store" not in headers.get("cache-control", "")
+        if cacheable:
+            # The ETag in the key retires the entry as soon as the underlying data changes.
+            self.cache_key = (self.scope["path"], self.scope.get("query_string", b""), etag, self.encoding)
+            compressed = _cache.get(self.cache_key)
+            if compressed is not None:
+                self.mode = "drain"
+                metrics.inc("beetrack_compression_cache_hits_total", self.labels)
+                headers["content-encoding"] = self.encoding
+                headers["content-length"] = str(len(compressed))
+                headers["etag"] = _weak(etag)
+                await self.downstream({**self.start, "headers": headers.raw})
+                await self.downstream({"type": "http.response.body", "body": compressed, "more_body": False})
+                return
+
+        self.mode = "compress"
+        self.compressor = ENCODERS[self.encoding](LEVELS[self.encoding][1 if cacheable else 0])
+        headers["content-encoding"] = self.encoding
+        if etag is not None:
+            headers["etag"] = _weak(etag)
+        if more_body:
+            del headers["content-length"]
+            await self.downstream({**self.start, "headers": headers.raw})
+            await self._compress(body, True)
+            return
+
+        compressed = await _run(self._compress_all, body)
+        headers["content-length"] = str(len(compressed))
+        self._count(len(body), len(compressed))
+        self._store([compressed], len(compressed))
+        await self.downstream({**self.start, "headers": headers.raw})
+        await self.downstream({"type": "http.response.body", "body": compressed, "more_body": False})
+
+    def _compress_all(self, body: bytes) -> bytes:
+        return self.compressor.compress(body) + self.compressor.flush()
+
+    async def _compress(self, body: bytes, more_body: bool):
+        chunk = await _run(self.compressor.compress, body) if body else b""
+        if not more_body:
+            chunk += self.compressor.flush()
+        self._count(len(body), len(chunk))
+        if self.cache_key is not None:
+            self.cached.append(chunk)
+            self.cached_size += len(chunk)
+            if self.cached_size > COMPRESSION_CACHE_ENTRY_MAX_BYTES:
+                self.cache_key, self.cached = None, []
+            elif not more_body:
+                self._store(self.cached, self.cached_size)
+        if chunk or not more_body:
+            await self.downstream({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _store(self, chunks: list, size: int):
+        if self.cache_key is not None and size <= COMPRESSION_CACHE_ENTRY_MAX_BYTES:
+            _cache.put(self.cache_key, b"".join(chunks))
+
+    def _count(self, raw: int, compressed: int):
+        metrics.inc("beetrack_compression_bytes_total", self.labels + (("stage", "raw"),), raw)
+        metrics.inc("beetrack_compression_bytes_total", self.labels + (("stage", "compressed"),), compressed)
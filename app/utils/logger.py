@@ -1,11 +1,28 @@
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from app import models
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal, SessionLocal
+from app.utils import metrics
 
 
 def log_event(event: str):
-    with SessionLocal() as db:
-        log = models.Log(timestamp=datetime.now(timezone.utc), event=event)
-        db.add(log)
-        db.commit()
+    metrics.add_gauge("beetrack_log_writes_in_flight")
+    try:
+        with SessionLocal() as db:
+            log = models.Log(timestamp=datetime.now(timezone.utc), event=event)
+            db.add(log)
+            db.commit()
+    finally:
+        metrics.add_gauge("beetrack_log_writes_in_flight", value=-1)
+    metrics.inc("beetrack_log_writes_total")
+
+
+async def alog_event(event: str):
+    metrics.add_gauge("beetrack_log_writes_in_flight")
+    try:
+        async with AsyncSessionLocal() as db:
+            db.add(models.Log(timestamp=datetime.now(timezone.utc), event=event))
+            await db.commit()
+    finally:
+        metrics.add_gauge("beetrack_log_writes_in_flight", value=-1)
+    metrics.inc("beetrack_log_writes_total")
@@ -0,0 +1,254 @@
+import glob
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Tuple
+import orjson
+from sqlalchemy import event
+
+# Upper bounds in seconds; one extra slot counts everything above the last bound (+Inf).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+# With several uvicorn workers, each one writes its own snapshot here and /metrics sums them.
+# Like PROMETHEUS_MULTIPROC_DIR, it must be emptied before the workers start.
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+HELP = {
+    "beetrack_http_request_duration_seconds": ("histogram", "HTTP request latency by route and status"),
+    "beetrack_http_requests_in_flight": ("gauge", "HTTP requests currently being served"),
+    "beetrack_db_statement_duration_seconds": ("histogram", "Duration of individual SQL statements"),
+    "beetrack_db_queries_per_request": ("histogram", "SQL statements executed per HTTP request"),
+    "beetrack_db_n_plus_one_total": ("counter", "Requests repeating one statement shape past the N+1 threshold"),
+    "beetrack_db_read_routing_total": ("counter", "Read-only sessions by target database (replica or primary)"),
+    "beetrack_db_pool_checkouts_total": ("counter", "Connections handed out by the pool"),
+    "beetrack_db_pool_checked_out": ("gauge", "Connections currently checked out of the pool"),
+    "beetrack_log_writes_total": ("counter", "Rows written by log_event"),
+    "beetrack_log_writes_in_flight": ("gauge", "log_event calls waiting on the database"),
+    "beetrack_scheduler_leader": ("gauge", "1 in the process currently running scheduled jobs"),
+    "beetrack_scheduler_job_runs_total": ("counter", "Scheduled job runs by job and outcome"),
+    "beetrack_compression_bytes_total": ("counter", "Response bytes before and after compression by encoding"),
+    "beetrack_compression_cache_hits_total": ("counter", "Responses served from the precompressed cache"),
+}
+
+# Histograms not listed here use LATENCY_BUCKETS.
+BUCKETS = {
+    "beetrack_db_statement_duration_seconds": DB_BUCKETS,
+    "beetrack_db_queries_per_request": QUERY_COUNT_BUCKETS,
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Statement and pool metrics are recorded from threadpool threads as well as the event loop,
+# so every update and the snapshot copy take _lock; it is held only for a few dict operations.
+_lock = threading.Lock()
+_counters: Dict[str, Dict[Labels, float]] = {}
+_gauges: Dict[str, Dict[Labels, float]] = {}
+_histograms: Dict[str, Dict[Labels, list]] = {}
+_flusher = None
+
+
+def inc(name: str, labels: Labels = (), value: float = 1):
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[labels] = series.get(labels, 0) + value
+
+
+def add_gauge(name: str, labels: Labels = (), value: float = 1):
+    with _lock:
+        series = _gauges.setdefault(name, {})
+        series[labels] = series.get(labels, 0) + value
+
+
+def observe(name: str, labels: Labels, value: float):
+    buckets = BUCKETS.get(name, LATENCY_BUCKETS)
+    index = bisect_left(buckets, value)
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        counts = series.get(labels)
+        if counts is None:
+            # Bucket counts followed by the running sum; allocated once per label set.
+            counts = series[labels] = [0] * (len(buckets) + 1) + [0.0]
+        counts[index] += 1
+        counts[-1] += value
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "counters": {name: list(series.items()) for name, series in _counters.items()},
+            "gauges": {name: list(series.items()) for name, series in _gauges.items()},
+            # Histogram lists are updated in place, so they are copied for a consistent count and sum.
+            "histograms": {name: [(k, list(v)) for k, v in series.items()] for name, series in _histograms.items()},
+        }
+
+
+def _write_snapshot():
+    path = os.path.join(METRICS_DIR, f"{os.getpid()}.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(snapshot()))
+    os.replace(tmp_path, path)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL)
+        try:
+            _write_snapshot()
+        except OSError:
+            pass
+
+
+def _ensure_flusher():
+    global _flusher
+    if METRICS_DIR and _flusher is None:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        _flusher = threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True)
+        _flusher.start()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _merge(total: dict, part: dict, live: bool):
+    for kind in ("counters", "gauges", "histograms"):
+        # Gauges of exited workers no longer describe anything; their counters still count.
+        if kind == "gauges" and not live:
+            continue
+        for name, items in part[kind].items():
+            series = total[kind].setdefault(name, {})
+            for labels, value in items:
+                labels = tuple(tuple(pair) for pair in labels)
+                if kind == "histograms":
+                    current = series.get(labels)
+                    series[labels] = value if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    series[labels] = series.get(labels, 0) + value
+
+
+def collect() -> dict:
+    if not METRICS_DIR:
+        own = snapshot()
+        return {kind: {name: dict(items) for name, items in own[kind].items()} for kind in own}
+
+    _ensure_flusher()
+    _write_snapshot()
+    total = {"counters": {}, "gauges": {}, "histograms": {}}
+    for path in glob.glob(os.path.join(METRICS_DIR, "*.json")):
+        try:
+            with open(path, "rb") as f:
+                part = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            continue
+        pid = int(os.path.basename(path)[:-len(".json")])
+        _merge(total, part, pid == os.getpid() or _pid_alive(pid))
+    return total
+
+
+def _format_labels(labels, extra: str = "") -> str:
+    parts = [f'{key}="{value}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def render_prometheus() -> str:
+    data = collect()
+    lines = []
+    for name, (kind, help_text) in HELP.items():
+        series = data[kind + "s"].get(name, {})
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(series.items()):
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+                continue
+            bounds = BUCKETS.get(name, LATENCY_BUCKETS)
+            cumulative = 0
+            for bound, count in zip(bounds + (float("inf"),), value[:-1]):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {value[-1]}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def route_label(scope) -> str:
+    # Route templates keep label cardinality bounded; unmatched paths share one label.
+    return getattr(scope.get("route"), "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency histograms and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        _ensure_flusher()
+        method = scope["method"]
+        in_flight = (("method", method),)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        add_gauge("beetrack_http_requests_in_flight", in_flight)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            add_gauge("beetrack_http_requests_in_flight", in_flight, -1)
+            labels = (("method", method), ("route", route_label(scope)), ("status", str(status)))
+            observe("beetrack_http_request_duration_seconds", labels, elapsed)
+
+
+def instrument_engine(engine, name: str):
+    labels = (("engine", name),)
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        inc("beetrack_db_pool_checkouts_total", labels)
+        add_gauge("beetrack_db_pool_checked_out", labels)
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        add_gauge("beetrack_db_pool_checked_out", labels, -1)
+
+    # Start times are keyed by statement, so one that raises (see on_error) cannot shift the others.
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", {})[id(context or cursor)] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_started"].pop(id(context or cursor), None)
+        if started is not None:
+            observe("beetrack_db_statement_duration_seconds", labels, time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and not conn.invalidated:
+            key = id(exception_context.execution_context or exception_context.cursor)
+            conn.info.get("metrics_started", {}).pop(key, None)
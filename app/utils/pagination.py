@@ -0,0 +1,165 @@
+import base64
+import binascii
+from datetime import datetime, timezone
+from typing import Dict, NamedTuple, Optional, Sequence
+import orjson
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import DateTime, and_, or_
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams(NamedTuple):
+    limit: int
+    cursor: Optional[str]
+    sort: Optional[str]
+
+
+def page_params(
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description=f"Opaque value of a previous {NEXT_CURSOR_HEADER} header"),
+    sort: Optional[str] = Query(None, description="Sort key, prefixed with '-' for descending"),
+) -> PageParams:
+    return PageParams(limit, cursor, sort)
+
+
+def utc_naive(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC.
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def filter_date_range(query, column, date_from: Optional[datetime], date_to: Optional[datetime]):
+    if date_from:
+        query = query.filter(column >= utc_naive(date_from))
+    if date_to:
+        query = query.filter(column < utc_naive(date_to))
+    return query
+
+
+def encode_cursor(sort: str, value, row_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = orjson.dumps({"s": sort, "v": value, "id": row_id})
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, column):
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["s"] != sort:
+            raise ValueError("cursor was issued for a different sort")
+        value, row_id = payload["v"], int(payload["id"])
+        if isinstance(column.type, DateTime) and value is not None:
+            value = datetime.fromisoformat(value)
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return value, row_id
+
+
+def _resolve_sort(page: PageParams, sort_columns: Dict[str, object], default_sort: str):
+    sort = page.sort or default_sort
+    key = sort.removeprefix("-")
+    if key not in sort_columns:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported sort key '{key}'. Allowed: {', '.join(sorted(sort_columns))}",
+        )
+    return sort, sort_columns[key], sort.startswith("-")
+
+
+def _after(column, id_column, value, last_id, descending: bool):
+    """Rows after the cursor position (value, last_id); NULLs sort after every value, as in PostgreSQL."""
+    if descending:
+        if value is None:
+            return or_(column.isnot(None), and_(column.is_(None), id_column < last_id))
+        return or_(column < value, and_(column == value, id_column < last_id))
+    if value is None:
+        return and_(column.is_(None), id_column > last_id)
+    condition = or_(column > value, and_(column == value, id_column > last_id))
+    return or_(condition, column.is_(None)) if column.nullable else condition
+
+
+def _keyset(query, model, page: PageParams, sort_columns: Dict[str, object], default_sort: str):
+    sort, column, descending = _resolve_sort(page, sort_columns, default_sort)
+    id_column = model.id
+    by_id = column.key == id_column.key
+
+    if page.cursor:
+        value, last_id = decode_cursor(page.cursor, sort, column)
+        if by_id:
+            query = query.filter(id_column < last_id if descending else id_column > last_id)
+        else:
+            query = query.filter(_after(column, id_column, value, last_id, descending))
+
+    if by_id:
+        order = [id_column.desc() if descending else id_column]
+    elif not column.nullable:
+        order = [column.desc(), id_column.desc()] if descending else [column, id_column]
+    elif descending:
+        # Spelled out because SQLite orders NULLs first by default; this matches PostgreSQL's btree order.
+        order = [column.desc().nulls_first(), id_column.desc()]
+    else:
+        order = [column.asc().nulls_last(), id_column]
+    return query.order_by(None).order_by(*order).limit(page.limit + 1), sort, column
+
+
+def _trim_page(rows: list, page: PageParams, response: Response, sort: str, column) -> list:
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort, getattr(last, column.key), last.id)
+    return rows
+
+
+def paginate(query, model, page: PageParams, response: Response,
+             sort_columns: Dict[str, object], default_sort: str = "id") -> list:
+    """
+    Fetch one keyset page of query. Rows are ordered by the sort column with the primary
+    key as tie-breaker, and the position after the last row is returned as an opaque
+    cursor in the X-Next-Cursor header (absent on the last page). NULLs in a nullable sort
+    column come after every value, so last ascending and first descending.
+    """
+    query, sort, column = _keyset(query, model, page, sort_columns, default_sort)
+    return _trim_page(query.all(), page, response, sort, column)
+
+
+async def apaginate(db, stmt, model, page: PageParams, response: Response,
+                    sort_columns: Dict[str, object], default_sort: str = "id", scalars: bool = True) -> list:
+    """
+    paginate() for a select() statement on an AsyncSession. With scalars=False the rows of a
+    multi-column select are returned; it must include the sort column and the id.
+    """
+    stmt, sort, column = _keyset(stmt, model, page, sort_columns, default_sort)
+    result = await db.execute(stmt)
+    rows = result.scalars().all() if scalars else result.all()
+    return _trim_page(list(rows), page, response, sort, column)
+
+
+def paginate_records(records: Sequence, page: PageParams, response: Response,
+                     sort_columns: Dict[str, object], default_sort: str = "id") -> list:
+    """In-memory counterpart of paginate() for cached records; issues the same cursors."""
+    sort, column, descending = _resolve_sort(page, sort_columns, default_sort)
+    key = column.key
+
+    def position(value, record_id):
+        # (is NULL, value, id): NULLs sort after every value like in the SQL path, and are never compared.
+        return value is None, value, record_id
+
+    ordered = sorted(records, key=lambda record: position(getattr(record, key), record.id), reverse=descending)
+
+    if page.cursor:
+        cursor = position(*decode_cursor(page.cursor, sort, column))
+        if descending:
+            ordered = [r for r in ordered if position(getattr(r, key), r.id) < cursor]
+        else:
+            ordered = [r for r in ordered if position(getattr(r, key), r.id) > cursor]
+
+    rows = ordered[:page.limit]
+    if len(ordered) > page.limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort, getattr(last, key), last.id)
+    return rows
@@ -0,0 +1,18 @@
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def json_response(payload, response: Response) -> Response:
+    """Encode trusted data (e.g. SQL rows as dicts) with orjson, skipping response_model validation."""
+    # Headers set on the injected response (ETag, cursor) are not merged into a returned Response.
+    return Response(orjson.dumps(payload), media_type="application/json", headers=dict(response.headers))
+
+
+def models_response(adapter: TypeAdapter, objects, response: Response) -> Response:
+    """
+    Validate ORM objects against a module-level TypeAdapter and encode them in pydantic's core,
+    instead of FastAPI's validate, jsonable_encoder and json.dumps passes.
+    """
+    body = adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+    return Response(body, media_type="application/json", headers=dict(response.headers))
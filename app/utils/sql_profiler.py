@@ -0,0 +1,161 @@
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from app.utils import metrics
+
+# A statement shape repeated more than this many times in one request is reported as N+1.
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+# Debug headers expose query shapes, so they are opt-in.
+SQL_PROFILER_HEADERS = os.getenv("SQL_PROFILER_HEADERS", "false").lower() in ("1", "true", "yes")
+
+_WHITESPACE = re.compile(r"\s+")
+# Parameter lists such as IN (?, ?, ?) vary with the number of values but share one shape.
+_PARAM_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)\s*,?)+\)")
+# Multi-row VALUES clauses of executemany-style inserts.
+_VALUES_ROWS = re.compile(r"VALUES\s*(\(\.\.\.\)\s*,?\s*)+")
+
+
+def statement_shape(statement: str) -> str:
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PARAM_LIST.sub("(...)", shape)
+    return _VALUES_ROWS.sub("VALUES (...)", shape)
+
+
+class QueryProfile:
+    __slots__ = ("count", "seconds", "shapes", "started")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        # shape -> [count, seconds]
+        self.shapes: Dict[str, list] = {}
+        self.started = time.perf_counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        entry = self.shapes.get(statement)
+        if entry is None:
+            self.shapes[statement] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def repeated(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> List[tuple]:
+        """(count, shape) for statement shapes executed more than threshold times, most frequent first."""
+        grouped: Dict[str, int] = {}
+        for statement, (count, _) in self.shapes.items():
+            shape = statement_shape(statement)
+            grouped[shape] = grouped.get(shape, 0) + count
+        return sorted(((count, shape) for shape, count in grouped.items() if count > threshold), reverse=True)
+
+
+_current: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+# Profiles of finished requests are handed to every active query_budget() block.
+_budget_watchers: List[list] = []
+
+
+def instrument_engine(engine):
+    # Grouping by exact statement text is cheap per call; shapes are only normalised when a request ends.
+    # Start times are keyed by statement, like in metrics.instrument_engine, so a failed one leaves nothing behind.
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("profiler_started", {})[id(context or cursor)] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _current.get()
+        started = conn.info.get("profiler_started", {}).pop(id(context or cursor), None)
+        if profile is not None and started is not None:
+            profile.record(statement, time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and not conn.invalidated:
+            key = id(exception_context.execution_context or exception_context.cursor)
+            conn.info.get("profiler_started", {}).pop(key, None)
+
+
+def _server_timing(profile: QueryProfile) -> str:
+    total = (time.perf_counter() - profile.started) * 1000
+    db = profile.seconds * 1000
+    return f'db;dur={db:.1f};desc="{profile.count} queries", app;dur={total - db:.1f}, total;dur={total:.1f}'
+
+
+class SQLProfilerMiddleware:
+    """Counts and times the SQL statements of each request and flags repeated statement shapes."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current.set(profile)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and SQL_PROFILER_HEADERS:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(profile).encode()))
+                headers.append((b"x-db-queries", str(profile.count).encode()))
+                repeated = profile.repeated()
+                if repeated:
+                    count, shape = repeated[0]
+                    headers.append((b"x-db-n-plus-one", f"{count}x {shape[:200]}".encode("utf-8", "replace")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            route = (("route", metrics.route_label(scope)),)
+            metrics.observe("beetrack_db_queries_per_request", route, profile.count)
+            if profile.repeated():
+                metrics.inc("beetrack_db_n_plus_one_total", route)
+            for watcher in _budget_watchers:
+                watcher.append((f"{scope['method']} {scope['path']}", profile))
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, n_plus_one_threshold: Optional[int] = SQL_N_PLUS_ONE_THRESHOLD):
+    """
+    Fail if any request served inside the block (e.g. through TestClient), or the code run
+    directly in it, executes more than max_queries statements or repeats one statement shape
+    more than n_plus_one_threshold times. Pass None to skip the N+1 check.
+
+        with query_budget(3):
+            client.get("/orders/")
+    """
+    direct = QueryProfile()
+    token = _current.set(direct)
+    watcher = []
+    _budget_watchers.append(watcher)
+    try:
+        yield direct
+    finally:
+        _current.reset(token)
+        _budget_watchers.remove(watcher)
+
+    failures = []
+    for name, profile in ([("direct calls", direct)] if direct.count else []) + watcher:
+        if profile.count > max_queries:
+            failures.append(f"{name}: {profile.count} queries, budget is {max_queries}")
+        if n_plus_one_threshold is not None:
+            for count, shape in profile.repeated(n_plus_one_threshold):
+                failures.append(f"{name}: N+1, {count}x {shape}")
+    if failures:
+        raise QueryBudgetExceeded("\n".join(failures))
@@ -0,0 +1,162 @@
+"""
+Compare the sync (threadpool) and async database stacks under high client concurrency.
+
+    python -m benchmarks.async_load --concurrency 50 200 --requests 4000
+
+A uvicorn worker serves the same inspection list query twice: once as a sync route on
+SessionLocal, once as an async route on AsyncSessionLocal. Both paginate with the same
+helpers the real routers use. Each run reports throughput and p50/p95/p99 latency.
+
+Sync routes share Starlette's threadpool (40 threads by default), so once concurrency
+exceeds it requests queue for a thread; async routes only queue for a pooled connection.
+--database-url points both stacks at an existing database (e.g. PostgreSQL); by default
+a temporary SQLite file is seeded with --rows inspections.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_workdir = tempfile.mkdtemp(prefix="beetrack-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/bench.db")
+
+from fastapi import Depends, FastAPI, Response  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from app import models  # noqa: E402
+from app.database import Base, SessionLocal, engine, get_async_db, get_db  # noqa: E402
+from app.routers.inspections import INSPECTION_SORT_COLUMNS  # noqa: E402
+from app.utils.pagination import PageParams, apaginate, page_params, paginate  # noqa: E402
+
+STACKS = ("sync", "async")
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/sync/inspections")
+def sync_inspections(response: Response, hive_id: int, page: PageParams = Depends(page_params),
+                     db: Session = Depends(get_db)):
+    query = db.query(models.Inspection).filter(models.Inspection.hive_id == hive_id)
+    return [row.id for row in paginate(query, models.Inspection, page, response, INSPECTION_SORT_COLUMNS)]
+
+
+@bench_app.get("/async/inspections")
+async def async_inspections(response: Response, hive_id: int, page: PageParams = Depends(page_params),
+                            db: AsyncSession = Depends(get_async_db)):
+    stmt = select(models.Inspection).where(models.Inspection.hive_id == hive_id)
+    rows = await apaginate(db, stmt, models.Inspection, page, response, INSPECTION_SORT_COLUMNS)
+    return [row.id for row in rows]
+
+
+def seed(rows: int, hives: int):
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    with SessionLocal() as db:
+        if db.query(models.Hive).count():
+            return
+        db.execute(insert(models.Hive), [{"name": f"Hive-{i:03d}", "status": "active"} for i in range(1, hives + 1)])
+        db.execute(insert(models.Inspection), [
+            {
+                "hive_id": rng.randint(1, hives),
+                "date": start + timedelta(minutes=i),
+                "temperature": round(rng.uniform(30, 38), 1),
+                "disease_detected": "none",
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run_load(base_url: str, stack: str, concurrency: int, total: int, hives: int) -> dict:
+    import httpx
+
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                started = time.perf_counter()
+                response = await client.get(f"/{stack}/inspections", params={"hive_id": i % hives + 1, "limit": 50})
+                latencies.append(time.perf_counter() - started)
+                errors += response.status_code != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": _percentile(latencies, 0.50) * 1000,
+        "p95": _percentile(latencies, 0.95) * 1000,
+        "p99": _percentile(latencies, 0.99) * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--hives", type=int, default=200)
+    parser.add_argument("--database-url", help="Benchmark an existing database instead of a seeded SQLite file")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+    else:
+        seed(args.rows, args.hives)
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.async_load:bench_app",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        print(f"{'stack':>6} {'clients':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for concurrency in args.concurrency:
+            for stack in STACKS:
+                asyncio.run(run_load(base_url, stack, concurrency, min(200, args.requests), args.hives))  # warm-up
+                result = asyncio.run(run_load(base_url, stack, concurrency, args.requests, args.hives))
+                print(f"{stack:>6} {concurrency:>8} {result['rps']:>9.0f} {result['p50']:>9.1f} "
+                      f"{result['p95']:>9.1f} {result['p99']:>9.1f} {result['errors']:>7}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
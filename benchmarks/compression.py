@@ -0,0 +1,61 @@
+"""
+Compare response compression encodings and levels on typical API payloads.
+
+    python -m benchmarks.compression --rows 10000 --repeat 10
+
+Payloads are the orders and logs JSON lists served by the serialization bench app and the
+orders CSV export. Each is compressed with every encoding at the per-request level and at the
+level used for responses that go into the precompressed cache, reporting size and time.
+"""
+import argparse
+import statistics
+import time
+from fastapi.testclient import TestClient
+from app.utils.compression import ENCODERS, LEVELS
+from benchmarks.serialization import bench_app, seed
+
+
+def payloads(client: TestClient, rows: int) -> dict:
+    orders = client.get("/orders/rows", params={"limit": rows}).content
+    logs = client.get("/logs/rows", params={"limit": rows}).content
+    csv_lines = ["order_id,date,status,total_price"]
+    for order in client.get("/orders/rows", params={"limit": rows}).json():
+        csv_lines.append(f"{order['id']},{order['date']},{order['status']},{order['total_price']}")
+    return {"orders": orders, "logs": logs, "orders.csv": "\n".join(csv_lines).encode()}
+
+
+def compress(encoding: str, level: int, body: bytes) -> bytes:
+    compressor = ENCODERS[encoding](level)
+    return compressor.compress(body) + compressor.flush()
+
+
+def run(bodies: dict, repeat: int):
+    print(f"{'payload':>10} {'encoding':>8} {'level':>5} {'KiB':>8} {'ratio':>6} {'p50 ms':>8} {'MiB/s':>8}")
+    for name, body in bodies.items():
+        print(f"{name:>10} {'identity':>8} {'-':>5} {len(body) / 1024:>8.0f} {1:>6.2f}")
+        for encoding in ENCODERS:
+            for level in LEVELS[encoding]:
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    compressed = compress(encoding, level, body)
+                    timings.append((time.perf_counter() - started) * 1000)
+                p50 = statistics.median(timings)
+                print(f"{name:>10} {encoding:>8} {level:>5} {len(compressed) / 1024:>8.0f} "
+                      f"{len(body) / len(compressed):>6.2f} {p50:>8.1f} {len(body) / 2**20 / (p50 / 1000):>8.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    with TestClient(bench_app) as client:
+        bodies = payloads(client, args.rows)
+    run(bodies, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
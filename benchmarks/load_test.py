@@ -0,0 +1,312 @@
+"""
+Drive a realistic traffic mix against the full API and report throughput and latency per route.
+
+    python -m benchmarks.load_test --mix browse --concurrency 50 --duration 30
+    python -m benchmarks.load_test --mix all --output results.json --compare baseline.json
+
+The app is started with uvicorn against a new SQLite database filled by benchmarks.dataset
+at the --orders scale, or against --database-url. Mixes:
+
+    browse     catalog and hive pages, as the storefront and worker screens use them
+    checkout   order placement; most clients only join for the middle third of the run (a spike)
+    admin      dashboard stats, logs, all orders and users
+    exports    CSV/PDF/Parquet downloads next to light browsing
+
+--output writes the results as JSON. --compare reads an earlier result file, prints the
+change per route and exits with status 1 when a route's p95 got more than
+--max-regression percent slower, so CI can gate on it.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ADMIN = ("admin@beetrack.net", "admin123")
+WORKER = ("worker@beetrack.net", "worker123")
+
+
+def _product(ctx, rng):
+    return rng.choice(ctx["products"])
+
+
+def _hive(ctx, rng):
+    return rng.choice(ctx["hives"])
+
+
+def _order(ctx, rng):
+    lines = rng.sample(ctx["products"], k=min(len(ctx["products"]), rng.randint(1, 3)))
+    return {"items": [{"product_id": product_id, "quantity": rng.randint(1, 3)} for product_id in lines]}
+
+
+# Mix -> (weight, route label, role, request builder returning (method, url, json body))
+MIXES = {
+    "browse": [
+        (25, "GET /products/", "worker", lambda ctx, rng: ("GET", "/products/", None)),
+        (25, "GET /products/{id}", "worker", lambda ctx, rng: ("GET", f"/products/{_product(ctx, rng)}", None)),
+        (15, "GET /hives/", "worker", lambda ctx, rng: ("GET", "/hives/", None)),
+        (10, "GET /hives/{id}", "worker", lambda ctx, rng: ("GET", f"/hives/{_hive(ctx, rng)}", None)),
+        (15, "GET /inspections/hive/{id}", "worker",
+         lambda ctx, rng: ("GET", f"/inspections/hive/{_hive(ctx, rng)}?limit=50", None)),
+        (10, "GET /inspections/?sort=-date", "worker", lambda ctx, rng: ("GET", "/inspections/?sort=-date&limit=50", None)),
+    ],
+    "checkout": [
+        (40, "POST /orders/", "worker", lambda ctx, rng: ("POST", "/orders/", _order(ctx, rng))),
+        (30, "GET /products/{id}", "worker", lambda ctx, rng: ("GET", f"/products/{_product(ctx, rng)}", None)),
+        (20, "GET /orders/", "worker", lambda ctx, rng: ("GET", "/orders/?limit=20", None)),
+        (10, "GET /products/", "worker", lambda ctx, rng: ("GET", "/products/", None)),
+    ],
+    "admin": [
+        (15, "GET /stats/monthly-sales", "admin",
+         lambda ctx, rng: ("GET", f"/stats/monthly-sales?year={ctx['year']}&month={rng.randint(1, 12)}", None)),
+        (15, "GET /stats/monthly-inspections", "admin",
+         lambda ctx, rng: ("GET", f"/stats/monthly-inspections?year={ctx['year']}&month={rng.randint(1, 12)}", None)),
+        (15, "GET /stats/top-products", "admin", lambda ctx, rng: ("GET", "/stats/top-products", None)),
+        (10, "GET /stats/yearly-top-products", "admin",
+         lambda ctx, rng: ("GET", f"/stats/yearly-top-products?year={ctx['year']}", None)),
+        (20, "GET /logs/", "admin", lambda ctx, rng: ("GET", "/logs/?limit=50", None)),
+        (15, "GET /orders/all", "admin", lambda ctx, rng: ("GET", "/orders/all?limit=50", None)),
+        (10, "GET /users/", "admin", lambda ctx, rng: ("GET", "/users/", None)),
+    ],
+    "exports": [
+        (20, "GET /export/orders/csv", "admin", lambda ctx, rng: ("GET", "/export/orders/csv", None)),
+        (10, "GET /export/orders/pdf", "admin", lambda ctx, rng: ("GET", "/export/orders/pdf?summary=true", None)),
+        (10, "GET /export/inspections/pdf", "admin", lambda ctx, rng: ("GET", "/export/inspections/pdf", None)),
+        (10, "GET /export/inspections/parquet", "admin", lambda ctx, rng: ("GET", "/export/inspections/parquet", None)),
+        (50, "GET /products/", "worker", lambda ctx, rng: ("GET", "/products/", None)),
+    ],
+}
+# Share of clients that only send requests during the middle third of the run.
+SPIKE_SHARE = {"checkout": 0.75}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(workdir: str, orders: int, seed: int) -> str:
+    """Generate a new SQLite dataset in a child process, so this process never imports the app."""
+    url = f"sqlite:///{workdir}/load.db"
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.dataset", "--orders", str(orders), "--seed", str(seed), "--database-url", url],
+        cwd=workdir, env=env, check=True, capture_output=True,
+    )
+    return url
+
+
+def start_server(database_url: str, workdir: str, workers: int):
+    port = _free_port()
+    env = {**os.environ, "DATABASE_URL": database_url, "PYTHONPATH": REPO_ROOT}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=workdir, env=env,
+    )
+    for _ in range(300):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return server, f"http://127.0.0.1:{port}"
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError("API server exited during startup")
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("API server did not start")
+
+
+async def _login(client, credentials) -> dict:
+    response = await client.post("/users/login", data={"username": credentials[0], "password": credentials[1]})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def setup_context(base_url: str) -> dict:
+    import httpx
+
+    # Logins are rate limited, so every mix shares the tokens obtained here.
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        return await _setup_context(client)
+
+
+async def _setup_context(client) -> dict:
+    headers = {"admin": await _login(client, ADMIN), "worker": await _login(client, WORKER)}
+    products = (await client.get("/products/?limit=500", headers=headers["worker"])).json()
+    hives = (await client.get("/hives/?limit=500", headers=headers["worker"])).json()
+    # Keep checkout traffic from running out of stock.
+    restock = {"items": [{"id": p["id"], "stock_quantity": 10_000_000} for p in products]}
+    (await client.patch("/products/bulk", json=restock, headers=headers["admin"])).raise_for_status()
+    return {
+        "headers": headers,
+        "products": [p["id"] for p in products],
+        "hives": [h["id"] for h in hives],
+        "year": datetime.now(timezone.utc).year,
+    }
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def summarize(samples: list, seconds: float) -> dict:
+    latencies = sorted(latency for latency, _ in samples)
+    statuses = {}
+    for _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, status in samples if status >= 400),
+        "statuses": statuses,
+        "rps": round(len(samples) / seconds, 2),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def run_mix(base_url: str, ctx: dict, mix: str, concurrency: int, duration: float, seed: int) -> dict:
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        operations = MIXES[mix]
+        weights = [weight for weight, _, _, _ in operations]
+        samples = {name: [] for _, name, _, _ in operations}
+        spike_users = int(concurrency * SPIKE_SHARE.get(mix, 0))
+        started = time.perf_counter()
+        deadline = started + duration
+
+        async def user(index: int):
+            rng = random.Random(seed * 10_000 + index)
+            in_spike = index < spike_users
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    return
+                if in_spike and not (duration / 3 <= now - started < 2 * duration / 3):
+                    await asyncio.sleep(0.05)
+                    continue
+                _, name, role, build = rng.choices(operations, weights)[0]
+                method, url, body = build(ctx, rng)
+                request_started = time.perf_counter()
+                try:
+                    response = await client.request(method, url, json=body, headers=ctx["headers"][role])
+                    status = response.status_code
+                except httpx.HTTPError:
+                    status = 599
+                samples[name].append((time.perf_counter() - request_started, status))
+
+        await asyncio.gather(*(user(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    everything = [sample for route in samples.values() for sample in route]
+    return {
+        "mix": mix,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "total": summarize(everything, elapsed),
+        "routes": {name: summarize(route, elapsed) for name, route in samples.items() if route},
+    }
+
+
+def print_result(result: dict):
+    print(f"\n== {result['mix']} ({result['concurrency']} clients, {result['seconds']}s)")
+    print(f"{'route':<36} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    rows = sorted(result["routes"].items()) + [("TOTAL", result["total"])]
+    for name, stats in rows:
+        print(f"{name:<36} {stats['requests']:>9} {stats['errors']:>7} {stats['rps']:>8.1f} "
+              f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}")
+    for name, stats in sorted(result["routes"].items()):
+        failed = {status: count for status, count in stats["statuses"].items() if int(status) >= 400}
+        if failed:
+            print(f"  {name} errors: " + ", ".join(f"{count}x {status}" for status, count in sorted(failed.items())))
+
+
+def compare(results: list, baseline_path: str, max_regression: float) -> bool:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {run["mix"]: run for run in json.load(f)["runs"]}
+
+    regressed = False
+    print(f"\n== compared with {baseline_path} (p95 regression limit {max_regression:.0f}%)")
+    for run in results:
+        old_run = baseline.get(run["mix"])
+        if old_run is None:
+            continue
+        for name, stats in sorted(run["routes"].items()):
+            old = old_run["routes"].get(name)
+            if old is None or not old["p95_ms"]:
+                continue
+            change = (stats["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+            # Sub-millisecond differences are noise, whatever the percentage.
+            flagged = change > max_regression and stats["p95_ms"] - old["p95_ms"] > 1
+            regressed |= flagged
+            print(f"{run['mix']:<9} {name:<36} p95 {old['p95_ms']:>8.1f} -> {stats['p95_ms']:>8.1f} ms "
+                  f"({change:+.0f}%){'  REGRESSION' if flagged else ''}")
+    return regressed
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", choices=[*MIXES, "all"], default="all")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per mix")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--orders", type=int, default=100_000, help="Dataset scale, see benchmarks.dataset")
+    parser.add_argument("--database-url", help="Use an existing, seeded database instead of a new SQLite file")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier --output file to compare p95 latencies against")
+    parser.add_argument("--max-regression", type=float, default=20, help="Allowed p95 increase in percent")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="beetrack-load-")
+    database_url = args.database_url or prepare_database(workdir, args.orders, args.seed)
+    server, base_url = start_server(database_url, workdir, args.workers)
+    try:
+        mixes = list(MIXES) if args.mix == "all" else [args.mix]
+        ctx = asyncio.run(setup_context(base_url))
+        results = []
+        for mix in mixes:
+            result = asyncio.run(run_mix(base_url, ctx, mix, args.concurrency, args.duration, args.seed))
+            print_result(result)
+            results.append(result)
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.output:
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "workers": args.workers,
+            "database": "sqlite" if not args.database_url else database_url.split(":", 1)[0],
+            "runs": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare and compare(results, args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Render the inspections PDF detail table for a large synthetic dataset and report
+wall time and peak RSS, each size in a fresh process.
+
+    python -m benchmarks.pdf_render --rows 10000 100000
+
+Peak RSS should grow far slower than the row count, since rows are generated
+lazily and laid out in chunks of pdf.ROWS_PER_CHUNK; only the compressed page
+streams accumulate until the file is written.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+_workdir = tempfile.mkdtemp(prefix="beetrack-bench-")
+# app.services.export imports app.database, which requires a URL; the benchmark never queries it.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/bench.db")
+
+from app.services import export, pdf  # noqa: E402
+from reportlab.lib.units import inch  # noqa: E402
+from reportlab.platypus import Spacer  # noqa: E402
+
+DISEASES = ["none"] * 8 + ["varroa", "nosema", "american foulbrood", "wax moth"]
+NOTES = [None, "Strong colony", "Queen seen, brood pattern good, plenty of stores for the winter ahead"]
+
+
+def synthetic_inspections(count: int):
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        yield SimpleNamespace(
+            id=i + 1,
+            hive_id=rng.randint(1, 200),
+            date=start + timedelta(minutes=i),
+            temperature=round(rng.uniform(30, 38), 1),
+            disease_detected=rng.choice(DISEASES),
+            notes=rng.choice(NOTES),
+        )
+
+
+def render(rows: int, path: str) -> None:
+    def flowables():
+        theme = pdf.INSPECTIONS_THEME
+        yield from pdf.report_header(theme, "Inspection Report", f"<b>Total Inspections:</b> {rows}")
+        yield pdf.summary_table(theme, [["Metric", "Value"], ["Total Inspections", str(rows)]], [3 * inch, 2 * inch])
+        yield Spacer(1, 30)
+        yield from pdf.chunked_table(
+            ["Date", "Hive ID", "Temperature", "Disease", "Notes"],
+            export.inspection_rows(synthetic_inspections(rows)),
+            pdf.INSPECTIONS_COL_WIDTHS,
+            pdf.INSPECTIONS_TABLE_STYLE,
+            row_style=lambda row: pdf.DISEASED_ROW_STYLE if row[-1] else None,
+        )
+        yield from pdf.report_footer("<i>benchmark</i>")
+
+    pdf.build_document(path, flowables())
+
+
+def run_single(rows: int) -> dict:
+    path = os.path.join(_workdir, f"inspections-{rows}.pdf")
+    started = time.perf_counter()
+    render(rows, path)
+    return {
+        "rows": rows,
+        "seconds": time.perf_counter() - started,
+        # ru_maxrss is reported in KiB on Linux.
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "file_mib": os.path.getsize(path) / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(args.single)))
+        return
+
+    print(f"{'rows':>10} {'seconds':>10} {'peak RSS MiB':>14} {'file MiB':>10}")
+    for rows in args.rows:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.pdf_render", "--single", str(rows)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{rows:>10} {result['seconds']:>10.1f} {result['peak_rss_mib']:>14.1f} {result['file_mib']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
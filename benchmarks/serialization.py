@@ -0,0 +1,162 @@
+"""
+Compare the ways the API can turn a large list into a JSON response.
+
+    python -m benchmarks.serialization --rows 10000 --repeat 20
+
+A bench app serves --rows orders (with their items) and --rows log entries in each mode
+below, in-process through TestClient. Every mode produces the same JSON; each is timed end
+to end, including the query.
+
+    response_model        ORM objects through FastAPI's response_model and the stdlib encoder
+    response_model+orjson  the same with ORJSONResponse, the app's default response class
+    type_adapter          a module-level TypeAdapter validating from attributes and dumping in pydantic-core
+    rows                  column rows encoded straight from SQL with orjson (trusted internal lists)
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_workdir = tempfile.mkdtemp(prefix="beetrack-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/bench.db")
+
+from typing import List  # noqa: E402
+import orjson  # noqa: E402
+from fastapi import Depends, FastAPI, Response  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.orm import Session, selectinload  # noqa: E402
+from app import models, schemas  # noqa: E402
+from app.database import Base, SessionLocal, engine, get_db  # noqa: E402
+from app.routers.orders import ORDER_ROW_COLUMNS, _order_reads, _order_row_dicts  # noqa: E402
+from app.utils.serialization import json_response, models_response  # noqa: E402
+
+bench_app = FastAPI()
+
+
+def _orders(db: Session, limit: int):
+    query = db.query(models.Order).options(selectinload(models.Order.items))
+    return query.order_by(models.Order.id).limit(limit).all()
+
+
+def _logs(db: Session, limit: int):
+    return db.query(models.Log).order_by(models.Log.id).limit(limit).all()
+
+
+def _log_dicts(logs):
+    return [{"id": log.id, "timestamp": log.timestamp.isoformat(), "event": log.event} for log in logs]
+
+
+@bench_app.get("/orders/response_model", response_model=List[schemas.OrderRead], response_class=JSONResponse)
+def orders_response_model(limit: int, db: Session = Depends(get_db)):
+    return _orders(db, limit)
+
+
+@bench_app.get("/orders/response_model+orjson", response_model=List[schemas.OrderRead],
+               response_class=ORJSONResponse)
+def orders_orjson(limit: int, db: Session = Depends(get_db)):
+    return _orders(db, limit)
+
+
+@bench_app.get("/orders/type_adapter", response_model=List[schemas.OrderRead])
+def orders_type_adapter(response: Response, limit: int, db: Session = Depends(get_db)):
+    return models_response(_order_reads, _orders(db, limit), response)
+
+
+@bench_app.get("/orders/rows", response_model=List[schemas.OrderRead])
+def orders_rows(response: Response, limit: int, db: Session = Depends(get_db)):
+    rows = db.query(*ORDER_ROW_COLUMNS).order_by(models.Order.id).limit(limit).all()
+    return json_response(_order_row_dicts(db, rows), response)
+
+
+@bench_app.get("/logs/response_model", response_model=List[dict], response_class=JSONResponse)
+def logs_response_model(limit: int, db: Session = Depends(get_db)):
+    return _log_dicts(_logs(db, limit))
+
+
+@bench_app.get("/logs/response_model+orjson", response_model=List[dict], response_class=ORJSONResponse)
+def logs_orjson(limit: int, db: Session = Depends(get_db)):
+    return _log_dicts(_logs(db, limit))
+
+
+@bench_app.get("/logs/rows", response_model=List[dict])
+def logs_rows(response: Response, limit: int, db: Session = Depends(get_db)):
+    stmt = select(models.Log.id, models.Log.timestamp, models.Log.event).order_by(models.Log.id).limit(limit)
+    return json_response([row._asdict() for row in db.execute(stmt)], response)
+
+
+MODES = {
+    "orders": ("response_model", "response_model+orjson", "type_adapter", "rows"),
+    "logs": ("response_model", "response_model+orjson", "rows"),
+}
+
+
+def seed(rows: int):
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    with SessionLocal() as db:
+        if db.query(models.Order).count() >= rows:
+            return
+        db.execute(insert(models.User), [{
+            "id": 1, "username": "bench", "email": "bench@example.com", "hashed_password": "-", "role": "user",
+        }])
+        db.execute(insert(models.Product), [
+            {"id": i, "name": f"Product {i}", "unit_price": 10.0 + i, "stock_quantity": 100} for i in range(1, 21)
+        ])
+        db.execute(insert(models.Order), [
+            {"id": i, "user_id": 1, "date": start + timedelta(minutes=i), "status": "completed",
+             "total_price": 0.0}
+            for i in range(1, rows + 1)
+        ])
+        db.execute(insert(models.OrderItem), [
+            {"order_id": i, "product_id": rng.randint(1, 20), "quantity": rng.randint(1, 4),
+             "price_each": float(rng.randint(10, 30))}
+            for i in range(1, rows + 1) for _ in range(rng.randint(1, 4))
+        ])
+        db.execute(insert(models.Log), [
+            {"timestamp": start + timedelta(seconds=i), "event": f"Order {i} placed by user bench"}
+            for i in range(rows)
+        ])
+        db.commit()
+
+
+def run(client: TestClient, rows: int, repeat: int):
+    print(f"{'dataset':>8} {'mode':>22} {'p50 ms':>8} {'p95 ms':>8} {'KiB':>8}")
+    for dataset, modes in MODES.items():
+        bodies = {}
+        for mode in modes:
+            url = f"/{dataset}/{mode}"
+            timings = []
+            for i in range(repeat + 2):
+                started = time.perf_counter()
+                body = client.get(url, params={"limit": rows}).content
+                # The first two requests warm up the connection pool and pydantic's schema caches.
+                if i >= 2:
+                    timings.append((time.perf_counter() - started) * 1000)
+            bodies[mode] = body
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{dataset:>8} {mode:>22} {statistics.median(timings):>8.1f} {p95:>8.1f} {len(body) / 1024:>8.0f}")
+        parsed = [orjson.loads(body) for body in bodies.values()]
+        if any(value != parsed[0] for value in parsed):
+            print(f"WARNING: {dataset} modes returned different JSON")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    with TestClient(bench_app) as client:
+        run(client, args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Measure concurrent write throughput on SQLite with the previous engine settings
+(rollback journal, only check_same_thread) and with the tuned profile from
+app.database (WAL, synchronous=NORMAL, busy_timeout, cache and mmap pragmas).
+
+    python -m benchmarks.sqlite_writes --writers 8 32 --seconds 10
+
+Each writer thread mimics a write route: it reads a hive, inserts an inspection and
+commits, then records a log row in a separate session the way log_event does. Reader
+threads keep listing inspections meanwhile. Each profile runs on its own database file,
+with a pool large enough for every thread so only the SQLite settings differ. Failed
+transactions are mostly "database is locked".
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+_workdir = tempfile.mkdtemp(prefix="beetrack-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/bench.db")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app import models  # noqa: E402
+from app.database import Base, configure_engine, engine_options  # noqa: E402
+
+HIVES = 50
+
+
+def make_engine(profile: str, path: str, threads: int):
+    url = f"sqlite:///{path}"
+    if profile == "baseline":
+        return create_engine(url, connect_args={"check_same_thread": False}, pool_size=threads)
+    return configure_engine(create_engine(url, **{**engine_options(url), "pool_size": threads}))
+
+
+def prepare(engine):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Hive), [{"name": f"Hive-{i:03d}", "status": "active"} for i in range(1, HIVES + 1)])
+
+
+def run_profile(profile: str, writers: int, readers: int, seconds: float) -> dict:
+    engine = make_engine(profile, os.path.join(_workdir, f"{profile}-{writers}.db"), writers + readers)
+    prepare(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    deadline = time.monotonic() + seconds
+    lock = threading.Lock()
+    stats = {"commits": 0, "errors": 0, "reads": 0, "latencies": []}
+
+    def writer(seed: int):
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            hive_id = rng.randint(1, HIVES)
+            started = time.perf_counter()
+            try:
+                with Session() as db:
+                    hive = db.get(models.Hive, hive_id)
+                    db.add(models.Inspection(hive_id=hive.id, date=datetime.utcnow(), temperature=34.0,
+                                             disease_detected="none"))
+                    db.commit()
+                with Session() as db:
+                    db.add(models.Log(event=f"Inspection added to hive {hive_id}"))
+                    db.commit()
+            except OperationalError:
+                with lock:
+                    stats["errors"] += 1
+                continue
+            with lock:
+                stats["commits"] += 1
+                stats["latencies"].append(time.perf_counter() - started)
+
+    def reader():
+        while time.monotonic() < deadline:
+            try:
+                with Session() as db:
+                    db.query(models.Inspection).order_by(models.Inspection.id.desc()).limit(100).all()
+            except OperationalError:
+                continue
+            with lock:
+                stats["reads"] += 1
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    latencies = sorted(stats["latencies"]) or [0.0]
+    return {
+        "writes_per_s": stats["commits"] / seconds,
+        "reads_per_s": stats["reads"] / seconds,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "errors": stats["errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{'profile':>9} {'writers':>8} {'writes/s':>9} {'reads/s':>9} {'p95 ms':>9} {'errors':>7}")
+    for writers in args.writers:
+        for profile in ("baseline", "tuned"):
+            result = run_profile(profile, writers, args.readers, args.seconds)
+            print(f"{profile:>9} {writers:>8} {result['writes_per_s']:>9.0f} {result['reads_per_s']:>9.0f} "
+                  f"{result['p95_ms']:>9.1f} {result['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Measure how long importing the API takes and how much memory a fresh worker holds.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --check --max-import-ms 3000
+
+Each run imports app.main in a new interpreter against an empty SQLite database and reports
+wall time and peak RSS, then imports the export libraries to show what their first use costs.
+
+--check runs `python -X importtime -c "import app.main"` and exits with status 1 when a module
+from HEAVY_MODULES is loaded at import time or the cumulative import time of app.main exceeds
+--max-import-ms, so CI catches heavy imports creeping back in.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Only needed by exports and log archiving; loaded on first use.
+HEAVY_MODULES = ("pandas", "numpy", "reportlab", "pyarrow")
+
+CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+import pandas, pyarrow.parquet, reportlab.platypus
+from app.services import pdf
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "rss_mib": rss / 1024,
+    "heavy": heavy,
+    "exports_ms": (time.perf_counter() - imported) * 1000,
+    "exports_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}}))
+"""
+
+
+def _env(workdir: str) -> dict:
+    return {**os.environ, "DATABASE_URL": f"sqlite:///{workdir}/startup.db", "PYTHONPATH": REPO_ROOT,
+            "PYTHONWARNINGS": "ignore"}
+
+
+def measure(workdir: str) -> dict:
+    script = CHILD.format(heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", script], cwd=workdir, env=_env(workdir),
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Module name -> (self µs, cumulative µs) from `python -X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def check(workdir: str, max_import_ms: float) -> bool:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=workdir,
+                            env=_env(workdir), check=True, capture_output=True, text=True)
+    modules = parse_importtime(result.stderr)
+    total_ms = modules["app.main"][1] / 1000
+    heavy = sorted({name.split(".")[0] for name in modules} & set(HEAVY_MODULES))
+    print(f"import app.main: {total_ms:.0f} ms cumulative (limit {max_import_ms:.0f} ms)")
+    slowest = sorted(((cumulative, name) for name, (_, cumulative) in modules.items() if "." not in name),
+                     reverse=True)[:8]
+    for cumulative, name in slowest:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+    ok = True
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy)}")
+        ok = False
+    if total_ms > max_import_ms:
+        print(f"FAIL: import time over {max_import_ms:.0f} ms")
+        ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Gate on -X importtime output instead of measuring")
+    parser.add_argument("--max-import-ms", type=float, default=3000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="beetrack-startup-")
+    if args.check:
+        sys.exit(0 if check(workdir, args.max_import_ms) else 1)
+
+    runs = [measure(workdir) for _ in range(args.runs)]
+    median = {key: statistics.median(run[key] for run in runs)
+              for key in ("import_ms", "rss_mib", "exports_ms", "exports_rss_mib")}
+    print(f"import app.main       {median['import_ms']:>8.0f} ms  {median['rss_mib']:>6.0f} MiB peak RSS")
+    print(f"+ export libraries    {median['exports_ms']:>8.0f} ms  {median['exports_rss_mib']:>6.0f} MiB peak RSS")
+    heavy = runs[0]["heavy"]
+    print(f"heavy modules at startup: {', '.join(heavy) if heavy else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -114,4 +114,24 @@ api.interceptors.response.use(
     }
 );
 
+// List endpoints return at most `limit` rows (500 at most) and an X-Next-Cursor header while more remain.
+const PAGE_LIMIT = 500;
+
+export async function getAllPages<T>(
+    url: string,
+    params: Record<string, string | number> = {}
+): Promise<T[]> {
+    const rows: T[] = [];
+    let cursor: string | undefined;
+    do {
+        const res = await api.get<T[]>(url, {
+            params: { ...params, limit: PAGE_LIMIT, ...(cursor ? { cursor } : {}) },
+        });
+        rows.push(...res.data);
+        const next = res.headers["x-next-cursor"];
+        cursor = typeof next === "string" && next ? next : undefined;
+    } while (cursor);
+    return rows;
+}
+
 export default api;
@@ -1,4 +1,4 @@
-import api from "./axios";
+import api, { getAllPages } from "./axios";
 
 export interface Hive {
     id: number;
@@ -15,8 +15,7 @@ export interface HiveCreate {
 }
 
 export const getHives = async (): Promise<Hive[]> => {
-    const res = await api.get<Hive[]>("/hives/");
-    return res.data;
+    return getAllPages<Hive>("/hives/");
 };
 
 export const createHive = async (data: HiveCreate): Promise<Hive> => {
@@ -1,4 +1,4 @@
-import api from "./axios";
+import api, { getAllPages } from "./axios";
 
 export interface Inspection {
     id: number;
@@ -18,8 +18,7 @@ export interface InspectionCreate {
 }
 
 export const getInspections = async (hiveId: number): Promise<Inspection[]> => {
-    const res = await api.get<Inspection[]>(`/inspections/hive/${hiveId}`);
-    return res.data;
+    return getAllPages<Inspection>(`/inspections/hive/${hiveId}`);
 };
 
 export const createInspection = async (data: InspectionCreate) => {
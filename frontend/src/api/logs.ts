@@ -1,4 +1,4 @@
-import api from "./axios";
+import api, { getAllPages } from "./axios";
 
 export interface Log {
     id: number;
@@ -7,8 +7,7 @@ export interface Log {
 }
 
 export const getLogs = async (): Promise<Log[]> => {
-    const res = await api.get<Log[]>("/logs/");
-    return res.data;
+    return getAllPages<Log>("/logs/");
 };
 
 export const deleteLog = async (logId: number): Promise<void> => {
@@ -1,4 +1,4 @@
-import api from "./axios";
+import api, { getAllPages } from "./axios";
 
 export interface OrderItem {
     product_id: number;
@@ -29,13 +29,11 @@ export interface OrderUpdate {
 }
 
 export const getOrders = async (): Promise<Order[]> => {
-    const res = await api.get<Order[]>("/orders/");
-    return res.data;
+    return getAllPages<Order>("/orders/");
 };
 
 export const getAllOrders = async (): Promise<Order[]> => {
-    const res = await api.get<Order[]>("/orders/all/");
-    return res.data;
+    return getAllPages<Order>("/orders/all/");
 };
 
 export const createOrder = async (data: OrderCreate): Promise<Order> => {
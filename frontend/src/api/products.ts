@@ -1,4 +1,4 @@
-import api from "./axios";
+import api, { getAllPages } from "./axios";
 
 export interface Product {
     id: number;
@@ -17,8 +17,7 @@ export interface ProductCreate {
 }
 
 export const getProducts = async (): Promise<Product[]> => {
-    const res = await api.get<Product[]>("/products/");
-    return res.data;
+    return getAllPages<Product>("/products/");
 };
 
 export const createProduct = async (data: ProductCreate): Promise<Product> => {
@@ -1,4 +1,4 @@
-import api from "./axios";
+import api, { getAllPages } from "./axios";
 import { setAuthToken } from "./axios";
 import { getMe } from "@/api/auth";
 
@@ -46,6 +46,5 @@ export const updateUser = async (
 };
 
 export const getAllUsers = async (): Promise<User[]> => {
-    const res = await api.get<User[]>("/users/");
-    return res.data;
+    return getAllPages<User>("/users/");
 };
@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+_workdir = tempfile.mkdtemp(prefix="beetrack-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/test.db"
+# Exports, archives and job state are written relative to the working directory.
+os.chdir(_workdir)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.services.seed import run_seed  # noqa: E402
+from app.utils.limiter import limiter  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    Base.metadata.create_all(bind=engine)
+    run_seed(SessionLocal())
+    from app.main import app
+    # Tests sign in more often than the login rate limit allows.
+    limiter.enabled = False
+    # Not used as a context manager, so the scheduler does not start.
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def login(client):
+    def _login(email: str, password: str) -> dict:
+        response = client.post("/users/login", data={"username": email, "password": password})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return _login
+
+
+@pytest.fixture(scope="session")
+def admin_headers(login):
+    return login("admin@beetrack.net", "admin123")
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
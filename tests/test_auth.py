@@ -0,0 +1,49 @@
+import pytest
+from app import models
+
+# /users/me resolves the user with get_current_user, /stats/first-year with get_current_user_async.
+ENDPOINTS = ["/users/me", "/stats/first-year"]
+
+
+def _remember(client) -> dict:
+    response = client.post("/users/login-with-remember", json={
+        "email": "admin@beetrack.net", "password": "admin123", "remember_me": True,
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_rejects_missing_and_malformed_tokens(client, url):
+    assert client.get(url).status_code == 401
+    response = client.get(url, headers={"Authorization": "Bearer not-a-jwt"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid token"
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_session_token_and_refresh_cookie(client, db, url):
+    tokens = _remember(client)
+    assert client.get(url, headers={"Authorization": f"Bearer {tokens['access_token']}"}).status_code == 200
+    # Without an access token the refresh cookie is exchanged for one.
+    assert client.get(url, headers={"Cookie": f"refresh_token={tokens['refresh_token']}"}).status_code == 200
+    assert client.get(url, headers={"Cookie": "refresh_token=unknown"}).status_code == 401
+
+    session = db.query(models.UserSession).filter(models.UserSession.refresh_token == tokens["refresh_token"]).one()
+    assert session.last_activity is not None
+    session.is_valid = False
+    db.commit()
+
+    response = client.get(url, headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert response.status_code == 401
+    assert response.headers["X-Session-Revoked"] == "true"
+    assert client.get(url, headers={"Cookie": f"refresh_token={tokens['refresh_token']}"}).status_code == 401
+
+
+def test_refresh_token_endpoint(client):
+    tokens = _remember(client)
+    response = client.post("/users/refresh-token", headers={"Cookie": f"refresh_token={tokens['refresh_token']}"})
+    assert response.status_code == 200, response.text
+    access = response.json()["access_token"]
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {access}"}).status_code == 200
+    assert client.post("/users/refresh-token", headers={"Cookie": "refresh_token=unknown"}).status_code == 401
@@ -0,0 +1,97 @@
+import io
+import zipfile
+import orjson
+import pytest
+from sqlalchemy import delete, select
+from app import models
+from app.services import backup
+
+DOMAIN_MODELS = [models.OrderItem, models.Order, models.Inspection, models.Hive, models.Product]
+
+
+def _rows(db, model):
+    table = model.__table__
+    return [dict(row._mapping) for row in db.execute(select(table).order_by(table.c.id))]
+
+
+def _clear_domain_tables(db):
+    for model in DOMAIN_MODELS:
+        db.execute(delete(model))
+    db.commit()
+
+
+@pytest.mark.parametrize("fmt", backup.FORMATS)
+def test_backup_restore_round_trip(client, admin_headers, login, db, fmt):
+    before = {model.__tablename__: _rows(db, model) for model in DOMAIN_MODELS}
+    response = client.get("/export/backup", params={"format": fmt}, headers=admin_headers)
+    assert response.status_code == 200
+    bundle = response.content
+
+    _clear_domain_tables(db)
+    # A worker account missing from the target database is restored without its password hash.
+    john = db.query(models.User).filter(models.User.email == "john@beetrack.net").one()
+    db.query(models.UserSession).filter(models.UserSession.user_id == john.id).delete()
+    db.delete(john)
+    db.commit()
+
+    response = client.post(
+        "/export/restore", headers=admin_headers,
+        files={"file": ("backup.zip", io.BytesIO(bundle), "application/zip")},
+    )
+    assert response.status_code == 200, response.text
+    restored = response.json()["restored"]
+    assert restored["users"] == 1
+    assert restored["orders"] == len(before["orders"])
+
+    db.expire_all()
+    assert {model.__tablename__: _rows(db, model) for model in DOMAIN_MODELS} == before
+    assert b"hashed_password" not in zipfile.ZipFile(io.BytesIO(bundle)).read(f"users.{fmt}")
+    john = db.query(models.User).filter(models.User.email == "john@beetrack.net").one()
+    response = client.post("/users/login", data={"username": "john@beetrack.net", "password": "john123"})
+    assert response.status_code == 401
+    response = client.put(f"/users/{john.id}", headers=admin_headers, json={"password": "Restored#2024"})
+    assert response.status_code == 200, response.text
+    login("john@beetrack.net", "Restored#2024")
+    # The admin who ran the restore is still signed in.
+    assert client.get("/users/me", headers=admin_headers).status_code == 200
+
+
+def test_restore_requires_empty_domain_tables(client, admin_headers):
+    bundle = client.get("/export/backup", headers=admin_headers).content
+    response = client.post(
+        "/export/restore", headers=admin_headers,
+        files={"file": ("backup.zip", io.BytesIO(bundle), "application/zip")},
+    )
+    assert response.status_code == 409
+    assert "products" in response.json()["detail"]
+
+
+def test_restore_rejects_user_id_of_another_account(client, admin_headers, db):
+    bundle = client.get("/export/backup", headers=admin_headers).content
+    with zipfile.ZipFile(io.BytesIO(bundle)) as archive:
+        members = {name: archive.read(name) for name in archive.namelist()}
+    users = [orjson.loads(line) for line in members["users.ndjson"].splitlines()]
+    users[0]["email"] = "someone-else@example.com"
+    members["users.ndjson"] = b"\n".join(orjson.dumps(user) for user in users)
+    patched = io.BytesIO()
+    with zipfile.ZipFile(patched, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+    before = _rows(db, models.Product)
+    _clear_domain_tables(db)
+    response = client.post(
+        "/export/restore", headers=admin_headers,
+        files={"file": ("backup.zip", io.BytesIO(patched.getvalue()), "application/zip")},
+    )
+    assert response.status_code == 409
+    assert "belongs to a different account" in response.json()["detail"]
+
+    # Put the data back for the remaining tests.
+    response = client.post(
+        "/export/restore", headers=admin_headers,
+        files={"file": ("backup.zip", io.BytesIO(bundle), "application/zip")},
+    )
+    assert response.status_code == 200, response.text
+    db.expire_all()
+    assert _rows(db, models.Product) == before
@@ -0,0 +1,62 @@
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from app.services import export_jobs
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    yield
+    export_jobs.shutdown_executor()
+
+
+def _wait_for(client, headers, job_id: str) -> dict:
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        state = client.get(f"/export/jobs/{job_id}", headers=headers).json()
+        if state["status"] in export_jobs.FINISHED_STATUSES:
+            return state
+        time.sleep(0.2)
+    raise AssertionError(f"export job {job_id} did not finish")
+
+
+def _submit(client, headers):
+    return client.post("/export/jobs", json={"kind": "orders_csv"}, headers=headers)
+
+
+def test_pool_is_replaced_after_a_worker_dies(client, admin_headers):
+    response = _submit(client, admin_headers)
+    assert response.status_code == 202
+    assert _wait_for(client, admin_headers, response.json()["id"])["status"] == "completed"
+
+    broken = export_jobs._executor
+    for process in list(broken._processes.values()):
+        process.kill()
+    deadline = time.monotonic() + 10
+    while not broken._broken and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert broken._broken
+
+    response = _submit(client, admin_headers)
+    assert response.status_code == 202, response.text
+    assert _wait_for(client, admin_headers, response.json()["id"])["status"] == "completed"
+    assert export_jobs._executor is not broken
+
+
+class _BrokenPool:
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_job_is_marked_failed_when_no_pool_can_start_it(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(export_jobs, "_get_executor", lambda: _BrokenPool())
+    response = _submit(client, admin_headers)
+    assert response.status_code == 503
+    states = [export_jobs.get_job(name[:-len(".json")]) for name in os.listdir(export_jobs.JOBS_DIR)
+              if name.endswith(".json")]
+    assert not [state for state in states if state["status"] == "queued"]
+    assert any(state["status"] == "failed" and "worker died" in state["error"] for state in states)
@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from app import models
+
+
+def _hive(db, name: str) -> int:
+    hive = models.Hive(name=name, location="Test apiary", status="active")
+    db.add(hive)
+    db.commit()
+    return hive.id
+
+
+def test_concurrent_inspections_keep_summary_counts(client, admin_headers, db):
+    hive_id = _hive(db, "Summary race")
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+    def inspect(i):
+        return client.post("/inspections/", headers=admin_headers, json={
+            "hive_id": hive_id, "date": (now - timedelta(hours=i)).isoformat(), "notes": f"check {i}",
+            "temperature": 30.0 + i, "disease_detected": "varroa" if i % 2 else "none",
+        }).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert set(pool.map(inspect, range(16))) == {200}
+
+    db.expire_all()
+    hive = db.get(models.Hive, hive_id)
+    assert hive.inspection_count == 16
+    assert hive.recent_disease_count == 8
+    assert hive.last_inspection_date == now
+    assert hive.latest_temperature == 30.0
+
+
+def test_older_inspection_does_not_replace_latest(client, admin_headers, db):
+    hive_id = _hive(db, "Summary order")
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    for date, temperature in ((now, 34.0), (now - timedelta(days=2), 20.0)):
+        response = client.post("/inspections/", headers=admin_headers, json={
+            "hive_id": hive_id, "date": date.isoformat(), "notes": "", "temperature": temperature,
+            "disease_detected": "none",
+        })
+        assert response.status_code == 200, response.text
+
+    db.expire_all()
+    hive = db.get(models.Hive, hive_id)
+    assert (hive.inspection_count, hive.last_inspection_date, hive.latest_temperature) == (2, now, 34.0)
@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.utils import metrics
+
+
+def _statements(name: str) -> int:
+    counts = dict(metrics.snapshot()["histograms"]["beetrack_db_statement_duration_seconds"]).get((("engine", name),))
+    return sum(counts[:-1]) if counts else 0
+
+
+def test_failed_statement_leaves_no_start_time():
+    engine = create_engine("sqlite://")
+    metrics.instrument_engine(engine, "test-errors")
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        assert conn.info["metrics_started"] == {}
+        conn.execute(text("SELECT 1"))
+        assert conn.info["metrics_started"] == {}
+    assert _statements("test-errors") == 1
+
+
+def test_concurrent_observations_are_all_counted():
+    labels = (("route", "/test-threads"),)
+
+    def record(_):
+        for _ in range(5000):
+            metrics.observe("beetrack_http_request_duration_seconds", labels, 0.001)
+            metrics.inc("beetrack_log_writes_total", labels)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(record, range(8)))
+
+    data = metrics.snapshot()
+    counts = dict(data["histograms"]["beetrack_http_request_duration_seconds"])[labels]
+    assert sum(counts[:-1]) == 40_000
+    assert counts[-1] == pytest.approx(40.0)
+    assert dict(data["counters"]["beetrack_log_writes_total"])[labels] == 40_000
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+from app import models
+
+
+def _product(db, stock: int) -> models.Product:
+    product = models.Product(name=f"Checkout test {stock}", unit_price=5.0, stock_quantity=stock)
+    db.add(product)
+    db.commit()
+    return product
+
+
+def test_concurrent_checkouts_of_one_product(client, login, db):
+    headers = login("worker@beetrack.net", "worker123")
+    product = _product(db, stock=8)
+    product_id, version = product.id, product.version
+
+    def checkout(_):
+        return client.post("/orders/", headers=headers,
+                           json={"items": [{"product_id": product_id, "quantity": 1}]}).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(checkout, range(12)))
+
+    assert statuses.count(200) == 8
+    assert set(statuses) <= {200, 400}
+    db.expire_all()
+    product = db.get(models.Product, product_id)
+    assert product.stock_quantity == 0
+    assert product.version == version + 8
+
+
+def test_checkout_cannot_oversell_with_repeated_lines(client, login, db):
+    headers = login("worker@beetrack.net", "worker123")
+    product = _product(db, stock=3)
+    response = client.post("/orders/", headers=headers, json={"items": [
+        {"product_id": product.id, "quantity": 2}, {"product_id": product.id, "quantity": 2},
+    ]})
+    assert response.status_code == 400
+    db.expire_all()
+    assert db.get(models.Product, product.id).stock_quantity == 3
+
+
+def test_deletes_restore_stock_during_concurrent_checkouts(client, login, db):
+    headers = login("worker@beetrack.net", "worker123")
+    product = _product(db, stock=20)
+    product_id = product.id
+    order_ids = []
+    for _ in range(6):
+        response = client.post("/orders/", headers=headers, json={"items": [
+            {"product_id": product_id, "quantity": 1}, {"product_id": product_id, "quantity": 1},
+        ]})
+        assert response.status_code == 200, response.text
+        order_ids.append(response.json()["id"])
+
+    def delete(order_id):
+        return client.delete(f"/orders/{order_id}", headers=headers).status_code
+
+    def checkout(_):
+        return client.post("/orders/", headers=headers,
+                           json={"items": [{"product_id": product_id, "quantity": 1}]}).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        deletes = [pool.submit(delete, order_id) for order_id in order_ids]
+        checkouts = [pool.submit(checkout, i) for i in range(6)]
+        assert [f.result() for f in deletes] == [204] * 6
+        assert [f.result() for f in checkouts] == [200] * 6
+
+    db.expire_all()
+    assert db.get(models.Product, product_id).stock_quantity == 20 - 6
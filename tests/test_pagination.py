@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+import pytest
+from app import models
+from app.services import versioning
+
+
+def _walk(client, url: str, **params) -> list:
+    ids, cursor = [], None
+    while True:
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        ids += [row["id"] for row in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize("sort", ["status", "-status"])
+def test_hive_pages_with_null_status(client, db, sort):
+    hives = [models.Hive(name=f"Null status {sort} {i}") for i in range(6)]
+    db.add_all(hives)
+    db.flush()
+    # An explicit None would be replaced by the column default.
+    db.query(models.Hive).filter(models.Hive.id.in_([h.id for h in hives[1::2]])).update(
+        {"status": None}, synchronize_session=False)
+    versioning.bump_version(db, "hives")
+    db.commit()
+    expected = [h.id for h in hives]
+
+    ids = _walk(client, "/hives/", sort=sort, limit=2)
+    assert len(ids) == len(set(ids))
+    assert set(expected) <= set(ids)
+    db.expire_all()
+    nulls = [db.get(models.Hive, i).status is None for i in ids]
+    # NULLs come after every value ascending and before every value descending.
+    assert nulls == (sorted(nulls) if sort == "status" else sorted(nulls, reverse=True))
+
+
+@pytest.mark.parametrize("sort", ["date", "-date"])
+def test_inspection_pages_with_null_date(client, db, sort):
+    hive = models.Hive(name=f"Null dates {sort}")
+    db.add(hive)
+    db.flush()
+    start = datetime(2024, 5, 1)
+    inspections = [
+        models.Inspection(hive_id=hive.id, date=start + timedelta(days=i % 4), notes="")
+        for i in range(10)
+    ]
+    db.add_all(inspections)
+    db.flush()
+    db.query(models.Inspection).filter(models.Inspection.id.in_([i.id for i in inspections[::3]])).update(
+        {"date": None}, synchronize_session=False)
+    db.commit()
+
+    ids = _walk(client, "/inspections/", hive_id=hive.id, sort=sort, limit=3)
+    assert sorted(ids) == sorted(i.id for i in inspections)
+    db.expire_all()
+    dates = [db.get(models.Inspection, i).date for i in ids]
+    nulls = [d is None for d in dates]
+    assert nulls == (sorted(nulls) if sort == "date" else sorted(nulls, reverse=True))
+    known = [d for d in dates if d is not None]
+    assert known == (sorted(known) if sort == "date" else sorted(known, reverse=True))
@@ -0,0 +1,50 @@
+import pytest
+from app import models
+from app.services import catalog
+from app.utils.sql_profiler import query_budget
+
+# Statements per request today, including the user lookup and the log_event insert. Loading orders,
+# items or products one at a time would exceed these, and repeating a shape trips the N+1 check.
+BUDGETS = [
+    ("/orders/all", "admin", 4),
+    ("/orders/", "worker", 4),
+    ("/products/", "worker", 3),
+    ("/inspections/", "worker", 2),
+]
+
+
+@pytest.fixture(scope="module")
+def headers(client, login, admin_headers):
+    return {"admin": admin_headers, "worker": login("worker@beetrack.net", "worker123")}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def rows(client, headers):
+    # Enough orders, items and inspections per page that per-row loading would show up.
+    from app.database import SessionLocal
+    db = SessionLocal()
+    try:
+        products = [models.Product(name=f"Budget product {i}", unit_price=2.0, stock_quantity=100) for i in range(3)]
+        hive = models.Hive(name="Budget hive")
+        db.add_all(products + [hive])
+        db.flush()
+        db.add_all(models.Inspection(hive_id=hive.id, notes=f"budget {i}") for i in range(10))
+        db.commit()
+        product_ids = [p.id for p in products]
+    finally:
+        db.close()
+    for _ in range(10):
+        response = client.post("/orders/", headers=headers["worker"], json={
+            "items": [{"product_id": product_id, "quantity": 1} for product_id in product_ids],
+        })
+        assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("url, role, budget", BUDGETS)
+def test_route_stays_within_query_budget(client, headers, url, role, budget):
+    # The catalog routes are measured with a reload, the most expensive case.
+    catalog.invalidate({"products", "hives"})
+    with query_budget(budget):
+        response = client.get(url, headers=headers[role])
+    assert response.status_code == 200
+    assert len(response.json()) >= 3
@@ -0,0 +1,52 @@
+import os
+import threading
+import time
+import pytest
+from app import database
+
+
+@pytest.fixture
+def down_replica(monkeypatch, tmp_path):
+    # A SQLite file in a missing directory cannot be opened, like a replica that went away after its last check.
+    replica = database.Replica("replica-down", f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replica.lag, replica.checked = 0.0, True
+    monkeypatch.setattr(database, "replicas", [replica])
+    # Stands in for the monitor thread, which would otherwise check the replica first.
+    monkeypatch.setattr(database, "_monitor", object())
+    yield replica
+    replica.engine.dispose()
+
+
+def test_sync_read_falls_back_to_primary(client, admin_headers, down_replica):
+    response = client.get("/export/orders/csv", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert down_replica.lag is None
+    assert not os.path.exists(down_replica.engine.url.database)
+
+
+def test_async_read_falls_back_to_primary(client, admin_headers, down_replica):
+    response = client.get("/stats/first-year", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert down_replica.lag is None
+
+
+def test_first_replica_check_does_not_block_reads(monkeypatch, tmp_path):
+    replica = database.Replica("replica-slow", f"sqlite:///{tmp_path / 'replica.db'}")
+    release, checked = threading.Event(), threading.Event()
+
+    def slow_check():
+        # Stands in for a connect that hangs until its timeout.
+        release.wait(5)
+        replica.lag = 0.0
+        checked.set()
+
+    monkeypatch.setattr(replica, "check", slow_check)
+    monkeypatch.setattr(database, "replicas", [replica])
+    monkeypatch.setattr(database, "_monitor", None)
+
+    started = time.perf_counter()
+    assert database.pick_replica() is None
+    assert time.perf_counter() - started < 1
+    release.set()
+    assert checked.wait(5)
+    assert database.pick_replica() is replica
@@ -0,0 +1,40 @@
+import os
+import shutil
+import pytest
+from sqlalchemy import create_engine, func, inspect
+from sqlalchemy.orm import Session
+from app import models
+from app.services.seed import ADDED_COLUMNS, ensure_tables_exist
+
+# The database committed with the repository, created before any of ADDED_COLUMNS existed.
+SNAPSHOT = os.path.join(os.path.dirname(__file__), os.pardir, "beetrack.db")
+
+
+@pytest.fixture
+def old_database(tmp_path):
+    path = tmp_path / "old.db"
+    shutil.copy(SNAPSHOT, path)
+    engine = create_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
+
+
+def test_existing_database_gets_added_columns(client, old_database):
+    assert ensure_tables_exist(old_database) is False
+    inspector = inspect(old_database)
+    for table, name, _ in ADDED_COLUMNS:
+        assert name in {column["name"] for column in inspector.get_columns(table)}, f"{table}.{name}"
+    assert "ix_inspections_hive_id" in {index["name"] for index in inspector.get_indexes("inspections")}
+
+    with Session(old_database) as db:
+        for model in (models.User, models.Product, models.Hive, models.Inspection, models.Order):
+            db.query(model).all()
+        assert {p.version for p in db.query(models.Product)} <= {1}
+        assert all(u.is_active for u in db.query(models.User))
+        for hive in db.query(models.Hive):
+            count = db.query(func.count(models.Inspection.id)).filter(models.Inspection.hive_id == hive.id).scalar()
+            assert hive.inspection_count == count
+        assert db.query(models.Order).filter(models.Order.updated_at.is_(None), models.Order.date.isnot(None)).count() == 0
+
+    # A second start finds nothing left to add.
+    assert ensure_tables_exist(old_database) is False
@@ -0,0 +1,21 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.utils import sql_profiler
+
+
+def test_failed_statement_does_not_skew_the_profile():
+    engine = create_engine("sqlite://")
+    sql_profiler.instrument_engine(engine)
+    profile = sql_profiler.QueryProfile()
+    token = sql_profiler._current.set(profile)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 1"))
+            assert conn.info["profiler_started"] == {}
+    finally:
+        sql_profiler._current.reset(token)
+    assert profile.count == 1
+    assert list(profile.shapes) == ["SELECT 1"]
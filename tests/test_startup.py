@@ -0,0 +1,16 @@
+import os
+import subprocess
+import sys
+from benchmarks.startup import HEAVY_MODULES, REPO_ROOT, parse_importtime
+
+
+def test_app_import_does_not_load_export_libraries(tmp_path):
+    # A fresh interpreter: this test session has already imported everything.
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path}/startup.db", "PYTHONPATH": REPO_ROOT,
+           "PYTHONWARNINGS": "ignore"}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=tmp_path, env=env,
+                            check=True, capture_output=True, text=True)
+    modules = parse_importtime(result.stderr)
+    assert "app.main" in modules
+    loaded = sorted({name.split(".")[0] for name in modules} & set(HEAVY_MODULES))
+    assert loaded == [], f"imported by app.main: {', '.join(loaded)}"
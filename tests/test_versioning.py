@@ -0,0 +1,38 @@
+import sqlite3
+from app import database, models
+from app.database import engine
+from app.services import versioning
+
+
+def test_first_bump_inserts_and_later_bumps_increment(client, db):
+    versioning.bump_version(db, "test_counter")
+    db.commit()
+    versioning.bump_version(db, "test_counter", "test_counter_b")
+    db.commit()
+    with engine.begin() as conn:
+        versioning.bump_version(conn, "test_counter")
+    assert versioning.get_version(db, "test_counter") == 3
+    assert versioning.get_version(db, "test_counter_b") == 1
+
+
+def test_catalog_reloads_from_the_primary(client, admin_headers, db, monkeypatch, tmp_path):
+    # A replica that still holds the rows from before the update below.
+    stale = tmp_path / "replica.db"
+    source, target = sqlite3.connect(engine.url.database), sqlite3.connect(stale)
+    source.backup(target)
+    source.close()
+    target.close()
+    replica = database.Replica("replica-stale", f"sqlite:///{stale}")
+    replica.lag, replica.checked = 0.0, True
+    monkeypatch.setattr(database, "replicas", [replica])
+    monkeypatch.setattr(database, "_monitor", object())
+
+    product = db.query(models.Product).order_by(models.Product.id).first()
+    response = client.put(f"/products/{product.id}", headers=admin_headers, json={
+        "description": "Updated on the primary", "unit_price": product.unit_price,
+        "stock_quantity": product.stock_quantity,
+    })
+    assert response.status_code == 200, response.text
+    response = client.get(f"/products/{product.id}")
+    assert response.json()["description"] == "Updated on the primary"
+    replica.engine.dispose()